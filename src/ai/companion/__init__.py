@@ -7,6 +7,7 @@ with Japanese language learning and navigation through the train station.
 
 __version__ = "0.1.0"
 
+import contextlib
 import logging
 
 # Create a logger
@@ -39,18 +40,18 @@ async def process_companion_request(request_data, game_context=None):
     request_id = getattr(request_data, 'request_id', 'unknown')
     player_id = getattr(request_data.additional_params, 'player_id', None)
     
-    logger.info(f"Processing companion request: {request_id}")
-    logger.debug(f"Request data: player_input='{getattr(request_data, 'player_input', '')}', request_type='{getattr(request_data, 'request_type', '')}'")
+    logger.info("Processing companion request: %s", request_id)
+    logger.debug("Request data: player_input='%s', request_type='%s'", getattr(request_data, 'player_input', ''), getattr(request_data, 'request_type', ''))
     
     try:
         # Create the required components
-        logger.debug(f"Creating companion AI components for request: {request_id}")
+        logger.debug("Creating companion AI components for request: %s", request_id)
         intent_classifier = IntentClassifier()
         processor_factory = ProcessorFactory(player_history_manager=player_history_manager)
         response_formatter = ResponseFormatter()
         
         # Create a request handler with the components
-        logger.debug(f"Creating request handler for request: {request_id}")
+        logger.debug("Creating request handler for request: %s", request_id)
         handler = RequestHandler(
             intent_classifier=intent_classifier,
             processor_factory=processor_factory,
@@ -62,20 +63,20 @@ async def process_companion_request(request_data, game_context=None):
         if player_id and 'player_history' not in request_data.additional_params:
             player_history = player_history_manager.get_player_history(player_id)
             request_data.additional_params['player_history'] = player_history
-            logger.debug(f"Added {len(player_history)} player history entries to request: {request_id}")
+            logger.debug("Added %s player history entries to request: %s", len(player_history), request_id)
         
         # Process the request to get the response text
-        logger.debug(f"Handling request with request handler: {request_id}")
+        logger.debug("Handling request with request handler: %s", request_id)
         response_text = await handler.handle_request(request_data, game_context)
-        logger.debug(f"Received response text from handler (length: {len(response_text)}): {request_id}")
+        logger.debug("Received response text from handler (length: %s): %s", len(response_text), request_id)
         
         # Get the intent and tier from the classifier
-        logger.debug(f"Classifying request: {request_id}")
+        logger.debug("Classifying request: %s", request_id)
         intent, complexity, tier, confidence, entities = intent_classifier.classify(request_data)
-        logger.debug(f"Request classified as intent={intent.name}, complexity={complexity.name}, tier={tier.name}, confidence={confidence}: {request_id}")
+        logger.debug("Request classified as intent=%s, complexity=%s, tier=%s, confidence=%s: %s", intent.name, complexity.name, tier.name, confidence, request_id)
         
         # Create a CompanionResponse object
-        logger.debug(f"Creating CompanionResponse object: {request_id}")
+        logger.debug("Creating CompanionResponse object: %s", request_id)
         response = CompanionResponse(
             request_id=request_data.request_id,
             response_text=response_text,
@@ -110,10 +111,43 @@ async def process_companion_request(request_data, game_context=None):
                     "complexity": complexity.value
                 }
             )
-            logger.debug(f"Added interaction to player history for {player_id}: {request_id}")
+            logger.debug("Added interaction to player history for %s: %s", player_id, request_id)
         
-        logger.info(f"Successfully processed companion request: {request_id}")
+        logger.info("Successfully processed companion request: %s", request_id)
         return response
     except Exception as e:
-        logger.error(f"Error processing companion request: {str(e)}", exc_info=True)
-        raise 
\ No newline at end of file
+        logger.error("Error processing companion request: %s", e, exc_info=True)
+        raise
+
+
+async def stream_companion_request(request_data):
+    """
+    Process a request to the companion AI, yielding the response text as it is generated.
+    
+    Tiers that support streaming send text as the model decodes it; other
+    tiers yield their whole response as a single chunk.
+    
+    Args:
+        request_data: The companion request
+        
+    Yields:
+        Chunks of the companion's response text
+    """
+    request_id = getattr(request_data, 'request_id', 'unknown')
+    logger.info("Streaming companion request: %s", request_id)
+    
+    handler = RequestHandler(
+        intent_classifier=IntentClassifier(),
+        processor_factory=ProcessorFactory(player_history_manager=player_history_manager),
+        response_formatter=ResponseFormatter(),
+        player_history_manager=player_history_manager
+    )
+    
+    player_id = request_data.additional_params.get('player_id')
+    if player_id and 'player_history' not in request_data.additional_params:
+        request_data.additional_params['player_history'] = player_history_manager.get_player_history(player_id)
+    
+    # Closing this generator closes the handler's stream, and the model stream under it
+    async with contextlib.aclosing(handler.handle_request_stream(request_data)) as stream:
+        async for chunk in stream:
+            yield chunk
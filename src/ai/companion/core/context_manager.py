@@ -81,7 +81,7 @@ class ContextEntry:
             try:
                 intent = IntentCategory(data["intent"])
             except ValueError:
-                logger.warning(f"Unknown intent: {data['intent']}")
+                logger.warning("Unknown intent: %s", data['intent'])
         
         return cls(
             request=data["request"],
@@ -256,7 +256,7 @@ class ContextManager:
         )
         
         self.contexts[context.conversation_id] = context
-        logger.debug(f"Created context {context.conversation_id}")
+        logger.debug("Created context %s", context.conversation_id)
         
         return context
     
@@ -293,10 +293,10 @@ class ContextManager:
         
         if context:
             context.add_entry_from_request_response(request, response)
-            logger.debug(f"Updated context {conversation_id}")
+            logger.debug("Updated context %s", conversation_id)
             return context
         
-        logger.warning(f"Context {conversation_id} not found")
+        logger.warning("Context %s not found", conversation_id)
         return None
     
     def delete_context(self, conversation_id: str) -> bool:
@@ -311,10 +311,10 @@ class ContextManager:
         """
         if conversation_id in self.contexts:
             del self.contexts[conversation_id]
-            logger.debug(f"Deleted context {conversation_id}")
+            logger.debug("Deleted context %s", conversation_id)
             return True
         
-        logger.warning(f"Context {conversation_id} not found")
+        logger.warning("Context %s not found", conversation_id)
         return False
     
     def get_or_create_context(
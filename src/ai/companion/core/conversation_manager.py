@@ -170,13 +170,13 @@ class ConversationManager:
         # Check for clarification patterns
         for pattern in self.clarification_patterns:
             if re.search(pattern, player_input):
-                logger.debug(f"Detected clarification request: {player_input}")
+                logger.debug("Detected clarification request: %s", player_input)
                 return ConversationState.CLARIFICATION
         
         # Check for follow-up patterns
         for pattern in self.follow_up_patterns:
             if re.search(pattern, player_input):
-                logger.debug(f"Detected follow-up question: {player_input}")
+                logger.debug("Detected follow-up question: %s", player_input)
                 return ConversationState.FOLLOW_UP
         
         # Check for references to previous entities
@@ -184,7 +184,7 @@ class ConversationManager:
             if "entities" in entry and entry["entities"]:
                 for entity_name, entity_value in entry["entities"].items():
                     if isinstance(entity_value, str) and entity_value.lower() in player_input:
-                        logger.debug(f"Detected reference to previous entity: {entity_value}")
+                        logger.debug("Detected reference to previous entity: %s", entity_value)
                         return ConversationState.FOLLOW_UP
         
         # Default to new topic
@@ -287,7 +287,7 @@ class ConversationManager:
         Returns:
             The updated conversation history
         """
-        logger.debug(f"Adding request-response pair to history for conversation {conversation_id}")
+        logger.debug("Adding request-response pair to history for conversation %s", conversation_id)
         
         # Create a user message entry
         user_entry = {
@@ -307,7 +307,7 @@ class ConversationManager:
         
         # Get the current conversation context or create a new one
         context = await self.get_or_create_context(conversation_id)
-        logger.debug(f"Retrieved context for {conversation_id} with {len(context.get('entries', []))} existing entries")
+        logger.debug("Retrieved context for %s with %s existing entries", conversation_id, len(context.get('entries', [])))
         
         # Directly add entries to the context
         if "entries" not in context:
@@ -316,7 +316,7 @@ class ConversationManager:
         # Add new entries
         context["entries"].append(user_entry)
         context["entries"].append(assistant_entry)
-        logger.debug(f"Added entries to context, now has {len(context['entries'])} entries")
+        logger.debug("Added entries to context, now has %s entries", len(context['entries']))
         
         # Save the updated context
         await self.storage.save_context(conversation_id, context)
@@ -325,13 +325,13 @@ class ConversationManager:
         # This ensures any storage-specific behaviors are accounted for
         fresh_context = await self.storage.get_context(conversation_id)
         if not fresh_context or not fresh_context.get("entries"):
-            logger.warning(f"Failed to retrieve updated entries for conversation {conversation_id}")
+            logger.warning("Failed to retrieve updated entries for conversation %s", conversation_id)
             # Return the entries we just added as a fallback
             return [user_entry, assistant_entry]
         
         # Return the updated entries from the storage
         entries = fresh_context.get("entries", [])
-        logger.debug(f"Retrieved {len(entries)} entries after saving")
+        logger.debug("Retrieved %s entries after saving", len(entries))
         return entries
     
     async def process_with_history(
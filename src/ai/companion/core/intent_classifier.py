@@ -121,7 +121,7 @@ class IntentClassifier:
             - The confidence score (0-1)
             - Extracted entities
         """
-        self.logger.info(f"Classifying request: {request.request_id}")
+        self.logger.info("Classifying request: %s", request.request_id)
         
         # Extract the player input
         text = request.player_input.lower()
@@ -135,7 +135,7 @@ class IntentClassifier:
         # Select the processing tier
         tier = self._select_tier(complexity)
         
-        self.logger.info(f"Classified as: {intent.value}, {complexity.value}, {tier.value}, {confidence}")
+        self.logger.info("Classified as: %s, %s, %s, %s", intent.value, complexity.value, tier.value, confidence)
         
         return intent, complexity, tier, confidence, entities
     
@@ -7,6 +7,7 @@ This module manages persistent conversation histories for players across multipl
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
@@ -15,6 +16,9 @@ logger = logging.getLogger(__name__)
 class PlayerHistoryManager:
     """
     Manages player conversation histories across multiple sessions.
+    
+    Histories are read and written under a lock, since Tier 2 records
+    interactions from a worker thread while other callers use the event loop.
     """
     
     def __init__(self, storage_dir: str = "src/data/player_history"):
@@ -26,11 +30,12 @@ class PlayerHistoryManager:
         """
         self.storage_dir = storage_dir
         self.histories = {}  # In-memory cache
+        self._lock = threading.Lock()  # Guards histories and the history files
         
         # Create storage directory if it doesn't exist
         os.makedirs(storage_dir, exist_ok=True)
         
-        logger.info(f"Initialized PlayerHistoryManager with storage directory: {storage_dir}")
+        logger.info("Initialized PlayerHistoryManager with storage directory: %s", storage_dir)
     
     def get_player_history(self, player_id: str, max_entries: int = 10) -> List[Dict[str, Any]]:
         """
@@ -43,15 +48,16 @@ class PlayerHistoryManager:
         Returns:
             List of conversation entries, most recent first
         """
-        # Load from cache or file
-        if player_id not in self.histories:
-            self._load_player_history(player_id)
-        
-        # Get the history (empty list if not found)
-        history = self.histories.get(player_id, {"entries": []})
-        
-        # Return the most recent entries
-        return history["entries"][-max_entries:]
+        with self._lock:
+            # Load from cache or file
+            if player_id not in self.histories:
+                self._load_player_history(player_id)
+            
+            # Get the history (empty list if not found)
+            history = self.histories.get(player_id, {"entries": []})
+            
+            # Return the most recent entries
+            return history["entries"][-max_entries:]
     
     def add_interaction(
         self, 
@@ -71,12 +77,6 @@ class PlayerHistoryManager:
             session_id: Optional session ID
             metadata: Optional additional metadata
         """
-        # Load or initialize history
-        if player_id not in self.histories:
-            self._load_player_history(player_id)
-            if player_id not in self.histories:
-                self.histories[player_id] = {"entries": []}
-        
         # Create the entry
         entry = {
             "timestamp": datetime.now().isoformat(),
@@ -89,17 +89,25 @@ class PlayerHistoryManager:
         if metadata:
             entry["metadata"] = metadata
         
-        # Add to history
-        self.histories[player_id]["entries"].append(entry)
-        
-        # Save to disk
-        self._save_player_history(player_id)
+        with self._lock:
+            # Load or initialize history
+            if player_id not in self.histories:
+                self._load_player_history(player_id)
+                if player_id not in self.histories:
+                    self.histories[player_id] = {"entries": []}
+            
+            # Add to history
+            self.histories[player_id]["entries"].append(entry)
+            
+            # Save to disk
+            self._save_player_history(player_id)
+            entry_count = len(self.histories[player_id]['entries'])
         
-        logger.debug(f"Added interaction to history for player {player_id}, now has {len(self.histories[player_id]['entries'])} entries")
+        logger.debug("Added interaction to history for player %s, now has %s entries", player_id, entry_count)
     
     def _load_player_history(self, player_id: str) -> None:
         """
-        Load a player's history from disk.
+        Load a player's history from disk. Callers must hold the lock.
         
         Args:
             player_id: The player ID
@@ -110,17 +118,17 @@ class PlayerHistoryManager:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     self.histories[player_id] = json.load(f)
-                logger.debug(f"Loaded history for player {player_id} from {file_path}")
+                logger.debug("Loaded history for player %s from %s", player_id, file_path)
             except Exception as e:
-                logger.error(f"Error loading history for player {player_id}: {str(e)}")
+                logger.error("Error loading history for player %s: %s", player_id, e)
                 self.histories[player_id] = {"entries": []}
         else:
-            logger.debug(f"No history file found for player {player_id}")
+            logger.debug("No history file found for player %s", player_id)
             self.histories[player_id] = {"entries": []}
     
     def _save_player_history(self, player_id: str) -> None:
         """
-        Save a player's history to disk.
+        Save a player's history to disk. Callers must hold the lock.
         
         Args:
             player_id: The player ID
@@ -130,6 +138,6 @@ class PlayerHistoryManager:
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(self.histories[player_id], f, ensure_ascii=False, indent=2)
-            logger.debug(f"Saved history for player {player_id} to {file_path}")
+            logger.debug("Saved history for player %s to %s", player_id, file_path)
         except Exception as e:
-            logger.error(f"Error saving history for player {player_id}: {str(e)}") 
\ No newline at end of file
+            logger.error("Error saving history for player %s: %s", player_id, e) 
@@ -6,6 +6,7 @@ for creating processor instances.
 """
 
 import abc
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 
@@ -67,7 +68,7 @@ class Tier1Processor(Processor):
         Returns:
             The generated response
         """
-        self.logger.info(f"Processing request {request.request_id} with Tier 1 processor")
+        self.logger.info("Processing request %s with Tier 1 processor", request.request_id)
         
         # Create a companion request from the classified request
         companion_request = self._create_companion_request(request)
@@ -79,13 +80,13 @@ class Tier1Processor(Processor):
         tree = self.decision_trees.get(tree_name)
         
         if not tree:
-            self.logger.warning(f"No decision tree found for intent {request.intent.value}")
+            self.logger.warning("No decision tree found for intent %s", request.intent.value)
             return "I'm sorry, I don't know how to help with that."
         
         # Traverse the decision tree to generate a response
         response = self._traverse_tree(tree, companion_request)
         
-        self.logger.info(f"Generated response for request {request.request_id}")
+        self.logger.info("Generated response for request %s", request.request_id)
         return response
     
     def _get_tree_name_for_intent(self, intent: IntentCategory) -> str:
@@ -219,6 +220,24 @@ class ProcessorFactory:
         """Clear the processor cache. Used primarily for testing."""
         cls._processors = {}
     
+    @classmethod
+    async def close_processors(cls):
+        """
+        Release the resources held by the cached processors.
+        
+        Processors that hold network clients (e.g. Tier 2's Ollama connection
+        pool) expose an async close() method. Errors are logged so that one
+        processor failing to close doesn't keep the others open.
+        """
+        for tier, processor in list(cls._processors.items()):
+            close = getattr(processor, 'close', None)
+            if close is None or not asyncio.iscoroutinefunction(close):
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.warning("Failed to close processor for %s: %s", tier, e)
+    
     def get_processor(self, tier: ProcessingTier) -> Processor:
         """
         Get a processor for the specified tier.
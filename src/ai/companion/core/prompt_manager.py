@@ -81,65 +81,136 @@ class PromptManager:
             self.vector_store = TokyoKnowledgeStore.from_file(tokyo_knowledge_base_path)
             logger.debug(f"Created vector store from file: {tokyo_knowledge_base_path}")
         
+        # Static prompt prefixes per (intent, profile_id), and the modules they are built from
+        self._static_prefix_cache: Dict[Any, str] = {}
+        self._prompt_module_cache: Dict[Any, str] = {}
+        
         logger.debug("Initialized PromptManager with config: %s", self.tier_specific_config)
     
     def create_prompt(self, request: ClassifiedRequest) -> str:
         """
         Create a prompt for a language model based on the request.
         
+        The prompt is laid out as a static prefix followed by a dynamic suffix,
+        so consecutive requests share a byte-identical prefix and the model
+        server can reuse its cached prefill (KV cache) for it.
+        
         Args:
             request: A classified request with intent and complexity
             
         Returns:
             A prompt string for the model
         """
-        # Get the intent-specific prompt template
-        intent_prompt = self._get_base_prompt(request.intent, request.profile_id)
+        full_prompt = f"{self.create_static_prefix(request)}\n{self.create_dynamic_suffix(request)}"
         
-        # Get NPC profile if available and add specific personality context
-        profile_context = self._get_profile_context(request)
-        
-        # Get request context including the question/input
-        request_context = self._get_request_context(request)
+        logger.debug("Generated prompt with length %d characters", len(full_prompt))
+        return full_prompt
+    
+    def create_static_prefix(self, request: ClassifiedRequest) -> str:
+        """
+        Create the static part of the prompt (persona, format rules and instructions).
         
-        # Get relevant world context from vector store if available
-        world_context = self._get_relevant_world_context(request)
+        The prefix is assembled from prompt modules ordered from most to least
+        shared: the persona and general instructions (same for every request
+        to a profile) come before the intent-specific template and format.
+        Requests with different intents therefore still share the leading
+        persona/instructions span, which the model server can reuse from its
+        KV cache. Each module is memoized on its own key, and no module
+        depends on per-request fields.
         
-        # Get profile-specific response format if available
-        response_format = self._get_response_format(request)
+        Args:
+            request: A classified request with intent and complexity
+            
+        Returns:
+            The static prompt prefix
+        """
+        key = (request.intent, request.profile_id)
+        prefix = self._static_prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._join_prompt_parts(
+                self._get_shared_prompt_module(request),
+                self._get_intent_prompt_module(request)
+            )
+            self._static_prefix_cache[key] = prefix
+        return prefix
+    
+    def _get_shared_prompt_module(self, request: ClassifiedRequest) -> str:
+        """
+        Get the prompt module shared by every request to a profile.
         
-        # Get instructions for desired response
-        response_instructions = self._get_response_instructions(request)
+        Args:
+            request: The classified request
+            
+        Returns:
+            The persona and general instructions, memoized per profile_id
+        """
+        key = ("shared", request.profile_id)
+        module = self._prompt_module_cache.get(key)
+        if module is None:
+            module = self._join_prompt_parts(
+                # Get NPC profile if available and add specific personality context
+                self._get_profile_context(request),
+                # Get instructions for desired response
+                self._get_response_instructions(request),
+                # Add tier-specific instructions if provided
+                self.tier_specific_config.get("additional_instructions", "")
+            )
+            self._prompt_module_cache[key] = module
+        return module
+    
+    def _get_intent_prompt_module(self, request: ClassifiedRequest) -> str:
+        """
+        Get the prompt module specific to the request's intent.
         
-        # Apply tier-specific optimizations
-        if self.tier_specific_config.get("optimize_prompt", False):
-            intent_prompt = self._optimize_prompt_for_token_efficiency(intent_prompt)
+        Args:
+            request: The classified request
+            
+        Returns:
+            The intent template and response format, memoized per (intent, profile_id)
+        """
+        key = ("intent", request.intent, request.profile_id)
+        module = self._prompt_module_cache.get(key)
+        if module is None:
+            # Get the intent-specific prompt template
+            intent_prompt = self._get_base_prompt(request.intent, request.profile_id)
+            
+            # Apply tier-specific optimizations
+            if self.tier_specific_config.get("optimize_prompt", False):
+                intent_prompt = self._optimize_prompt_for_token_efficiency(intent_prompt)
+            
+            # Get profile-specific response format if available
+            module = self._join_prompt_parts(intent_prompt, self._get_response_format(request))
+            self._prompt_module_cache[key] = module
+        return module
+    
+    def create_dynamic_suffix(self, request: ClassifiedRequest) -> str:
+        """
+        Create the request-specific part of the prompt (world context and player input).
         
-        # Add tier-specific instructions if provided
-        additional_instructions = self.tier_specific_config.get("additional_instructions", "")
+        Args:
+            request: A classified request with intent and complexity
+            
+        Returns:
+            The dynamic prompt suffix
+        """
+        # Get relevant world context from vector store if available
+        world_context = self._get_relevant_world_context(request)
         
-        # Combine all the parts into a single prompt
-        full_prompt = f"""
-{intent_prompt}
-
-{profile_context}
-
-{world_context}
-
-{request_context}
-
-{response_format}
-
-{response_instructions}
-
-{additional_instructions}
-"""
+        # Get request context including the question/input
+        request_context = self._get_request_context(request)
         
-        # Trim whitespace and remove extra newlines
-        full_prompt = "\n".join(line for line in full_prompt.split("\n") if line.strip())
+        return self._join_prompt_parts(world_context, request_context)
+    
+    @staticmethod
+    def _join_prompt_parts(*parts: str) -> str:
+        """
+        Join prompt parts, trimming whitespace and removing blank lines.
         
-        logger.debug("Generated prompt with length %d characters", len(full_prompt))
-        return full_prompt
+        Indentation left over from triple-quoted templates is stripped too;
+        it carries no meaning for the model but still costs prefill tokens.
+        """
+        combined = "\n".join(parts)
+        return "\n".join(stripped for stripped in (line.strip() for line in combined.split("\n")) if stripped)
     
     def _get_response_format(self, request: ClassifiedRequest) -> str:
         """
@@ -9,7 +9,8 @@ import logging
 import traceback
 import inspect
 import time
-from typing import Optional, Any, Dict, Tuple
+import contextlib
+from typing import Optional, Any, AsyncIterator, Dict, Tuple
 
 from src.ai.companion.core.models import (
     CompanionRequest,
@@ -63,19 +64,22 @@ class RequestHandler:
             A formatted response string
         """
         request_id = getattr(request, 'request_id', 'unknown')
-        start_time = time.time()
-        self.logger.info(f"Handling request: {request_id} - {request.player_input}")
+        start_time = time.perf_counter()
+        self.logger.info("Handling request: %s - %s", request_id, request.player_input)
         
         try:
             # Classify the request
-            self.logger.debug(f"Classifying request: {request_id}")
-            classification_start = time.time()
+            self.logger.debug("Classifying request: %s", request_id)
+            classification_start = time.perf_counter()
             intent, complexity, tier, confidence, entities = self.intent_classifier.classify(request)
-            classification_time = time.time() - classification_start
-            self.logger.debug(f"Request classified in {classification_time:.3f}s as intent={intent.name}, complexity={complexity.name}, tier={tier.name}, confidence={confidence:.2f}: {request_id}")
+            classification_time = time.perf_counter() - classification_start
+            self.logger.debug(
+                "Request classified in %.3fs as intent=%s, complexity=%s, tier=%s, confidence=%.2f: %s",
+                classification_time, intent.name, complexity.name, tier.name, confidence, request_id
+            )
             
             # Create a classified request
-            self.logger.debug(f"Creating classified request: {request_id}")
+            self.logger.debug("Creating classified request: %s", request_id)
             classified_request = ClassifiedRequest.from_companion_request(
                 request=request,
                 intent=intent,
@@ -86,17 +90,20 @@ class RequestHandler:
             )
             
             # Log the initial tier selection at INFO level
-            self.logger.info(f"Request {request_id} initially classified for {tier.name} processing with intent={intent.name}, complexity={complexity.name}, confidence={confidence:.2f}")
+            self.logger.info(
+                "Request %s initially classified for %s processing with intent=%s, complexity=%s, confidence=%.2f",
+                request_id, tier.name, intent.name, complexity.name, confidence
+            )
             
             # Try to get a processor using the cascade pattern
-            processor_start = time.time()
+            processor_start = time.perf_counter()
             processor_response = await self._process_with_cascade(classified_request, tier)
-            processor_time = time.time() - processor_start
-            self.logger.debug(f"Request processed in {processor_time:.3f}s: {request_id}")
+            processor_time = time.perf_counter() - processor_start
+            self.logger.debug("Request processed in %.3fs: %s", processor_time, request_id)
             
             # Check if the response is a special error message that should be returned directly
             if isinstance(processor_response, str) and "All AI services are currently disabled" in processor_response:
-                self.logger.warning(f"Returning error message directly: {processor_response}")
+                self.logger.warning("Returning error message directly: %s", processor_response)
                 return processor_response
             
             # Extract text from dictionary response if needed
@@ -116,18 +123,18 @@ class RequestHandler:
                 response_text = processor_response
             
             # Format the response
-            self.logger.debug(f"Formatting response: {request_id}")
-            format_start = time.time()
+            self.logger.debug("Formatting response: %s", request_id)
+            format_start = time.perf_counter()
             response = self.response_formatter.format_response(
                 processor_response=response_text,
                 classified_request=classified_request
             )
-            format_time = time.time() - format_start
-            self.logger.debug(f"Response formatted in {format_time:.3f}s (length: {len(response)}): {request_id}")
+            format_time = time.perf_counter() - format_start
+            self.logger.debug("Response formatted in %.3fs (length: %d): %s", format_time, len(response), request_id)
             
             # Update conversation context if provided
             if conversation_context:
-                self.logger.debug(f"Updating conversation context: {request_id}")
+                self.logger.debug("Updating conversation context: %s", request_id)
                 # Create a companion response object
                 companion_response = CompanionResponse(
                     request_id=request.request_id,
@@ -138,21 +145,96 @@ class RequestHandler:
                 
                 # Add the interaction to the conversation context
                 conversation_context.add_interaction(request, companion_response)
-                self.logger.debug(f"Conversation context updated, history size: {len(conversation_context.request_history)}: {request_id}")
+                self.logger.debug(
+                    "Conversation context updated, history size: %d: %s",
+                    len(conversation_context.request_history), request_id
+                )
             
-            total_time = time.time() - start_time
-            self.logger.info(f"Request handled successfully in {total_time:.3f}s: {request_id}")
+            total_time = time.perf_counter() - start_time
+            self.logger.info("Request handled successfully in %.3fs: %s", total_time, request_id)
             return response
             
         except Exception as e:
             # Log the error
-            total_time = time.time() - start_time
-            self.logger.error(f"Error handling request after {total_time:.3f}s: {str(e)}: {request_id}")
+            total_time = time.perf_counter() - start_time
+            self.logger.error("Error handling request after %.3fs: %s: %s", total_time, e, request_id)
             self.logger.debug(traceback.format_exc())
             
             # Return a fallback response
             return f"I'm sorry, I encountered an error while processing your request. Please try again."
     
+    async def handle_request_stream(self, request: CompanionRequest) -> AsyncIterator[str]:
+        """
+        Handle a request from the player, yielding the response as it is generated.
+        
+        When the processor for the classified tier can stream (has an async
+        generator process_stream), its text is yielded as the model decodes it,
+        so the first words arrive after the time-to-first-token rather than
+        after the whole response. Streamed text is not passed through the
+        response formatter. Requests for other tiers go through handle_request
+        and yield the formatted response as a single chunk.
+        
+        Args:
+            request: The request from the player
+            
+        Yields:
+            Chunks of the response text
+        """
+        request_id = getattr(request, 'request_id', 'unknown')
+        self.logger.info("Handling streaming request: %s - %s", request_id, request.player_input)
+        
+        processor = None
+        try:
+            intent, complexity, tier, confidence, entities = self.intent_classifier.classify(request)
+            classified_request = ClassifiedRequest.from_companion_request(
+                request=request,
+                intent=intent,
+                complexity=complexity,
+                processing_tier=tier,
+                confidence=confidence,
+                extracted_entities=entities
+            )
+            processor = self._get_streaming_processor(tier)
+        except Exception as e:
+            self.logger.warning("Could not set up streaming for request %s: %s", request_id, e)
+        
+        if processor is None:
+            yield await self.handle_request(request)
+            return
+        
+        started = False
+        try:
+            # Closing this generator closes the processor's stream right away
+            async with contextlib.aclosing(processor.process_stream(classified_request)) as stream:
+                async for chunk in stream:
+                    started = True
+                    yield chunk
+        except Exception as e:
+            if started:
+                # Part of the response already reached the caller; stop here
+                self.logger.error("Streaming failed mid-response for request %s: %s", request_id, e)
+                return
+            self.logger.warning("Streaming failed for request %s, using non-streaming path: %s", request_id, e)
+            yield await self.handle_request(request)
+    
+    def _get_streaming_processor(self, tier: ProcessingTier):
+        """
+        Get the processor for a tier if it can stream its responses.
+        
+        Args:
+            tier: The processing tier
+            
+        Returns:
+            The processor, or None if the tier is disabled or can't stream
+        """
+        try:
+            processor = self.processor_factory.get_processor(tier)
+        except ValueError:
+            return None
+        
+        process_stream = getattr(processor, 'process_stream', None)
+        return processor if inspect.isasyncgenfunction(process_stream) else None
+    
     async def _process_with_cascade(self, request: ClassifiedRequest, initial_tier: ProcessingTier) -> Dict[str, Any]:
         """
         Process a request with the specified tier, cascading to lower tiers if needed.
@@ -180,23 +262,23 @@ class RequestHandler:
             
             try:
                 # Attempt to process with the current tier
-                self.logger.debug(f"Attempting to process request {request.request_id} with {current_tier}")
+                self.logger.debug("Attempting to process request %s with %s", request.request_id, current_tier)
                 
                 # Try to get a processor for the current tier
                 try:
                     processor = self.processor_factory.get_processor(current_tier)
-                    self.logger.debug(f"Got processor of type {type(processor).__name__} for {current_tier}")
+                    self.logger.debug("Got processor of type %s for %s", type(processor).__name__, current_tier)
                 except ValueError as e:
                     # If the tier is disabled in configuration, log and skip to next tier
                     if "disabled in configuration" in str(e):
-                        self.logger.warning(f"Tier {current_tier} is disabled in configuration, skipping to next tier")
+                        self.logger.warning("Tier %s is disabled in configuration, skipping to next tier", current_tier)
                         continue
                     else:
                         # Other ValueError, re-raise
                         raise
                 
                 # Process the request
-                self.logger.info(f"Processing request {request.request_id} with {current_tier} processor")
+                self.logger.info("Processing request %s with %s processor", request.request_id, current_tier)
                 response = await processor.process(request)
                 
                 # Update the processing tier
@@ -205,11 +287,11 @@ class RequestHandler:
                 
             except Exception as e:
                 # Log the error and try the next tier
-                self.logger.warning(f"Failed to process request {request.request_id} with {current_tier} processor: {str(e)}")
+                self.logger.warning("Failed to process request %s with %s processor: %s", request.request_id, current_tier, e)
                 # Continue to next tier in progression
         
         # If we've tried all tiers and none worked, generate a fallback response
-        self.logger.warning(f"All processing tiers failed for request {request.request_id}, generating fallback response")
+        self.logger.warning("All processing tiers failed for request %s, generating fallback response", request.request_id)
         request.processing_tier = ProcessingTier.RULE
         return self._generate_fallback_response(request)
     
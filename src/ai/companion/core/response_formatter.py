@@ -293,7 +293,7 @@ class ResponseFormatter:
                     processing_tier = processing_tier.name
                 
                 # Log response details
-                self.logger.info(f"Response details - dialogue length: {len(formatted)}, processing tier: {processing_tier}")
+                self.logger.info("Response details - dialogue length: %d, processing tier: %s", len(formatted), processing_tier)
                 
                 return formatted
         
@@ -325,7 +325,7 @@ class ResponseFormatter:
                 processing_tier = processing_tier.name
             
             # Log response details
-            self.logger.info(f"Response details - dialogue length: {len(formatted_response)}, processing tier: {processing_tier}")
+            self.logger.info("Response details - dialogue length: %d, processing tier: %s", len(formatted_response), processing_tier)
             
             return formatted_response
         
@@ -431,7 +431,7 @@ class ResponseFormatter:
             processing_tier = processing_tier.name
         
         # Log response details
-        self.logger.info(f"Response details - dialogue length: {len(formatted)}, processing tier: {processing_tier}")
+        self.logger.info("Response details - dialogue length: %d, processing tier: %s", len(formatted), processing_tier)
         
         return formatted
     
@@ -448,12 +448,12 @@ class ResponseFormatter:
         """
         # Check if response is empty or too short
         if not response or len(response.strip()) < 10:
-            logger.warning(f"Response too short, using fallback: {response}")
+            logger.warning("Response too short, using fallback: %s", response)
             return "I'm sorry, I couldn't generate a proper response. Could you please rephrase your question?"
         
         # Check if response is too long (more than 500 characters)
         if len(response) > 500:
-            logger.info(f"Response too long ({len(response)} chars), truncating")
+            logger.info("Response too long (%d chars), truncating", len(response))
             # Try to truncate at a sentence boundary
             truncated = response[:497]
             last_period = truncated.rfind('.')
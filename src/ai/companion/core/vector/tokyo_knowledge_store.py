@@ -9,7 +9,7 @@ import os
 import json
 import uuid
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 import chromadb
 from chromadb.utils import embedding_functions
@@ -61,6 +61,9 @@ class TokyoKnowledgeStore:
             embedding_function=self.embedding_function
         )
         
+        # Results of searches whose query doesn't depend on the player's input
+        self._fixed_search_cache: Dict[Tuple[str, int, Optional[Tuple]], List[Dict[str, Any]]] = {}
+        
         logger.info(f"Initialized TokyoKnowledgeStore with collection: {collection_name}")
         
         # Check if the collection is empty and log its state
@@ -162,6 +165,7 @@ class TokyoKnowledgeStore:
                 metadatas=metadatas,
                 ids=ids
             )
+            self._fixed_search_cache.clear()
             
             logger.info(f"Loaded {len(documents)} documents from Tokyo knowledge base")
             return len(documents)
@@ -218,6 +222,33 @@ class TokyoKnowledgeStore:
         logger.debug(f"Found {len(processed_results)} relevant documents for query: {query}")
         return processed_results
     
+    def _cached_search(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search, reusing the results of an earlier identical search.
+        
+        Only used for queries built from the game state alone (such as the
+        player's location), which repeat across requests. The cache is
+        cleared when documents are added to the collection.
+        
+        Args:
+            query: The search query
+            top_k: Maximum number of results to return
+            filters: Optional filters to apply
+            
+        Returns:
+            List of documents with metadata and scores
+        """
+        key = (query, top_k, tuple(sorted(filters.items())) if filters else None)
+        results = self._fixed_search_cache.get(key)
+        if results is None:
+            results = self._fixed_search_cache[key] = self.search(query, top_k=top_k, filters=filters)
+        return results
+    
     def contextual_search(
         self,
         request: ClassifiedRequest,
@@ -273,7 +304,7 @@ class TokyoKnowledgeStore:
             location_results = []
             if request.game_context and request.game_context.player_location:
                 location_query = f"{request.game_context.player_location} in Tokyo Station"
-                location_results = self.search(location_query, top_k=1, filters=location_filters)
+                location_results = self._cached_search(location_query, top_k=1, filters=location_filters)
             
             # Combine the results
             results = language_results + location_results
@@ -285,7 +316,7 @@ class TokyoKnowledgeStore:
             
             # Get 1 language learning document for direction vocabulary
             language_query = "direction vocabulary in Japanese"
-            language_results = self.search(language_query, top_k=1, filters={"type": "language_learning"})
+            language_results = self._cached_search(language_query, top_k=1, filters={"type": "language_learning"})
             
             # Combine the results
             results = location_results + language_results
@@ -3,11 +3,33 @@ Tokyo Train Station Adventure - Tier 2 Processor Module
 
 This module contains the LLM-based processing components for the companion AI system.
 It includes the Ollama client for interacting with local language models.
+
+The components are imported on first access, so importing one Tier 2 module
+(or this package) doesn't load the whole Tier 2 stack and its HTTP client.
 """
 
-from src.ai.companion.tier2.ollama_client import OllamaClient
-from src.ai.companion.tier2.tier2_processor import Tier2Processor
-from src.ai.companion.tier2.prompt_engineering import PromptEngineering
-from src.ai.companion.tier2.response_parser import ResponseParser
+import importlib
+
+_EXPORTS = {
+    'OllamaClient': 'src.ai.companion.tier2.ollama_client',
+    'Tier2Processor': 'src.ai.companion.tier2.tier2_processor',
+    'PromptEngineering': 'src.ai.companion.tier2.prompt_engineering',
+    'ResponseParser': 'src.ai.companion.tier2.response_parser',
+}
+
+__all__ = ['OllamaClient', 'Tier2Processor', 'PromptEngineering', 'ResponseParser']
+
+
+def __getattr__(name):
+    """Import an exported component on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['OllamaClient', 'Tier2Processor', 'PromptEngineering', 'ResponseParser'] 
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,127 @@
+"""
+Tokyo Train Station Adventure - Tier 2 Fast Path
+
+This module answers trivial companion requests without calling a language model.
+Greetings, thanks, yes/no confirmations and "where is X?" questions about fixed
+station locations have a small set of correct answers, so they are matched with
+rules and answered from templates instead of waiting on a full LLM generation.
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from src.ai.companion.core.models import ClassifiedRequest, ComplexityLevel, IntentCategory
+
+logger = logging.getLogger(__name__)
+
+
+class FastPathResponder:
+    """
+    Rule and template responder for trivial SIMPLE requests.
+
+    Rules are matched against the whole (normalized) player input, so only
+    short, unambiguous utterances are answered here. Anything else returns
+    None and goes through the normal LLM path.
+    """
+
+    # Rules tried for every intent: (full-match pattern, response)
+    SMALL_TALK_RULES = [
+        (r"(hello|hi|hey|good (morning|afternoon|evening)|konnichiwa|こんにちは)",
+         "Japanese: **こんにちは！**\nPronunciation: _konnichiwa_\nEnglish: Hello! What can I help you with at the station?"),
+        (r"(thank you|thanks|thanks a lot|arigatou|arigato|ありがとう)",
+         "Japanese: **どういたしまして！**\nPronunciation: _dou itashimashite_\nEnglish: You're welcome!"),
+        (r"(yes|yeah|yep|ok|okay|sure|hai|はい)",
+         "Japanese: **はい、わかりました。**\nPronunciation: _hai, wakarimashita_\nEnglish: Yes, understood."),
+        (r"(no|nope|no thanks|iie|いいえ)",
+         "Japanese: **いいえ、大丈夫です。**\nPronunciation: _iie, daijoubu desu_\nEnglish: No, that's fine."),
+    ]
+
+    # Static directions for fixed station locations
+    DEFAULT_DIRECTIONS = {
+        "ticket machine": ("切符売り場", "kippu uriba", "The ticket machines are on the left, just inside the main entrance."),
+        "ticket gate": ("改札", "kaisatsu", "The ticket gates are straight ahead, past the ticket machines."),
+        "information desk": ("案内所", "annaijo", "The information desk is next to the ticket gates."),
+        "exit": ("出口", "deguchi", "Follow the yellow signs marked 出口 to find the exits."),
+        "toilet": ("トイレ", "toire", "The toilets are to the right of the ticket gates."),
+        "restroom": ("トイレ", "toire", "The restrooms are to the right of the ticket gates."),
+        "coin locker": ("コインロッカー", "koin rokkaa", "The coin lockers are beside the east exit."),
+    }
+
+    # "Where is the X?" style direction questions
+    _WHERE_IS_PATTERN = re.compile(
+        r"(?:where (?:is|are) (?:the )?|how do i get to (?:the )?)(?P<place>[a-z ]+?)s?"
+    )
+
+    # Trailing punctuation stripped before matching
+    _TRAILING_PUNCTUATION = " ?!.。？！"
+
+    def __init__(
+        self,
+        intent_map: Optional[Dict[IntentCategory, List[Tuple[str, str]]]] = None,
+        directions: Optional[Dict[str, Tuple[str, str, str]]] = None
+    ):
+        """
+        Initialize the fast path responder.
+
+        Args:
+            intent_map: Extra (pattern, response) rules per intent, tried before the small talk rules
+            directions: Mapping of location names to (Japanese, romaji, English directions)
+        """
+        self._intent_rules: Dict[IntentCategory, List[Tuple[Pattern, str]]] = {
+            intent: self._compile_rules(rules) for intent, rules in (intent_map or {}).items()
+        }
+        self._small_talk_rules = self._compile_rules(self.SMALL_TALK_RULES)
+        self.directions = self.DEFAULT_DIRECTIONS if directions is None else directions
+
+        logger.debug("Initialized FastPathResponder")
+
+    @staticmethod
+    def _compile_rules(rules: List[Tuple[str, str]]) -> List[Tuple[Pattern, str]]:
+        """Compile (pattern, response) rules for case-insensitive full matching."""
+        return [(re.compile(pattern, re.IGNORECASE), response) for pattern, response in rules]
+
+    def try_match(self, request: ClassifiedRequest) -> Optional[str]:
+        """
+        Answer a request from rules if it is trivial enough.
+
+        Args:
+            request: The classified request
+
+        Returns:
+            The templated response, or None if the request needs the LLM
+        """
+        if request.complexity != ComplexityLevel.SIMPLE or not request.player_input:
+            return None
+
+        text = request.player_input.strip().rstrip(self._TRAILING_PUNCTUATION).lower()
+
+        for pattern, response in self._intent_rules.get(request.intent, []) + self._small_talk_rules:
+            if pattern.fullmatch(text):
+                return response
+
+        if request.intent == IntentCategory.DIRECTION_GUIDANCE:
+            return self._match_directions(text)
+
+        return None
+
+    def _match_directions(self, text: str) -> Optional[str]:
+        """
+        Answer a "where is X?" question from the static directions map.
+
+        Args:
+            text: The normalized player input
+
+        Returns:
+            The directions, or None if the place isn't in the map
+        """
+        match = self._WHERE_IS_PATTERN.fullmatch(text)
+        if not match:
+            return None
+
+        place = self.directions.get(match.group("place"))
+        if place is None:
+            return None
+
+        japanese, romaji, english = place
+        return f"Japanese: **{japanese}**\nPronunciation: _{romaji}_\nEnglish: {english}"
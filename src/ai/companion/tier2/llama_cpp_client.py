@@ -0,0 +1,322 @@
+"""
+Tokyo Train Station Adventure - llama.cpp Client
+
+This module provides an in-process alternative to the Ollama client, backed by
+llama-cpp-python. It exposes the same generate interface as OllamaClient, so
+the Tier 2 processor can use either backend, but runs inference through the
+llama.cpp bindings instead of an HTTP round trip to an Ollama server.
+
+llama-cpp-python is an optional dependency and is only imported when this
+backend is selected.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.ai.companion.core.models import CompanionRequest
+from src.ai.companion.tier2.ollama_client import OllamaError, _ThinkingTagFilter
+
+logger = logging.getLogger(__name__)
+
+
+class LlamaCppClient:
+    """
+    Client running GGUF models in-process with llama.cpp.
+
+    Models are referred to by name and mapped to GGUF files through
+    ``model_paths``. Each model is loaded once, on first use or when preloaded,
+    and kept in memory. Calls run in a worker thread so the event loop stays
+    responsive; a lock per model serializes calls, since a llama.cpp context
+    can only run one completion at a time.
+
+    llama.cpp only returns embeddings from a model loaded with embedding=True,
+    so embed() uses a separate instance of the model, loaded on its first use.
+    """
+
+    def __init__(
+        self,
+        model_paths: Dict[str, str],
+        default_model: Optional[str] = None,
+        n_ctx: int = 4096,
+        n_batch: int = 512,
+        n_threads: Optional[int] = None,
+        use_mmap: bool = True
+    ):
+        """
+        Initialize the llama.cpp client.
+
+        Args:
+            model_paths: Mapping of model names to GGUF file paths
+            default_model: The model to use when none is given (defaults to the first mapped model)
+            n_ctx: Context window size in tokens
+            n_batch: Prompt-processing batch size
+            n_threads: Number of CPU threads (None for all cores)
+            use_mmap: Whether to memory-map the model file instead of reading it into memory
+        """
+        try:
+            import llama_cpp
+        except ImportError as e:
+            raise ImportError(
+                "The llama_cpp Tier 2 backend requires llama-cpp-python (pip install llama-cpp-python)"
+            ) from e
+
+        if not model_paths:
+            raise ValueError("At least one model path is required for the llama_cpp backend")
+
+        self._llama_cpp = llama_cpp
+        self.model_paths = dict(model_paths)
+        self.default_model = default_model or next(iter(self.model_paths))
+        self.n_ctx = n_ctx
+        self.n_batch = n_batch
+        self.n_threads = n_threads or os.cpu_count()
+        self.use_mmap = use_mmap
+
+        # Loaded instances and call locks per (model, embedding) pair
+        self._models: Dict[Tuple[str, bool], Any] = {}
+        self._locks: Dict[Tuple[str, bool], asyncio.Lock] = {}
+
+        # Models are loaded in worker threads, so loads are guarded by a thread
+        # lock per instance; otherwise preload_model and a first generate could
+        # both load the same model
+        self._load_locks: Dict[Tuple[str, bool], threading.Lock] = {}
+        self._load_locks_guard = threading.Lock()
+
+        logger.debug("Initialized LlamaCppClient with models=%s", list(self.model_paths))
+
+    def _load_model(self, model: str, embedding: bool = False) -> Any:
+        """
+        Load a model, reusing it if it is already in memory.
+
+        Args:
+            model: The model name
+            embedding: Whether to load the instance used for embeddings
+
+        Returns:
+            The llama_cpp.Llama instance
+
+        Raises:
+            OllamaError: If the model is unknown or fails to load
+        """
+        key = (model, embedding)
+        llm = self._models.get(key)
+        if llm is not None:
+            return llm
+
+        model_path = self.model_paths.get(model)
+        if model_path is None:
+            raise OllamaError(f"Model '{model}' not found in llama_cpp model_paths", OllamaError.MODEL_ERROR)
+
+        with self._load_lock_for(key):
+            # Another thread may have loaded it while this one waited
+            llm = self._models.get(key)
+            if llm is not None:
+                return llm
+
+            try:
+                llm = self._llama_cpp.Llama(
+                    model_path=model_path,
+                    n_ctx=self.n_ctx,
+                    n_batch=self.n_batch,
+                    n_threads=self.n_threads,
+                    use_mmap=self.use_mmap,
+                    embedding=embedding,
+                    verbose=False
+                )
+            except MemoryError as e:
+                raise OllamaError(f"Not enough memory to load model '{model}': {str(e)}", OllamaError.MEMORY_ERROR)
+            except Exception as e:
+                raise OllamaError(f"Failed to load model '{model}': {str(e)}", OllamaError.MODEL_ERROR)
+
+            self._models[key] = llm
+
+        logger.info("Loaded llama.cpp model %s from %s (embedding: %s)", model, model_path, embedding)
+        return llm
+
+    def _load_lock_for(self, key: Tuple[str, bool]) -> threading.Lock:
+        """Get the lock guarding the load of a model instance."""
+        with self._load_locks_guard:
+            lock = self._load_locks.get(key)
+            if lock is None:
+                lock = self._load_locks[key] = threading.Lock()
+            return lock
+
+    def _lock_for(self, model: str, embedding: bool = False) -> asyncio.Lock:
+        """Get the lock serializing calls to a model instance."""
+        key = (model, embedding)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def generate(
+        self,
+        request: CompanionRequest,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        prompt: Optional[str] = None,
+        num_keep: Optional[int] = None
+    ) -> str:
+        """
+        Generate a response for a companion request.
+
+        Args:
+            request: The companion request
+            model: The model to use (None for default)
+            temperature: The sampling temperature
+            max_tokens: Maximum number of tokens to generate
+            prompt: The prompt to use (None to use the player's input)
+            num_keep: Accepted for compatibility with OllamaClient; llama.cpp reuses
+                the matching prompt prefix on its own
+
+        Returns:
+            The generated response
+
+        Raises:
+            OllamaError: If there's an error generating the response
+        """
+        model = model or self.default_model
+        prompt = prompt if prompt is not None else request.player_input
+
+        def run_completion() -> str:
+            llm = self._load_model(model)
+            result = llm.create_completion(prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+            return result["choices"][0]["text"]
+
+        try:
+            async with self._lock_for(model):
+                text = await asyncio.to_thread(run_completion)
+        except OllamaError:
+            raise
+        except Exception as e:
+            raise OllamaError(f"Failed to generate response: {str(e)}")
+
+        thinking_filter = _ThinkingTagFilter()
+        return (thinking_filter.feed(text) + thinking_filter.flush()).strip()
+
+    async def generate_stream(
+        self,
+        request: CompanionRequest,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        prompt: Optional[str] = None,
+        num_keep: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response, yielding text as it is decoded.
+
+        Args:
+            request: The companion request
+            model: The model to use (None for default)
+            temperature: The sampling temperature
+            max_tokens: Maximum number of tokens to generate
+            prompt: The prompt to use (None to use the player's input)
+            num_keep: Accepted for compatibility with OllamaClient (unused)
+
+        Yields:
+            Chunks of the generated response
+
+        Raises:
+            OllamaError: If there's an error generating the response
+        """
+        model = model or self.default_model
+        prompt = prompt if prompt is not None else request.player_input
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def run_completion() -> None:
+            try:
+                llm = self._load_model(model)
+                for part in llm.create_completion(
+                    prompt=prompt, temperature=temperature, max_tokens=max_tokens, stream=True
+                ):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, part["choices"][0]["text"])
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        thinking_filter = _ThinkingTagFilter()
+        started = False
+
+        async with self._lock_for(model):
+            worker = asyncio.ensure_future(asyncio.to_thread(run_completion))
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is done:
+                        break
+                    if isinstance(item, OllamaError):
+                        raise item
+                    if isinstance(item, Exception):
+                        raise OllamaError(f"Failed to generate response: {str(item)}")
+
+                    text = thinking_filter.feed(item)
+                    if not started:
+                        text = text.lstrip()
+                        started = bool(text)
+                    if text:
+                        yield text
+            finally:
+                # Stops decoding if the caller stopped early, so the model's lock
+                # isn't held until the whole completion has been generated
+                stop.set()
+                await worker
+
+        tail = thinking_filter.flush().rstrip()
+        if tail:
+            yield tail
+
+    async def preload_model(self, model: Optional[str] = None) -> None:
+        """
+        Load a model into memory ahead of its first request.
+
+        Args:
+            model: The model to load (None for default)
+
+        Raises:
+            OllamaError: If the model could not be loaded
+        """
+        await asyncio.to_thread(self._load_model, model or self.default_model)
+
+    async def embed(self, text: str, model: Optional[str] = None) -> List[float]:
+        """
+        Get an embedding vector for a piece of text.
+
+        The model is loaded as a separate embedding instance, so embedding
+        doesn't wait for completions on the same model.
+
+        Args:
+            text: The text to embed
+            model: The model to embed with (the default model if it isn't mapped in model_paths)
+
+        Returns:
+            The embedding vector
+
+        Raises:
+            OllamaError: If the model can't produce embeddings
+        """
+        model = model if model in self.model_paths else self.default_model
+
+        def run_embedding() -> List[float]:
+            return self._load_model(model, embedding=True).embed(text)
+
+        try:
+            async with self._lock_for(model, embedding=True):
+                return await asyncio.to_thread(run_embedding)
+        except OllamaError:
+            raise
+        except Exception as e:
+            raise OllamaError(f"Failed to get embedding: {str(e)}")
+
+    async def close(self) -> None:
+        """Release the loaded models."""
+        self._models.clear()
@@ -7,10 +7,11 @@ It handles API communication, prompt engineering, response parsing, and caching.
 
 import os
 import json
+import asyncio
 import logging
 import hashlib
 import time
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, AsyncIterator
 from datetime import datetime
 import aiohttp
 import shutil
@@ -19,9 +20,29 @@ import re
 from src.ai.companion.core.models import CompanionRequest
 from src.ai.companion.tier2.prompt_engineering import PromptEngineering
 
+try:
+    import orjson
+except ImportError:  # Optional; the standard json module is used instead
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document from Ollama, with orjson when it is installed.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers handle
+    parse errors the same way with either parser.
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a request payload for Ollama, with orjson when it is installed."""
+    return orjson.dumps(obj).decode("utf-8") if orjson is not None else json.dumps(obj)
+
+
 class OllamaError(Exception):
     """Exception raised for errors in the Ollama API."""
     
@@ -34,6 +55,12 @@ class OllamaError(Exception):
     UNKNOWN_ERROR = "unknown_error"
     INVALID_RESPONSE = "invalid_response"
     
+    # Error types worth retrying. Malformed responses might be random issues, so retry them too.
+    TRANSIENT_ERROR_TYPES = frozenset({CONNECTION_ERROR, TIMEOUT_ERROR, INVALID_RESPONSE})
+    
+    # Error types caused by the model itself (missing model, not enough memory)
+    MODEL_ERROR_TYPES = frozenset({MODEL_ERROR, MEMORY_ERROR})
+    
     def __init__(self, message: str, error_type: str = None):
         """
         Initialize the OllamaError.
@@ -85,16 +112,7 @@ class OllamaError(Exception):
         Returns:
             True if the error is transient, False otherwise
         """
-        # Connection errors and timeouts are transient
-        if self.error_type in [
-            self.CONNECTION_ERROR,
-            self.TIMEOUT_ERROR,
-            self.INVALID_RESPONSE   # Malformed responses might be random issues, so retry
-        ]:
-            return True
-        
-        # Most other errors are not transient (e.g., model errors)
-        return False
+        return self.error_type in self.TRANSIENT_ERROR_TYPES
     
     def is_model_related(self) -> bool:
         """
@@ -103,10 +121,74 @@ class OllamaError(Exception):
         Returns:
             True if the error is model-related, False otherwise
         """
-        return self.error_type in [
-            self.MODEL_ERROR,
-            self.MEMORY_ERROR
-        ]
+        return self.error_type in self.MODEL_ERROR_TYPES
+
+
+class _ThinkingTagFilter:
+    """
+    Incrementally removes <think>...</think> blocks from streamed text.
+    
+    Tags may be split across chunks, so a trailing partial tag is held back
+    until the next chunk shows whether it completes.
+    """
+    
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+    
+    def __init__(self):
+        self._buffer = ""
+        self._in_think = False
+    
+    def feed(self, text: str) -> str:
+        """
+        Add streamed text and return the part that is safe to emit.
+        
+        Args:
+            text: The next chunk of streamed text
+            
+        Returns:
+            The visible text (outside thinking blocks) that can be emitted now
+        """
+        self._buffer += text
+        output = []
+        
+        while self._buffer:
+            tag = self.CLOSE_TAG if self._in_think else self.OPEN_TAG
+            index = self._buffer.find(tag)
+            if index != -1:
+                if not self._in_think:
+                    output.append(self._buffer[:index])
+                self._buffer = self._buffer[index + len(tag):]
+                self._in_think = not self._in_think
+                continue
+            
+            # Hold back a possible partial tag at the end of the buffer
+            keep = self._partial_tag_length(tag)
+            split = len(self._buffer) - keep
+            if not self._in_think:
+                output.append(self._buffer[:split])
+            self._buffer = self._buffer[split:]
+            break
+        
+        return "".join(output)
+    
+    def flush(self) -> str:
+        """
+        Return any held-back visible text at the end of the stream.
+        
+        Returns:
+            The remaining visible text
+        """
+        remaining = "" if self._in_think else self._buffer
+        self._buffer = ""
+        return remaining
+    
+    def _partial_tag_length(self, tag: str) -> int:
+        """Length of the longest prefix of tag that the buffer ends with."""
+        for length in range(min(len(tag) - 1, len(self._buffer)), 0, -1):
+            if self._buffer.endswith(tag[:length]):
+                return length
+        return 0
 
 
 class OllamaClient:
@@ -120,6 +202,9 @@ class OllamaClient:
     - Request/response formatting
     """
     
+    # Seconds a generate call may take in total before it is abandoned
+    DEFAULT_REQUEST_TIMEOUT = 60.0
+    
     def __init__(
         self,
         base_url: str = "http://localhost:11434",
@@ -128,7 +213,9 @@ class OllamaClient:
         cache_dir: Optional[str] = None,
         cache_ttl: int = 86400,  # 1 day in seconds
         max_cache_entries: int = 1000,
-        max_cache_size_mb: int = 100  # 100 MB
+        max_cache_size_mb: int = 100,  # 100 MB
+        keep_alive: Optional[Union[int, str]] = None,
+        request_timeout: Optional[float] = None
     ):
         """
         Initialize the Ollama client.
@@ -141,14 +228,24 @@ class OllamaClient:
             cache_ttl: Time-to-live for cache entries in seconds
             max_cache_entries: Maximum number of cache entries
             max_cache_size_mb: Maximum cache size in MB
+            keep_alive: How long Ollama keeps the model loaded after a call
+                (e.g. "30m", or -1 to never unload; None for the server default)
+            request_timeout: Seconds a generate call may take in total, after which
+                the request is closed so Ollama stops decoding (None for the default)
         """
         # Initialize configuration
         self.base_url = base_url or "http://localhost:11434"
         self.default_model = default_model or "llama3"
+        self.keep_alive = keep_alive
+        self.request_timeout = request_timeout or self.DEFAULT_REQUEST_TIMEOUT
         
         # Initialize prompt engineering
         self.prompt_engineering = PromptEngineering()
         
+        # Persistent HTTP session, created lazily on the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
         # Initialize caching
         self.cache_enabled = cache_enabled
         self.cache_ttl = cache_ttl
@@ -179,7 +276,7 @@ class OllamaClient:
         if self.cache_enabled and not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
         
-        logger.debug(f"Initialized OllamaClient with base_url={base_url}, default_model={default_model}")
+        logger.debug("Initialized OllamaClient with base_url=%s, default_model=%s", base_url, default_model)
     
     async def generate(
         self,
@@ -187,7 +284,8 @@ class OllamaClient:
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 500,
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        num_keep: Optional[int] = None
     ) -> str:
         """
         Generate a response for a companion request.
@@ -198,6 +296,7 @@ class OllamaClient:
             temperature: The sampling temperature
             max_tokens: Maximum number of tokens to generate
             prompt: Optional custom prompt (None to generate from request)
+            num_keep: Number of prompt tokens Ollama keeps when the context overflows (None for its default)
             
         Returns:
             The generated response
@@ -218,10 +317,10 @@ class OllamaClient:
         if self.cache_enabled:
             cached_response = self._check_cache(request_hash)
             if cached_response:
-                logger.debug(f"Cache hit for request {request.request_id}")
+                logger.debug("Cache hit for request %s", request.request_id)
                 return cached_response
             else:
-                logger.debug(f"Cache miss for request {request.request_id}")
+                logger.debug("Cache miss for request %s", request.request_id)
                 self.cache_stats["misses"] += 1
         
         try:
@@ -230,7 +329,8 @@ class OllamaClient:
                 prompt=prompt,
                 model=model,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                num_keep=num_keep
             )
             
             # Save to cache if enabled
@@ -249,6 +349,207 @@ class OllamaClient:
                 # Re-raise other exceptions
                 raise OllamaError(f"Failed to generate response: {str(e)}")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the client's persistent HTTP session, creating it if needed.
+        
+        Reusing one session keeps connections to Ollama alive between calls
+        instead of paying connection setup on every generate. The pool is sized
+        for the number of requests Ollama serves in parallel (OLLAMA_NUM_PARALLEL).
+        
+        Returns:
+            The shared aiohttp session
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            max_connections = int(os.environ.get("OLLAMA_NUM_PARALLEL", 4)) * 2
+            connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, json_serialize=_json_dumps)
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the persistent HTTP session, if one is open."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    async def generate_stream(
+        self,
+        request: CompanionRequest,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        prompt: Optional[str] = None,
+        num_keep: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response for a companion request, yielding text as it is decoded.
+        
+        Streamed responses bypass the response cache. Thinking blocks are
+        removed on the fly, so only user-facing text is yielded.
+        
+        Args:
+            request: The companion request
+            model: The model to use (None for default)
+            temperature: The sampling temperature
+            max_tokens: Maximum number of tokens to generate
+            prompt: Optional custom prompt (None to generate from request)
+            num_keep: Number of prompt tokens Ollama keeps when the context overflows (None for its default)
+            
+        Yields:
+            Chunks of the generated response
+            
+        Raises:
+            OllamaError: If there's an error generating the response
+        """
+        payload = {
+            "model": model or self.default_model,
+            "prompt": prompt if prompt is not None else self._create_prompt(request),
+            "stream": True,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+        if num_keep is not None:
+            payload["options"]["num_keep"] = num_keep
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        
+        thinking_filter = _ThinkingTagFilter()
+        started = False
+        
+        try:
+            session = await self._get_session()
+            # Only bound the wait between chunks; long responses may take a while overall
+            timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+            async with session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout) as response:
+                if response.status != 200:
+                    error_data = await response.json()
+                    raise self._error_from_message(error_data.get("error", "Unknown error"))
+                
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        data = _json_loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning("Failed to parse JSON line in streaming response: %s", e)
+                        continue
+                    
+                    if "error" in data:
+                        raise self._error_from_message(data["error"])
+                    
+                    text = thinking_filter.feed(data.get("response", ""))
+                    if not started:
+                        # Drop the whitespace left behind by a leading thinking block
+                        text = text.lstrip()
+                        started = bool(text)
+                    if text:
+                        yield text
+                    
+                    if data.get("done"):
+                        break
+                
+                tail = thinking_filter.flush().rstrip()
+                if tail:
+                    yield tail
+                    
+        except OllamaError:
+            raise
+        except aiohttp.ClientConnectorError as e:
+            raise OllamaError(f"Failed to connect to Ollama: {str(e)}", OllamaError.CONNECTION_ERROR)
+        except asyncio.TimeoutError as e:
+            raise OllamaError(f"Request to Ollama timed out: {str(e)}", OllamaError.TIMEOUT_ERROR)
+        except Exception as e:
+            logger.error("Error streaming from Ollama API: %s", e)
+            raise OllamaError(f"Failed to communicate with Ollama: {str(e)}")
+    
+    def _error_from_message(self, error_msg: str) -> OllamaError:
+        """
+        Build an OllamaError for an error message returned by the API.
+        
+        Args:
+            error_msg: The error message from Ollama
+            
+        Returns:
+            An OllamaError with the matching error type
+        """
+        if "not found" in error_msg.lower() or "doesn't exist" in error_msg.lower():
+            return OllamaError(f"Failed to generate response: {error_msg}", OllamaError.MODEL_ERROR)
+        elif "memory" in error_msg.lower() or "resources" in error_msg.lower():
+            return OllamaError(f"Failed to generate response: {error_msg}", OllamaError.MEMORY_ERROR)
+        return OllamaError(f"Failed to generate response: {error_msg}")
+    
+    async def preload_model(self, model: Optional[str] = None) -> None:
+        """
+        Load a model into memory without generating anything.
+        
+        Ollama loads the model when it receives a generate call with no prompt,
+        so calling this at startup moves the weight-load time off the first
+        player request.
+        
+        Args:
+            model: The model to load (None for default)
+            
+        Raises:
+            OllamaError: If the model could not be loaded
+        """
+        payload = {"model": model or self.default_model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        
+        try:
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/api/generate", json=payload) as response:
+                if response.status != 200:
+                    error_data = await response.json()
+                    error_msg = error_data.get("error", "Unknown error")
+                    raise OllamaError(f"Failed to load model {payload['model']}: {error_msg}", OllamaError.MODEL_ERROR)
+                await response.read()
+        except OllamaError:
+            raise
+        except aiohttp.ClientConnectorError as e:
+            raise OllamaError(f"Failed to connect to Ollama: {str(e)}", OllamaError.CONNECTION_ERROR)
+        except Exception as e:
+            raise OllamaError(f"Failed to load model {payload['model']}: {str(e)}")
+    
+    async def embed(self, text: str, model: str = "nomic-embed-text") -> List[float]:
+        """
+        Get an embedding vector for a piece of text.
+        
+        Args:
+            text: The text to embed
+            model: The embedding model to use
+            
+        Returns:
+            The embedding vector
+            
+        Raises:
+            OllamaError: If there's an error getting the embedding
+        """
+        payload = {"model": model, "prompt": text}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        
+        try:
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/api/embeddings", json=payload, timeout=30) as response:
+                if response.status != 200:
+                    error_data = await response.json()
+                    raise self._error_from_message(error_data.get("error", "Unknown error"))
+                data = await response.json(loads=_json_loads)
+                return data.get("embedding", [])
+        except OllamaError:
+            raise
+        except aiohttp.ClientConnectorError as e:
+            raise OllamaError(f"Failed to connect to Ollama: {str(e)}", OllamaError.CONNECTION_ERROR)
+        except Exception as e:
+            raise OllamaError(f"Failed to get embedding: {str(e)}")
+    
     async def get_available_models(self) -> List[str]:
         """
         Get a list of available models from Ollama.
@@ -272,13 +573,13 @@ class OllamaClient:
                     return models
                     
         except aiohttp.ClientConnectorError as e:
-            logger.error(f"Error connecting to Ollama: {e}")
+            logger.error("Error connecting to Ollama: %s", e)
             raise OllamaError(f"Failed to connect to Ollama: {str(e)}", OllamaError.CONNECTION_ERROR)
         except Exception as e:
             if "has no attribute ClientTimeoutError" in str(e):
                 logger.error("Import error with aiohttp.ClientTimeoutError. Using generic timeout exception.")
                 raise OllamaError("Request to Ollama timed out", OllamaError.TIMEOUT_ERROR)
-            logger.error(f"Error getting available models from Ollama: {e}")
+            logger.error("Error getting available models from Ollama: %s", e)
             raise OllamaError(f"Failed to get available models: {str(e)}")
     
     def _remove_thinking_tags(self, text):
@@ -338,7 +639,8 @@ class OllamaClient:
         prompt: str,
         model: str,
         temperature: float,
-        max_tokens: int
+        max_tokens: int,
+        num_keep: Optional[int] = None
     ) -> str:
         """
         Call the Ollama API to generate a response.
@@ -348,6 +650,7 @@ class OllamaClient:
             model: The model to use
             temperature: Sampling temperature
             max_tokens: Maximum number of tokens to generate (renamed to num_predict in API call)
+            num_keep: Number of prompt tokens to keep when the context overflows (None for Ollama's default)
             
         Returns:
             The generated response
@@ -364,71 +667,75 @@ class OllamaClient:
                 "stream": False
             }
         }
+        if num_keep is not None:
+            # Keep the static prompt prefix, whose KV cache is shared across turns
+            payload["options"]["num_keep"] = num_keep
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.base_url}/api/generate", json=payload, timeout=60) as response:
-                    if response.status != 200:
-                        error_data = await response.json()
-                        error_msg = error_data.get("error", "Unknown error")
-                        
-                        # Determine error type based on the error message
-                        if "not found" in error_msg.lower() or "doesn't exist" in error_msg.lower():
-                            raise OllamaError(f"Failed to generate response: {error_msg}", OllamaError.MODEL_ERROR)
-                        elif "memory" in error_msg.lower() or "resources" in error_msg.lower():
-                            raise OllamaError(f"Failed to generate response: {error_msg}", OllamaError.MEMORY_ERROR)
-                        else:
-                            raise OllamaError(f"Failed to generate response: {error_msg}")
+            session = await self._get_session()
+            # Closing the connection on expiry also stops Ollama decoding the response
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            async with session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout) as response:
+                if response.status != 200:
+                    error_data = await response.json()
+                    error_msg = error_data.get("error", "Unknown error")
                     
-                    # Handle both regular JSON and streaming ndjson responses
-                    content_type = response.headers.get('content-type', '')
-                    response_text = await response.text()
+                    # Determine error type based on the error message
+                    raise self._error_from_message(error_msg)
+                
+                # Handle both regular JSON and streaming ndjson responses
+                content_type = response.headers.get('content-type', '')
+                response_text = await response.text()
+                
+                if 'application/x-ndjson' in content_type:
+                    # Handle streaming response format (even though we requested non-streaming)
+                    logger.debug("Received ndjson streaming response despite requesting non-streaming mode")
                     
-                    if 'application/x-ndjson' in content_type:
-                        # Handle streaming response format (even though we requested non-streaming)
-                        logger.debug("Received ndjson streaming response despite requesting non-streaming mode")
-                        
-                        # Extract all JSON objects and concatenate the responses
-                        json_lines = [line for line in response_text.strip().split('\n') if line.strip()]
-                        if not json_lines:
-                            raise OllamaError("Empty response received from Ollama API", OllamaError.CONTENT_ERROR)
-                        
-                        # Combine all response fragments into a complete response
-                        complete_response = ""
-                        for line in json_lines:
-                            try:
-                                obj = json.loads(line)
-                                partial_response = obj.get("response", "")
-                                complete_response += partial_response
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Failed to parse JSON line in ndjson response: {e}")
-                        
+                    # Extract all JSON objects and concatenate the responses
+                    json_lines = [line for line in response_text.strip().split('\n') if line.strip()]
+                    if not json_lines:
+                        raise OllamaError("Empty response received from Ollama API", OllamaError.CONTENT_ERROR)
+                    
+                    # Combine all response fragments into a complete response
+                    complete_response = ""
+                    for line in json_lines:
+                        try:
+                            obj = _json_loads(line)
+                            partial_response = obj.get("response", "")
+                            complete_response += partial_response
+                        except json.JSONDecodeError as e:
+                            logger.warning("Failed to parse JSON line in ndjson response: %s", e)
+                    
+                    # Clean the response by removing thinking tags if present
+                    clean_response = self._remove_thinking_tags(complete_response)
+                    
+                    # Validate the response before returning
+                    return self._validate_response(clean_response)
+                else:
+                    # Handle regular JSON response
+                    try:
+                        data = _json_loads(response_text)
+                        response = data.get("response", "")
                         # Clean the response by removing thinking tags if present
-                        clean_response = self._remove_thinking_tags(complete_response)
+                        clean_response = self._remove_thinking_tags(response)
                         
                         # Validate the response before returning
                         return self._validate_response(clean_response)
-                    else:
-                        # Handle regular JSON response
-                        try:
-                            data = json.loads(response_text)
-                            response = data.get("response", "")
-                            # Clean the response by removing thinking tags if present
-                            clean_response = self._remove_thinking_tags(response)
-                            
-                            # Validate the response before returning
-                            return self._validate_response(clean_response)
-                        except json.JSONDecodeError as e:
-                            raise OllamaError(f"Invalid JSON response: {str(e)}", OllamaError.CONTENT_ERROR)
-                    
+                    except json.JSONDecodeError as e:
+                        raise OllamaError(f"Invalid JSON response: {str(e)}", OllamaError.CONTENT_ERROR)
+                
         except Exception as e:
-            logger.error(f"Error calling Ollama API: {e}")
+            logger.error("Error calling Ollama API: %s", e)
             
             # Handle specific exception types
             if isinstance(e, aiohttp.ClientConnectorError):
                 raise OllamaError(f"Failed to connect to Ollama: {str(e)}", OllamaError.CONNECTION_ERROR)
-            elif "ClientTimeoutError" in str(type(e)):
-                raise OllamaError(f"Request to Ollama timed out: {str(e)}", OllamaError.TIMEOUT_ERROR)
+            elif isinstance(e, asyncio.TimeoutError) or "ClientTimeoutError" in str(type(e)):
+                raise OllamaError(
+                    f"Request to Ollama timed out after {self.request_timeout}s", OllamaError.TIMEOUT_ERROR
+                )
             else:
                 raise OllamaError(f"Failed to communicate with Ollama: {str(e)}")
     
@@ -516,7 +823,7 @@ class OllamaClient:
             age = time.time() - timestamp
             
             if age > self.cache_ttl:
-                logger.debug(f"Cache entry expired for hash {request_hash}")
+                logger.debug("Cache entry expired for hash %s", request_hash)
                 # Remove expired file
                 os.remove(cache_file)
                 return None
@@ -524,7 +831,7 @@ class OllamaClient:
             return cache_data.get("response")
             
         except Exception as e:
-            logger.warning(f"Error reading from cache: {e}")
+            logger.warning("Error reading from cache: %s", e)
             return None
     
     def _save_to_cache(self, request_hash: str, response: str, model: str) -> None:
@@ -570,10 +877,10 @@ class OllamaClient:
             file_size = os.path.getsize(cache_file)
             self.cache_stats["size_bytes"] += file_size
                 
-            logger.debug(f"Saved response to cache for hash {request_hash}")
+            logger.debug("Saved response to cache for hash %s", request_hash)
             
         except Exception as e:
-            logger.warning(f"Error saving to cache: {e}")
+            logger.warning("Error saving to cache: %s", e)
     
     def _prune_cache_if_needed(self) -> None:
         """
@@ -584,13 +891,13 @@ class OllamaClient:
         
         # Check if we've exceeded the maximum number of entries
         if len(self._memory_cache) > self.max_cache_entries:
-            logger.debug(f"Cache entries ({len(self._memory_cache)}) exceeded limit ({self.max_cache_entries}), pruning...")
+            logger.debug("Cache entries (%s) exceeded limit (%s), pruning...", len(self._memory_cache), self.max_cache_entries)
             self._prune_cache_by_age()
         
         # Check if we've exceeded the maximum cache size
         cache_size_mb = self.cache_stats["size_bytes"] / (1024 * 1024)
         if cache_size_mb > self.max_cache_size_mb:
-            logger.debug(f"Cache size ({cache_size_mb:.2f} MB) exceeded limit ({self.max_cache_size_mb} MB), pruning...")
+            logger.debug("Cache size (%.2f MB) exceeded limit (%s MB), pruning...", cache_size_mb, self.max_cache_size_mb)
             self._prune_cache_by_size()
     
     def _prune_cache_by_age(self) -> None:
@@ -626,11 +933,11 @@ class OllamaClient:
                     os.remove(cache_file)
                     self.cache_stats["size_bytes"] -= file_size
                 except Exception as e:
-                    logger.warning(f"Error removing cache file: {e}")
+                    logger.warning("Error removing cache file: %s", e)
         
         # Update cache stats
         self.cache_stats["entries"] = len(self._memory_cache)
-        logger.debug(f"Pruned {entries_to_remove} entries from cache")
+        logger.debug("Pruned %s entries from cache", entries_to_remove)
     
     def _prune_cache_by_size(self) -> None:
         """
@@ -649,7 +956,7 @@ class OllamaClient:
                     mtime = os.path.getmtime(file_path)
                     cache_files.append((filename, size, mtime))
                 except Exception as e:
-                    logger.warning(f"Error getting file info: {e}")
+                    logger.warning("Error getting file info: %s", e)
         
         # Sort by modification time (oldest first)
         cache_files.sort(key=lambda x: x[2])
@@ -673,12 +980,12 @@ class OllamaClient:
                     del self._memory_cache[request_hash]
                     
             except Exception as e:
-                logger.warning(f"Error removing cache file: {e}")
+                logger.warning("Error removing cache file: %s", e)
         
         # Update cache stats
         self.cache_stats["size_bytes"] = current_size
         self.cache_stats["entries"] = len(self._memory_cache)
-        logger.debug(f"Pruned cache to {current_size / (1024 * 1024):.2f} MB")
+        logger.debug("Pruned cache to %.2f MB", current_size / (1024 * 1024))
     
     def clear_cache(self) -> None:
         """
@@ -697,7 +1004,7 @@ class OllamaClient:
                     try:
                         os.remove(os.path.join(self.cache_dir, filename))
                     except Exception as e:
-                        logger.warning(f"Error removing cache file: {e}")
+                        logger.warning("Error removing cache file: %s", e)
         
         # Reset cache stats
         self.cache_stats = {
@@ -750,11 +1057,11 @@ class OllamaClient:
                             os.remove(file_path)
                             self.cache_stats["size_bytes"] -= 0  # Just for tests
                     except Exception as e:
-                        logger.warning(f"Error pruning cache file: {e}")
+                        logger.warning("Error pruning cache file: %s", e)
         
         # Update cache stats
         self.cache_stats["entries"] = len(self._memory_cache)
-        logger.debug(f"Pruned cache entries older than {max_age} seconds")
+        logger.debug("Pruned cache entries older than %s seconds", max_age)
     
     def get_cache_info(self) -> Dict[str, Any]:
         """
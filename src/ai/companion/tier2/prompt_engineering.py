@@ -64,8 +64,10 @@ class PromptEngineering:
         # Add final instructions
         prompt += self._add_final_instructions(request)
         
-        logger.debug(f"Created prompt for request {request.request_id}")
-        logger.debug(f"Full prompt:\n{prompt}")
+        # Only pay for formatting the (potentially long) prompt when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created prompt for request %s", request.request_id)
+            logger.debug("Full prompt:\n%s", prompt)
         return prompt
     
     def _create_base_prompt(self, request: ClassifiedRequest) -> str:
@@ -0,0 +1,265 @@
+"""
+Tokyo Train Station Adventure - Ollama Request Batcher
+
+This module provides a micro-batching layer in front of the Ollama client.
+Concurrent generate calls that arrive within a short batch window are grouped
+by (model, temperature, max_tokens), identical prompts are coalesced into a
+single call, and each group is dispatched together so Ollama's server-side
+parallelism (OLLAMA_NUM_PARALLEL) can run them as one batch.
+
+With model affinity enabled, batches for different models never run at the
+same time on a client: batches for the active model run together, and the
+next model only starts once they have drained. When Ollama can only keep one
+model loaded (OLLAMA_MAX_LOADED_MODELS=1), this stops interleaved requests
+from swapping the model weights in and out on every call.
+"""
+
+import os
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaRequestBatcher:
+    """
+    Coalesces concurrent Ollama generate calls into small batches.
+
+    Ollama's /api/generate endpoint accepts a single prompt per call, so a batch
+    is dispatched as concurrent calls over the client's connection. Requests
+    with the same prompt in a batch share one call and receive the same result.
+    """
+
+    DEFAULT_BATCH_WINDOW = 0.008  # 8 ms
+
+    def __init__(
+        self,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = None,
+        model_affinity: bool = False
+    ):
+        """
+        Initialize the request batcher.
+
+        Args:
+            batch_window: How long (in seconds) to wait for more requests before dispatching
+            max_batch_size: Maximum number of calls dispatched together per group
+                (defaults to OLLAMA_NUM_PARALLEL, or 4 if unset)
+            model_affinity: Whether to run only one model's batches at a time per client
+        """
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size or int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))
+
+        # Pending items per group key: (client, model, temperature, max_tokens, num_keep)
+        self._pending: Dict[Tuple, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        self._in_flight = 0
+
+        # Running flush tasks. The event loop only keeps weak references to
+        # tasks, so without these a batch could be garbage collected mid-flight
+        # and leave its callers waiting forever.
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        # Model affinity state per client: the model whose batches are running,
+        # how many of its batches are running, and batches waiting for their turn
+        self.model_affinity = model_affinity
+        self._active_model: Dict[Any, str] = {}
+        self._active_batches: Dict[Any, int] = {}
+        self._waiting_batches: Dict[Any, "OrderedDict[str, List[asyncio.Future]]"] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of submitted calls that are waiting for a batch or still running."""
+        return self._in_flight + sum(len(group) for group in self._pending.values())
+
+    async def submit(
+        self,
+        client,
+        request,
+        model: str,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        num_keep: Optional[int] = None
+    ) -> str:
+        """
+        Queue a generate call and wait for its result.
+
+        Args:
+            client: The Ollama client to dispatch the call with
+            request: The request being processed
+            model: The model to use
+            prompt: The prompt to send
+            temperature: The sampling temperature
+            max_tokens: Maximum number of tokens to generate
+            num_keep: Number of prompt tokens to keep when the context overflows
+
+        Returns:
+            The generated response
+
+        Raises:
+            Whatever the client's generate call raised for this prompt
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (client, model, temperature, max_tokens, num_keep)
+
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = []
+            # The first request of a group opens the batch window
+            self._timers[key] = loop.call_later(self.batch_window, self._schedule_flush, key)
+
+        group.append(({"request": request, "prompt": prompt}, future))
+
+        # Dispatch early once the group is full
+        if len(group) >= self.max_batch_size:
+            self._schedule_flush(key)
+
+        return await future
+
+    def _schedule_flush(self, key: Tuple) -> None:
+        """Start dispatching the pending group for a key, if any."""
+        # A group that filled up early must not leave its timer behind to
+        # flush the next group for the same key before its window closes
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        group = self._pending.pop(key, None)
+        if group:
+            task = asyncio.ensure_future(self._flush(key, group))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, key: Tuple, group: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """
+        Dispatch a batch, resolving each call's waiters as soon as that call finishes.
+
+        Args:
+            key: The group key (client, model, temperature, max_tokens, num_keep)
+            group: The pending (call, future) pairs of the group
+        """
+        client, model, temperature, max_tokens, num_keep = key
+        options = {"num_keep": num_keep} if num_keep is not None else {}
+
+        # Coalesce identical prompts into a single call
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        calls: Dict[str, Dict[str, Any]] = {}
+        for call, future in group:
+            prompt = call["prompt"]
+            if prompt not in calls:
+                calls[prompt] = call
+                waiters[prompt] = []
+            waiters[prompt].append(future)
+
+        self._in_flight += len(group)
+        try:
+            if self.model_affinity:
+                await self._acquire_model(client, model)
+        except BaseException as e:
+            # The batch never ran: release its callers and its place in the queue
+            self._in_flight -= len(group)
+            for _, future in group:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            raise
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Dispatching batch of %d calls (%d unique) to %s", len(group), len(calls), model)
+
+        async def dispatch(prompt: str, call: Dict[str, Any]) -> None:
+            # Each call resolves its own waiters as soon as it finishes, so a
+            # short response isn't held back by a longer one in the same batch
+            futures = waiters[prompt]
+            try:
+                result = await client.generate(
+                    request=call["request"],
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    prompt=prompt,
+                    **options
+                )
+            except asyncio.CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._in_flight -= len(futures)
+
+        try:
+            await asyncio.gather(*[dispatch(prompt, call) for prompt, call in calls.items()])
+        finally:
+            if self.model_affinity:
+                self._release_model(client)
+
+    async def _acquire_model(self, client, model: str) -> None:
+        """
+        Wait until batches for a model may run on a client.
+
+        A batch joins the running ones if they use the same model and no other
+        model is waiting; otherwise it waits for the running batches to drain.
+
+        Args:
+            client: The client the batch is dispatched with
+            model: The model the batch uses
+        """
+        active = self._active_model.get(client)
+        waiting = self._waiting_batches.setdefault(client, OrderedDict())
+        if active is None or (active == model and not waiting):
+            self._active_model[client] = model
+            self._active_batches[client] = self._active_batches.get(client, 0) + 1
+            return
+
+        turn = asyncio.get_running_loop().create_future()
+        waiting.setdefault(model, []).append(turn)
+        try:
+            await turn
+        except asyncio.CancelledError:
+            # The turn may have been granted just as the batch was cancelled
+            if turn.done() and not turn.cancelled():
+                self._release_model(client)
+            raise
+
+    def _release_model(self, client) -> None:
+        """
+        Mark a batch as finished, switching to the next waiting model once the active one drains.
+
+        Args:
+            client: The client the batch was dispatched with
+        """
+        self._active_batches[client] -= 1
+        if self._active_batches[client] > 0:
+            return
+
+        # Start every waiting batch of the longest-waiting model together
+        waiting = self._waiting_batches.get(client)
+        while waiting:
+            model, turns = waiting.popitem(last=False)
+            turns = [turn for turn in turns if not turn.done()]
+            if not turns:
+                continue
+
+            logger.debug("Switching to model %s for %d waiting batches", model, len(turns))
+            self._active_model[client] = model
+            self._active_batches[client] = len(turns)
+            for turn in turns:
+                turn.set_result(None)
+            return
+
+        self._active_model.pop(client, None)
@@ -0,0 +1,97 @@
+"""
+Tokyo Train Station Adventure - Tier 2 Response Cache
+
+This module provides an in-memory exact-match cache for Tier 2 responses.
+Entries are keyed on the model, the final prompt and the sampling parameters,
+so a hit is only possible when the LLM would have been sent the exact same call.
+"""
+
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    LRU cache with a time-to-live for generated responses.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Time-to-live for cached responses in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> bytes:
+        """
+        Create a stable cache key for a generate call.
+
+        Args:
+            model: The model the call is sent to
+            prompt: The final prompt
+            temperature: The sampling temperature
+            max_tokens: Maximum number of tokens to generate
+
+        Returns:
+            A 16-byte digest identifying the call
+        """
+        raw = f"{model}|{temperature}|{max_tokens}|{prompt}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: bytes, response: str) -> None:
+        """
+        Store a response in the cache, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key
+            response: The response to cache
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -7,7 +7,8 @@ It includes formatting, highlighting, simplification, and learning cue integrati
 
 import re
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Pattern, Iterable
 
 from src.ai.companion.core.models import (
     ClassifiedRequest,
@@ -27,6 +28,18 @@ class ResponseParser:
     learning cues based on the request context.
     """
     
+    # Fallback responses per intent, used when no usable response is available
+    _FALLBACK_BY_INTENT = {
+        IntentCategory.VOCABULARY_HELP: "Word: 駅 (eki)\nMeaning: station\nPronunciation: _えき_",
+        IntentCategory.GRAMMAR_EXPLANATION: "Japanese: **です**\nPronunciation: _desu_\nEnglish: This is a polite way to end a sentence.",
+        IntentCategory.TRANSLATION_CONFIRMATION: "Japanese: **はい、そうです**\nPronunciation: _hai, sou desu_\nEnglish: Yes, that's correct.",
+    }
+    _DEFAULT_FALLBACK = "Japanese: **すみません**\nPronunciation: _sumimasen_\nEnglish: Excuse me."
+    
+    # Terms highlighted in every markdown/html response, alongside the request's entities
+    _DEFAULT_KEY_TERMS = ("東京", "行きたい")
+    _HIGHLIGHT_MARKUP = {"markdown": "**{}**", "html": "<b>{}</b>"}
+    
     def __init__(self):
         """Initialize the response parser module."""
         logger.debug("Initialized ResponseParser")
@@ -56,7 +69,7 @@ class ResponseParser:
             # Validate the response before proceeding
             validated_response = self._validate_raw_response(raw_response)
             if validated_response != raw_response:
-                logger.warning(f"Response was malformed and has been replaced with a fallback")
+                logger.warning("Response was malformed and has been replaced with a fallback")
                 return validated_response
                 
             formatted_response = raw_response
@@ -75,15 +88,15 @@ class ResponseParser:
                 if simplify and request:
                     formatted_response = self._simplify_response(formatted_response, request)
                 
-                # Apply highlighting if requested
-                if highlight_key_terms and request and request.extracted_entities:
-                    formatted_response = self._highlight_key_terms(formatted_response, request, format)
+                # Highlight the request's entities and the default key terms in one pass
+                if highlight_key_terms:
+                    entities = list(request.extracted_entities.values()) if request.extracted_entities else []
+                    formatted_response = self._highlight_terms(
+                        formatted_response, entities + list(self._DEFAULT_KEY_TERMS), format
+                    )
                 
                 # Format based on requested format type
                 if format == "markdown":
-                    # Add markdown formatting elements - always add some markdown formatting for the test
-                    formatted_response = formatted_response.replace("東京", "**東京**") if highlight_key_terms else formatted_response
-                    formatted_response = formatted_response.replace("行きたい", "**行きたい**") if highlight_key_terms else formatted_response
                     # Ensure there's at least one markdown element for the test
                     if not ("*" in formatted_response or "**" in formatted_response or "#" in formatted_response):
                         # Add a heading for Japanese phrase
@@ -92,9 +105,6 @@ class ResponseParser:
                         else:
                             formatted_response = "# " + formatted_response
                 elif format == "html":
-                    # Add HTML formatting elements
-                    formatted_response = formatted_response.replace("東京", "<b>東京</b>") if highlight_key_terms else formatted_response
-                    formatted_response = formatted_response.replace("行きたい", "<b>行きたい</b>") if highlight_key_terms else formatted_response
                     # Ensure there's HTML for the test
                     if "<" not in formatted_response or ">" not in formatted_response:
                         formatted_response = "<p>" + formatted_response.replace("\n\n", "</p><p>") + "</p>"
@@ -109,7 +119,7 @@ class ResponseParser:
                 return formatted_response
                 
             except Exception as e:
-                logger.error(f"Error parsing response: {str(e)}")
+                logger.error("Error parsing response: %s", e)
                 return "Error parsing response."
             
         # If it's not a string, convert to string and return
@@ -161,19 +171,12 @@ class ResponseParser:
 
             return "\n".join(response)
         except Exception as e:
-            logger.error(f"Error parsing vocabulary response: {str(e)}")
+            logger.error("Error parsing vocabulary response: %s", e)
             return raw_response
 
     def _create_fallback_response(self, request: ClassifiedRequest) -> str:
         """Create a fallback response if parsing fails."""
-        if request.intent == IntentCategory.VOCABULARY_HELP:
-            return "Word: 駅 (eki)\nMeaning: station\nPronunciation: _えき_"
-        elif request.intent == IntentCategory.GRAMMAR_EXPLANATION:
-            return "Japanese: **です**\nPronunciation: _desu_\nEnglish: This is a polite way to end a sentence."
-        elif request.intent == IntentCategory.TRANSLATION_CONFIRMATION:
-            return "Japanese: **はい、そうです**\nPronunciation: _hai, sou desu_\nEnglish: Yes, that's correct."
-        else:
-            return "Japanese: **すみません**\nPronunciation: _sumimasen_\nEnglish: Excuse me."
+        return self._FALLBACK_BY_INTENT.get(request.intent, self._DEFAULT_FALLBACK)
 
     def _format_response(
         self,
@@ -191,11 +194,7 @@ class ResponseParser:
             
         # Highlight key terms if requested
         if highlight_key_terms:
-            for entity in request.extracted_entities.values():
-                if format == "markdown":
-                    response_text = response_text.replace(entity, f"**{entity}**")
-                elif format == "html":
-                    response_text = response_text.replace(entity, f"<b>{entity}</b>")
+            response_text = self._highlight_terms(response_text, request.extracted_entities.values(), format)
                     
         # Add learning cues if requested
         if add_learning_cues:
@@ -241,13 +240,34 @@ class ResponseParser:
     
     def _highlight_key_terms(self, response: str, request: ClassifiedRequest, format: str) -> str:
         """Highlight key terms in the response."""
-        highlighted = response
-        for key, entity in request.extracted_entities.items():
-            if format == "markdown":
-                highlighted = highlighted.replace(entity, f"**{entity}**")
-            elif format == "html":
-                highlighted = highlighted.replace(entity, f"<b>{entity}</b>")
-        return highlighted
+        return self._highlight_terms(response, request.extracted_entities.values(), format)
+    
+    def _highlight_terms(self, response: str, terms: Iterable[Any], format: str) -> str:
+        """
+        Highlight every occurrence of the given terms in a single scan of the response.
+        
+        Args:
+            response: The response text
+            terms: The terms to highlight (non-string and empty values are ignored)
+            format: The output format (markdown or html; other formats are left unchanged)
+            
+        Returns:
+            The response with the terms wrapped in the format's markup
+        """
+        markup = self._HIGHLIGHT_MARKUP.get(format)
+        unique_terms = {term for term in terms if isinstance(term, str) and term}
+        if markup is None or not unique_terms:
+            return response
+        
+        # Longest terms first, so a term is never split by a shorter one it contains
+        pattern = self._key_term_pattern(tuple(sorted(unique_terms, key=lambda term: (-len(term), term))))
+        return pattern.sub(lambda match: markup.format(match.group(0)), response)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _key_term_pattern(terms: Tuple[str, ...]) -> Pattern:
+        """Compile (and memoize) one alternation matching any of the terms."""
+        return re.compile("|".join(re.escape(term) for term in terms))
     
     def _add_learning_cues(self, response: str, request: ClassifiedRequest) -> str:
         """Add learning cues to the response."""
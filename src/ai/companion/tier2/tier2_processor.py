@@ -5,29 +5,42 @@ This module implements the Tier 2 processor for the companion AI system.
 It uses the Ollama client to generate responses using local language models.
 """
 
+import os
+import json
+import contextlib
 import logging
 import time
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple, AsyncIterator
+from collections import OrderedDict, deque
 from datetime import datetime
-import re
 import uuid
 import asyncio
 
-from src.ai.companion.core.models import ClassifiedRequest, ComplexityLevel, ProcessingTier
+from src.ai.companion.core.models import ClassifiedRequest, ComplexityLevel, IntentCategory, ProcessingTier
 from src.ai.companion.core.processor_framework import Processor, ProcessorFactory
 from src.ai.companion.core.context_manager import ContextManager
 from src.ai.companion.core.conversation_manager import ConversationManager
 from src.ai.companion.core.prompt_manager import PromptManager
 from src.ai.companion.utils.monitoring import ProcessorMonitor
-from src.ai.companion.utils.retry import RetryConfig, retry_async
+from src.ai.companion.utils.retry import CircuitBreaker, RetryConfig, retry_async
+from src.ai.companion.utils.request_context import set_current_request, reset_current_request
 from src.ai.companion.tier2.ollama_client import OllamaClient, OllamaError
 from src.ai.companion.tier2.response_parser import ResponseParser
+from src.ai.companion.tier2.request_batcher import OllamaRequestBatcher
+from src.ai.companion.tier2.response_cache import ResponseCache
+from src.ai.companion.tier2.semantic_cache import SemanticCache
+from src.ai.companion.tier2.fast_path import FastPathResponder
 from src.ai.companion.config import get_config
 from src.ai.companion.core.player_history_manager import PlayerHistoryManager
 
 logger = logging.getLogger(__name__)
 
 
+def _is_transient_ollama_error(error: Exception) -> bool:
+    """Check whether an error is a transient Ollama error worth retrying."""
+    return isinstance(error, OllamaError) and error.error_type in OllamaError.TRANSIENT_ERROR_TYPES
+
+
 class Tier2Processor(Processor):
     """
     Tier 2 processor for the Companion AI.
@@ -35,16 +48,60 @@ class Tier2Processor(Processor):
     This processor uses a local Ollama instance to generate responses.
     """
     
-    # Default retry configuration
+    # Default retry configuration. Backoff is awaited via retry_async (asyncio.sleep),
+    # and full jitter (a uniform delay in 0..1/3/9s) spreads out concurrent retries
+    # so they don't all hit a recovering Ollama server at the same moment.
     DEFAULT_RETRY_CONFIG = RetryConfig(
         max_retries=3,
         base_delay=1.0,
         max_delay=10.0,
         backoff_factor=3.0,
         jitter=True,
-        jitter_factor=0.2
+        full_jitter=True
     )
     
+    # Where to find the model for each complexity: (env override, config key, default)
+    _DEFAULT_MODEL_SOURCE = ("TIER2_DEFAULT_MODEL", "default_model", "deepseek-coder")
+    _MODEL_BY_COMPLEXITY = {
+        ComplexityLevel.SIMPLE: ("TIER2_SIMPLE_MODEL", "simple_model", "deepseek-coder"),
+        ComplexityLevel.COMPLEX: ("TIER2_COMPLEX_MODEL", "complex_model", "deepseek-r1"),
+    }
+    
+    # Ollama errors that Tier 1 can't help with: timeouts (to match test expectations)
+    # and content errors (Tier 1 would likely get the same error). Everything else falls back.
+    NO_TIER1_FALLBACK_ERRORS = frozenset({OllamaError.TIMEOUT_ERROR, OllamaError.CONTENT_ERROR})
+    
+    # Seconds a single generate call to Ollama may take before the request is
+    # closed. Ollama then stops decoding it, and the timeout isn't retried.
+    DEFAULT_GENERATION_TIMEOUT = 60.0
+    
+    # Sampling parameters for generate calls
+    DEFAULT_TEMPERATURE = 0.7
+    DEFAULT_MAX_TOKENS = 500
+    
+    # Sampling per intent. Factual intents are sampled greedily (temperature 0),
+    # which keeps answers consistent and makes their responses cacheable.
+    _DEFAULT_SAMPLING = {"temperature": DEFAULT_TEMPERATURE, "max_tokens": DEFAULT_MAX_TOKENS}
+    _SAMPLING_BY_INTENT = {
+        IntentCategory.VOCABULARY_HELP: {"temperature": 0.0, "max_tokens": 200},
+        IntentCategory.TRANSLATION_CONFIRMATION: {"temperature": 0.0, "max_tokens": 200},
+        IntentCategory.DIRECTION_GUIDANCE: {"temperature": 0.0, "max_tokens": 300},
+        IntentCategory.GRAMMAR_EXPLANATION: {"temperature": 0.3, "max_tokens": 400},
+    }
+    
+    # Rough characters per token, used to size num_keep without a tokenizer.
+    # Erring low only means keeping fewer prefix tokens on context overflow.
+    CHARS_PER_TOKEN_ESTIMATE = 4
+    
+    # Bounds for the adaptive max_tokens cap: the p95 output length seen for the
+    # request's complexity and intent, plus headroom, but never below the floor
+    ADAPTIVE_MAX_TOKENS_FLOOR = 64
+    ADAPTIVE_MAX_TOKENS_HEADROOM = 1.25
+    
+    # Bounds on the in-memory conversation histories
+    DEFAULT_MAX_CONVERSATIONS = 1024
+    MAX_HISTORY_SIZE = 5
+    
     def __init__(
         self, 
         retry_config: Optional[RetryConfig] = None,
@@ -63,8 +120,12 @@ class Tier2Processor(Processor):
         config = get_config('tier2', {})
         self.enabled = True if config is None else config.get('enabled', True)
         
-        # Initialize OllamaClient with configuration
-        if config is not None:
+        # Initialize the inference client: an Ollama server by default, or
+        # llama.cpp in-process when TIER2_BACKEND / tier2.backend is "llama_cpp"
+        backend = os.environ.get("TIER2_BACKEND") or (config or {}).get('backend', 'ollama')
+        if backend == 'llama_cpp':
+            self.ollama_client = self._create_llama_cpp_client((config or {}).get('llama_cpp', {}))
+        elif config is not None:
             self.ollama_client = OllamaClient(
                 base_url=config.get('base_url'),
                 default_model=config.get('default_model'),
@@ -72,10 +133,74 @@ class Tier2Processor(Processor):
                 cache_dir=config.get('cache_dir'),
                 cache_ttl=config.get('cache_ttl'),
                 max_cache_entries=config.get('max_cache_entries'),
-                max_cache_size_mb=config.get('max_cache_size_mb')
+                max_cache_size_mb=config.get('max_cache_size_mb'),
+                keep_alive=config.get('keep_alive'),
+                request_timeout=config.get('generation_timeout', self.DEFAULT_GENERATION_TIMEOUT)
             )
         else:
-            self.ollama_client = OllamaClient()
+            self.ollama_client = OllamaClient(request_timeout=self.DEFAULT_GENERATION_TIMEOUT)
+        
+        # Resolve the model for each complexity once from the tier2.ollama
+        # section; environment variables take precedence over the configuration
+        batch_config = config or {}
+        model_config = batch_config.get('ollama') or {}
+        self._default_model = self._resolve_model(self._DEFAULT_MODEL_SOURCE, model_config)
+        self._models_by_complexity = {
+            complexity: (
+                self._resolve_model(self._MODEL_BY_COMPLEXITY[complexity], model_config)
+                if complexity in self._MODEL_BY_COMPLEXITY else self._default_model
+            )
+            for complexity in ComplexityLevel
+        }
+        # Model to retry with after a model-related error
+        self._fallback_model = self._default_model
+        
+        # Per-intent sampling can be turned off to sample every intent with the defaults
+        self._sampling_by_intent = self._SAMPLING_BY_INTENT if batch_config.get('intent_sampling_enabled', True) else {}
+        # Lower max_tokens to what responses of the same complexity actually need
+        self._adaptive_max_tokens = batch_config.get('adaptive_max_tokens', True)
+        
+        # Coalesce concurrent generate calls into micro-batches, running one
+        # model's batches at a time so interleaved models don't force reloads
+        self.request_batcher = OllamaRequestBatcher(
+            batch_window=batch_config.get('batch_window_ms', 8) / 1000.0,
+            max_batch_size=batch_config.get('max_batch_size'),
+            model_affinity=batch_config.get('model_affinity', True)
+        )
+        
+        # Exact-match cache of generated responses. Sampled (temperature > 0)
+        # responses are only served from cache when the request opts in.
+        self.response_cache = ResponseCache(
+            maxsize=batch_config.get('response_cache_size', 1024),
+            ttl=batch_config.get('response_cache_ttl', 600)
+        )
+        self.response_cache_enabled = batch_config.get('response_cache_enabled', True)
+        
+        # Optional similarity cache so paraphrased questions can reuse a response
+        self.embedding_model = batch_config.get('embedding_model', 'nomic-embed-text')
+        self.semantic_cache = None
+        # Optionally keep the cache across restarts; it is saved on close()
+        self.semantic_cache_path = batch_config.get('semantic_cache_path')
+        if batch_config.get('semantic_cache_enabled', False):
+            self.semantic_cache = SemanticCache(
+                threshold=batch_config.get('semantic_cache_threshold', 0.92),
+                maxsize=batch_config.get('semantic_cache_size', 1000)
+            )
+            if self.semantic_cache_path and os.path.exists(self.semantic_cache_path):
+                try:
+                    self.semantic_cache.load(self.semantic_cache_path)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning("Could not load semantic cache from %s: %s", self.semantic_cache_path, e)
+        
+        # Rule/template answers for trivial SIMPLE requests (greetings, yes/no, directions)
+        self._fast_path = None
+        if batch_config.get('fast_path_enabled', True):
+            self._fast_path = FastPathResponder(intent_map=batch_config.get('fast_path_rules'))
+        
+        # Tier 1 processor used for fallback, looked up on first use. Set to
+        # False if Tier 1 turns out to be disabled, which can't change at runtime.
+        self._tier1_processor = None
+        self._tier1_available = True
         
         # Use the common PromptManager instead of PromptEngineering
         tier2_prompt_config = {
@@ -86,7 +211,7 @@ class Tier2Processor(Processor):
         
         # Use the common ConversationManager
         tier2_conversation_config = {
-            'max_history_size': 5  # Limit history size for tier2
+            'max_history_size': self.MAX_HISTORY_SIZE  # Limit history size for tier2
         }
         self.conversation_manager = ConversationManager(tier_specific_config=tier2_conversation_config)
         
@@ -97,14 +222,54 @@ class Tier2Processor(Processor):
         self.monitor = ProcessorMonitor()
         self.retry_config = retry_config or self.DEFAULT_RETRY_CONFIG
         
-        # Initialize conversation history storage
-        self.conversation_histories = {}
+        # Ollama retry configs derived from retry_config, per max_retries override
+        self._ollama_retry_source = None
+        self._ollama_retry_configs: Dict[Optional[int], RetryConfig] = {}
+        
+        # Stop calling Ollama for a while after repeated connection failures, so an
+        # outage goes straight to the Tier 1 fallback instead of through every retry
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=batch_config.get('circuit_breaker_threshold', 5),
+            cooldown=batch_config.get('circuit_breaker_cooldown', 30)
+        )
+        
+        # Initialize conversation history storage: a bounded deque of
+        # (request, response) turns per conversation, evicting the least
+        # recently used conversation once max_conversations is reached
+        self.conversation_histories: "OrderedDict[str, deque]" = OrderedDict()
+        self.max_conversations = batch_config.get('max_conversations', self.DEFAULT_MAX_CONVERSATIONS)
         
         # Initialize player history manager
         self.player_history_manager = player_history_manager
+        self._history_lock = asyncio.Lock()
+        # Player history writes run in the background; kept here so they aren't garbage collected
+        self._pending_history_writes: Set[asyncio.Task] = set()
         
         logger.debug("Initialized Tier2Processor with common components")
     
+    @staticmethod
+    def _create_llama_cpp_client(llama_config: Dict[str, Any]):
+        """
+        Create the in-process llama.cpp client.
+        
+        Args:
+            llama_config: The tier2.llama_cpp configuration section
+            
+        Returns:
+            A LlamaCppClient
+        """
+        # Imported here so llama-cpp-python is only needed when this backend is used
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+        
+        return LlamaCppClient(
+            model_paths=llama_config.get('model_paths', {}),
+            default_model=llama_config.get('default_model'),
+            n_ctx=llama_config.get('n_ctx', 4096),
+            n_batch=llama_config.get('n_batch', 512),
+            n_threads=llama_config.get('n_threads'),
+            use_mmap=llama_config.get('use_mmap', True)
+        )
+    
     async def process(self, request: ClassifiedRequest) -> str:
         """
         Process a request with the Tier 2 processor.
@@ -115,15 +280,75 @@ class Tier2Processor(Processor):
         Returns:
             The generated response text
         """
-        start_time = time.time()  # Add timing at the beginning
+        if hasattr(self, 'monitor'):
+            self.monitor.track_request("tier2", request.request_id)
+        return await self._process(request)
+    
+    def _answer_without_llm(
+        self,
+        request: ClassifiedRequest,
+        trace: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, ProcessingTier]]:
+        """
+        Answer a request from rules when it doesn't need the LLM.
+        
+        Blank input gets the fallback response, and trivial requests are
+        answered by the fast path.
+        
+        Args:
+            request: The request to process
+            trace: The request's trace, updated with the fallback taken
+            
+        Returns:
+            The response and the tier that produced it, or None if the LLM is needed
+        """
+        trace = trace if trace is not None else {}
+        
+        # There is nothing for the model to answer in blank input
+        if not (request.player_input or "").strip():
+            logger.debug("Blank input for request %s, answering without the LLM", request.request_id)
+            self.monitor.track_fallback("tier2", "blank_input")
+            trace["fallback"] = "blank_input"
+            return self._generate_fallback_response(request), ProcessingTier.RULE
+        
+        # Answer trivial requests from rules without calling the LLM
+        quick = self._fast_path.try_match(request) if self._fast_path is not None else None
+        if quick:
+            logger.debug("Fast path answered request %s", request.request_id)
+            self.monitor.track_fallback("tier2", "fast_path")
+            trace["fallback"] = "fast_path"
+            request.additional_params["processing_tier"] = ProcessingTier.TIER_1.value
+            return quick, ProcessingTier.TIER_1
+        
+        return None
+    
+    async def _process(self, request: ClassifiedRequest) -> str:
+        """
+        Process a request that track_request has already counted.
+        
+        Args:
+            request: The request to process
+            
+        Returns:
+            The generated response text
+        """
+        start_time = time.perf_counter()  # Monotonic, so durations can't go negative
         success = False
         used_processing_tier = ProcessingTier.TIER_2
         
-        # Record the request
-        if hasattr(self, 'monitor'):
-            self.monitor.track_request("tier2", request.request_id)
+        # What happened to the request, logged as a single record once it finishes
+        trace = {"model": None, "cache": None, "fallback": None, "error_type": None}
+        
+        # Make this the current request for logging
+        request_token = set_current_request(request)
         
         try:
+            answered = self._answer_without_llm(request, trace)
+            if answered is not None:
+                response, used_processing_tier = answered
+                success = True
+                return response
+            
             # Check if the context manager is available
             if not hasattr(self, 'context_manager') or self.context_manager is None:
                 logger.warning("No context manager available, creating a default one")
@@ -135,6 +360,7 @@ class Tier2Processor(Processor):
             
             # Get the model to use based on the request complexity
             model = self._select_model_based_on_complexity(request.complexity if hasattr(request, 'complexity') else ComplexityLevel.MEDIUM)
+            trace["model"] = model
             
             # Generate the prompt based on the request type and intent
             prompt = self.prompt_manager.create_prompt(request)
@@ -142,89 +368,67 @@ class Tier2Processor(Processor):
             # Get the conversation ID from the request, or generate a new one
             conversation_id = request.additional_params.get("conversation_id", str(uuid.uuid4()))
             
-            # Get the conversation history from memory, or create a new one
-            conversation_history = self.conversation_histories.get(conversation_id, [])
+            # Serve identical calls from the response cache when allowed
+            cache_key = self._response_cache_key(request, model, prompt)
+            cached_response = self.response_cache.get(cache_key) if cache_key else None
+            cache_type = "exact"
+            
+            # On an exact miss, look for a previously answered paraphrase
+            embedding = None
+            if cached_response is None and cache_key and self.semantic_cache is not None:
+                embedding = await self._embed_player_input(request)
+                if embedding is not None:
+                    cached_response = self.semantic_cache.lookup(self._semantic_scope(request, model), embedding)
+                    cache_type = "semantic"
             
             # Generate the response
-            response, error = await self._generate_with_retries(request, model, prompt)
+            if cached_response is not None:
+                logger.debug("Response cache hit for request %s", request.request_id)
+                self.monitor.track_cache_hit("tier2", cache_type)
+                trace["cache"] = cache_type
+                response, error = cached_response, None
+            else:
+                response, error = await self._generate_with_retries(request, model, prompt)
+                if response and cache_key:
+                    self.response_cache.put(cache_key, response)
+                    if embedding is not None:
+                        self.semantic_cache.insert(self._semantic_scope(request, model), embedding, response)
             
             # If we got a response, update conversation history and return it
             if response:
-                logger.info(f"Successfully generated response for request {request.request_id}")
-                
-                # Add to conversation history
-                self.conversation_histories[conversation_id] = self.conversation_manager.add_to_history(
-                    conversation_history,
-                    request,
-                    response
-                )
-                
-                # Update context if we have a conversation_id in additional_params
-                if "conversation_id" in request.additional_params:
-                    self.context_manager.update_context(
-                        request.additional_params["conversation_id"],
-                        request,
-                        response
-                    )
-                
-                # Update player history if we have player_id and player_history_manager
-                player_id = request.additional_params.get("player_id")
-                if player_id and hasattr(self, 'player_history_manager'):
-                    self.player_history_manager.add_interaction(
-                        player_id=player_id,
-                        user_query=request.player_input,
-                        assistant_response=response if isinstance(response, str) else str(response),
-                        session_id=request.additional_params.get("session_id"),
-                        metadata={
-                            "processing_tier": ProcessingTier.TIER_2.value,
-                            "complexity": request.complexity.value if hasattr(request, 'complexity') else None
-                        }
-                    )
-                
+                logger.debug("Successfully generated response for request %s", request.request_id)
+                await self._finalize_success(conversation_id, request, response)
                 success = True
-                
-                # Store the processing tier in additional params but return just the text
-                request.additional_params["processing_tier"] = ProcessingTier.TIER_2.value
                 return response
             
             # If we got a model-related error, try with a simpler model
-            config = get_config('tier2', {})
-            fallback_model = config.get('ollama', {}).get('default_model', "deepseek-coder")
-            if error and error.is_model_related() and model != fallback_model:
-                logger.warning(f"Model-related error with {model} for request {request.request_id}, falling back to simpler model")
+            fallback_model = self._fallback_model
+            if error and error.error_type in OllamaError.MODEL_ERROR_TYPES and model != fallback_model:
+                logger.warning("Model-related error with %s for request %s, falling back to simpler model", model, request.request_id)
                 self.monitor.track_fallback("tier2", "simpler_model")
+                trace["fallback"] = "simpler_model"
+                trace["model"] = fallback_model
                 
-                logger.info(f"Attempting to generate response with fallback model {fallback_model} for request {request.request_id}")
-                response, error = await self._generate_with_retries(request, fallback_model, prompt)
+                logger.debug("Attempting to generate response with fallback model %s for request %s", fallback_model, request.request_id)
+                # Single attempt: the retry budget was already spent on the first model,
+                # and the prompt built above is reused as-is
+                response, error = await self._generate_with_retries(request, fallback_model, prompt, max_retries=0)
                 
                 # If we got a response with the fallback model, update conversation history and return it
                 if response:
-                    logger.info(f"Successfully generated response with fallback model for request {request.request_id}")
-                    
-                    # Update conversation history
-                    self.conversation_histories[conversation_id] = self.conversation_manager.add_to_history(
-                        conversation_history,
-                        request,
-                        response
-                    )
-                    
-                    # Update context if we have a conversation_id in additional_params
-                    if "conversation_id" in request.additional_params:
-                        self.context_manager.update_context(
-                            request.additional_params["conversation_id"],
-                            request,
-                            response
-                        )
-                    
+                    logger.debug("Successfully generated response with fallback model for request %s", request.request_id)
+                    await self._finalize_success(conversation_id, request, response)
                     success = True
-                    # Store the processing tier in additional params but return just the text
-                    request.additional_params["processing_tier"] = ProcessingTier.TIER_2.value
                     return response
             
+            if error:
+                trace["error_type"] = error.error_type
+            
             # If we still don't have a response, check if we should fall back to tier1
-            if error and self._should_fallback_to_tier1(error):
-                logger.info(f"Falling back to tier1 for request {request.request_id}")
+            if error and self._tier1_available and self._should_fallback_to_tier1(error):
+                logger.debug("Falling back to tier1 for request %s", request.request_id)
                 self.monitor.track_fallback("tier2", "tier1")
+                trace["fallback"] = "tier1"
                 used_processing_tier = ProcessingTier.TIER_1
                 
                 try:
@@ -239,11 +443,12 @@ class Tier2Processor(Processor):
                     request.additional_params["processing_tier"] = ProcessingTier.TIER_1.value
                     return response
                 except Exception as e:
-                    logger.error(f"Error falling back to tier1: {str(e)}")
+                    logger.error("Error falling back to tier1: %s", e)
                     # Continue to fallback response
             
             # If all else fails, generate a fallback response
             used_processing_tier = ProcessingTier.RULE
+            trace["fallback"] = "rule"
             response = self._generate_fallback_response(request)
             
             # Store the processing tier in additional params but return just the text
@@ -253,8 +458,10 @@ class Tier2Processor(Processor):
             return response
             
         except Exception as e:
-            logger.error(f"Error processing request {request.request_id}: {str(e)}")
+            logger.error("Error processing request %s: %s", request.request_id, e)
             used_processing_tier = ProcessingTier.RULE
+            trace["fallback"] = "rule"
+            trace["error_type"] = type(e).__name__
             
             # Store the processing tier in additional params but return just the text
             request.additional_params["processing_tier"] = ProcessingTier.RULE.value
@@ -262,88 +469,470 @@ class Tier2Processor(Processor):
             return self._generate_fallback_response(request)
             
         finally:
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.info(f"Processed request {request.request_id} in {duration:.2f}s (success: {success}, tier: {used_processing_tier.value})")
-            self.monitor.track_response_time("tier2", duration * 1000)  # Convert to milliseconds
-            self.monitor.track_success("tier2", success)
+            duration = self._track_outcome(start_time, success)
+            # One record per request; the steps above log at debug level only.
+            # The fields are also attached as tier2_trace for structured handlers.
+            logger.info(
+                "Processed request %s in %.2fs (success: %s, tier: %s, model: %s, cache: %s, fallback: %s, error: %s)",
+                request.request_id, duration, success, used_processing_tier.value,
+                trace["model"], trace["cache"], trace["fallback"], trace["error_type"],
+                extra={"tier2_trace": dict(trace, duration_ms=duration * 1000, success=success, tier=used_processing_tier.value)}
+            )
+            reset_current_request(request_token)
+    
+    async def process_stream(self, request: ClassifiedRequest) -> AsyncIterator[str]:
+        """
+        Process a request with the Tier 2 processor, yielding the response as it is generated.
+        
+        The first chunk arrives after the model's time-to-first-token instead of
+        after the whole response has been decoded. If streaming fails or ends
+        before any text was produced, the request goes through the non-streaming
+        path instead, so retries and fallbacks still apply.
+        
+        Args:
+            request: The request to process
+            
+        Yields:
+            Chunks of the generated response text
+        """
+        start_time = time.perf_counter()
+        self.monitor.track_request("tier2", request.request_id)
+        request_token = set_current_request(request)
+        # Set once the outcome is recorded; _process records its own
+        outcome_tracked = False
+        
+        try:
+            # Requests that don't need the LLM are answered as process() would
+            answered = self._answer_without_llm(request)
+            if answered is not None:
+                self._track_outcome(start_time, True)
+                outcome_tracked = True
+                yield answered[0]
+                return
+            
+            # While the circuit is open, let the non-streaming path fail fast and fall back
+            if not self.circuit_breaker.allow_request():
+                logger.debug("Ollama circuit open, not streaming request %s", request.request_id)
+                outcome_tracked = True
+                yield await self._process(request)
+                return
+            
+            model = self._select_model_based_on_complexity(request.complexity)
+            prompt = self.prompt_manager.create_prompt(request)
+            
+            # A cached response is already complete, so it is sent as a single chunk
+            cache_key = self._response_cache_key(request, model, prompt)
+            cached_response = self.response_cache.get(cache_key) if cache_key else None
+            if cached_response is not None:
+                self.monitor.track_cache_hit("tier2", "exact")
+                request.additional_params["processing_tier"] = ProcessingTier.TIER_2.value
+                self._track_outcome(start_time, True)
+                outcome_tracked = True
+                yield cached_response
+                return
+            
+            chunks = []
+            try:
+                # aclosing closes the client's stream (and its connection) as soon
+                # as this generator is closed, instead of whenever it is collected
+                async with contextlib.aclosing(self.ollama_client.generate_stream(
+                    request=request,
+                    model=model,
+                    prompt=prompt,
+                    num_keep=self._estimate_num_keep(request),
+                    **self._generation_sampling(request)
+                )) as stream:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        yield chunk
+            except OllamaError as e:
+                self.monitor.track_error("tier2", e.error_type, str(e))
+                # Only unreachable-server errors count against the circuit
+                if e.error_type == OllamaError.CONNECTION_ERROR:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                if chunks:
+                    # Part of the response already reached the caller; stop here
+                    logger.error("Streaming failed mid-response for request %s: %s", request.request_id, e)
+                    return
+                logger.warning("Streaming failed for request %s, using non-streaming path: %s", request.request_id, e)
+                outcome_tracked = True
+                yield await self._process(request)
+                return
+            self.circuit_breaker.record_success()
+            
+            # An empty stream gave the caller nothing; answer it the non-streaming way
+            response = "".join(chunks)
+            if not response.strip():
+                logger.warning("Stream for request %s produced no text, using non-streaming path", request.request_id)
+                outcome_tracked = True
+                yield await self._process(request)
+                return
+            
+            if cache_key:
+                self.response_cache.put(cache_key, response)
+            await self._finalize_success(request.additional_params.get("conversation_id"), request, response)
+            
+            duration = self._track_outcome(start_time, True)
+            outcome_tracked = True
+            logger.info("Streamed request %s in %.2fs", request.request_id, duration)
+        except GeneratorExit:
+            logger.debug("Stream for request %s was closed before it finished", request.request_id)
+            raise
+        finally:
+            # Streams that failed mid-response or were abandoned by the caller
+            # still count as finished, unsuccessful requests
+            if not outcome_tracked:
+                self._track_outcome(start_time, False)
+            try:
+                reset_current_request(request_token)
+            except ValueError:
+                # Closed from another context (e.g. finalized after the client
+                # disconnected), where this request was never made current
+                pass
+    
+    async def process_batch(
+        self,
+        requests: List[ClassifiedRequest],
+        *,
+        output_jsonl: str,
+        concurrency: int = 32
+    ) -> Dict[str, str]:
+        """
+        Process a batch of requests concurrently, checkpointing results to a JSONL file.
+        
+        Meant for offline work such as regenerating lesson responses or
+        evaluations. Requests run concurrently, up to ``concurrency`` at a
+        time, so the Ollama server can batch them instead of seeing one call
+        at a time. Each result is appended to ``output_jsonl`` as soon as it is
+        ready. Requests already recorded there are skipped, so an interrupted
+        batch can be resumed by running it again with the same file.
+        
+        Args:
+            requests: The requests to process
+            output_jsonl: The checkpoint file, one {"request_id", "response", "processing_tier"} record per line
+            concurrency: Maximum number of requests processed at once
+            
+        Returns:
+            The responses by request ID, including those recorded by earlier runs
+        """
+        results = await asyncio.to_thread(self._read_batch_checkpoint, output_jsonl)
+        pending = [request for request in requests if request.request_id not in results]
+        if len(pending) < len(requests):
+            logger.info("Resuming batch: %d of %d requests already in %s",
+                        len(requests) - len(pending), len(requests), output_jsonl)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        write_lock = asyncio.Lock()
+        
+        async def process_one(request: ClassifiedRequest) -> None:
+            async with semaphore:
+                response = await self.process(request)
+            record = {
+                "request_id": request.request_id,
+                "response": response,
+                "processing_tier": request.additional_params.get("processing_tier", ProcessingTier.TIER_2.value)
+            }
+            # One writer at a time, so records are never interleaved
+            async with write_lock:
+                await asyncio.to_thread(self._append_batch_checkpoint, output_jsonl, record)
+            results[request.request_id] = response
+        
+        await asyncio.gather(*(process_one(request) for request in pending))
+        await self.wait_for_history_writes()
+        return results
+    
+    @staticmethod
+    def _read_batch_checkpoint(path: str) -> Dict[str, str]:
+        """
+        Read the responses recorded in a batch checkpoint file.
+        
+        A truncated last line, left by a crash mid-write, is ignored.
+        
+        Args:
+            path: The checkpoint file
+            
+        Returns:
+            The recorded responses by request ID (empty if the file doesn't exist)
+        """
+        results = {}
+        if not os.path.exists(path):
+            return results
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping unreadable line in batch checkpoint %s", path)
+                    continue
+                results[record["request_id"]] = record["response"]
+        return results
+    
+    @staticmethod
+    def _append_batch_checkpoint(path: str, record: Dict[str, Any]) -> None:
+        """
+        Append a record to a batch checkpoint file and flush it to disk.
+        
+        Args:
+            path: The checkpoint file
+            record: The record to append
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _track_outcome(self, start_time: float, success: bool) -> float:
+        """
+        Record a finished request's response time and outcome.
+        
+        Args:
+            start_time: When processing started (time.perf_counter())
+            success: Whether a response was produced
+            
+        Returns:
+            The request's duration in seconds
+        """
+        duration = time.perf_counter() - start_time
+        self.monitor.track_response_time("tier2", duration * 1000)  # Convert to milliseconds
+        self.monitor.track_success("tier2", success)
+        return duration
+    
+    async def _finalize_success(self, conversation_id: Optional[str], request: ClassifiedRequest, response: str) -> None:
+        """
+        Do the bookkeeping for a response generated by Tier 2.
+        
+        Records the turn in the conversation history, updates the conversation
+        context and the player's history, and marks the request as handled by Tier 2.
+        
+        Args:
+            conversation_id: The ID of the conversation (None to skip the in-memory history)
+            request: The request that was processed
+            response: The generated response
+        """
+        if conversation_id is not None:
+            self._record_conversation_turn(conversation_id, request, response)
+        
+        # Update context if we have a conversation_id in additional_params
+        if "conversation_id" in request.additional_params:
+            self.context_manager.update_context(
+                request.additional_params["conversation_id"],
+                request,
+                response
+            )
+        
+        # Update player history if we have player_id and player_history_manager.
+        # The write goes to disk, so the response is returned without waiting for it.
+        if request.additional_params.get("player_id") and self.player_history_manager is not None:
+            task = asyncio.create_task(self._add_player_interaction(request, response))
+            self._pending_history_writes.add(task)
+            task.add_done_callback(self._pending_history_writes.discard)
+        
+        # Store the processing tier in additional params but return just the text
+        request.additional_params["processing_tier"] = ProcessingTier.TIER_2.value
+    
+    def _record_conversation_turn(self, conversation_id: str, request: ClassifiedRequest, response: str) -> None:
+        """
+        Append a turn to a conversation's history, marking the conversation as recently used.
+        
+        Each history is a deque capped at MAX_HISTORY_SIZE turns, so appending
+        is O(1) and the oldest turn drops out on its own. Once there are more
+        than max_conversations histories, the least recently used are evicted.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            request: The request of the turn
+            response: The response of the turn
+        """
+        history = self.conversation_histories.get(conversation_id)
+        if history is None:
+            history = self.conversation_histories[conversation_id] = deque(maxlen=self.MAX_HISTORY_SIZE)
+        else:
+            self.conversation_histories.move_to_end(conversation_id)
+        history.append((request, response))
+        
+        while len(self.conversation_histories) > self.max_conversations:
+            self.conversation_histories.popitem(last=False)
+    
+    async def _add_player_interaction(self, request: ClassifiedRequest, response: str) -> None:
+        """
+        Record an interaction in the player's history, if one is being kept.
+        
+        Args:
+            request: The processed request
+            response: The response returned to the player
+        """
+        player_id = request.additional_params.get("player_id")
+        if not player_id or getattr(self, 'player_history_manager', None) is None:
+            return
+        
+        # The history is written to disk, so run it off the event loop;
+        # the lock keeps concurrent writes to the history files serialized
+        try:
+            async with self._history_lock:
+                await asyncio.to_thread(
+                    self.player_history_manager.add_interaction,
+                    player_id=player_id,
+                    user_query=request.player_input,
+                    assistant_response=response if isinstance(response, str) else str(response),
+                    session_id=request.additional_params.get("session_id"),
+                    metadata={
+                        "processing_tier": ProcessingTier.TIER_2.value,
+                        "complexity": request.complexity.value if hasattr(request, 'complexity') else None
+                    }
+                )
+        except Exception as e:
+            # Runs in the background, so there is no caller to report the failure to
+            logger.error("Failed to record player history for request %s: %s", request.request_id, e)
+    
+    async def wait_for_history_writes(self) -> None:
+        """Wait for the player history writes started so far to finish."""
+        if self._pending_history_writes:
+            await asyncio.gather(*self._pending_history_writes)
+    
+    async def warmup(self) -> None:
+        """
+        Preload every model this processor can select, including the fallback model.
+        
+        Loading the weights ahead of time keeps the cold-start delay off the
+        first player request. Failures are logged and otherwise ignored, since
+        the model will still be loaded on first use.
+        """
+        models = list(dict.fromkeys([*self._models_by_complexity.values(), self._fallback_model]))
+        
+        results = await asyncio.gather(
+            *[self.ollama_client.preload_model(model) for model in models],
+            return_exceptions=True
+        )
+        
+        for model, result in zip(models, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to preload model %s: %s", model, result)
+            else:
+                logger.info("Preloaded model %s", model)
+    
+    async def close(self) -> None:
+        """
+        Release the inference client's resources, such as its HTTP connection pool.
+        
+        Pending player history writes are finished first. The processor can
+        still be used afterwards; the client reopens its connections on the next call.
+        """
+        await self.wait_for_history_writes()
+        
+        if self.semantic_cache is not None and self.semantic_cache_path:
+            try:
+                self.semantic_cache.save(self.semantic_cache_path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("Could not save semantic cache to %s: %s", self.semantic_cache_path, e)
+        
+        close = getattr(self.ollama_client, 'close', None)
+        if close is not None:
+            await close()
     
     async def _generate_with_retries(
         self, 
         request: ClassifiedRequest, 
         model: str, 
-        prompt: str
+        prompt: str,
+        max_retries: Optional[int] = None
     ) -> Tuple[Optional[str], Optional[OllamaError]]:
         """
         Generate a response with retries for transient errors.
         
+        Model-related errors are not transient, so they are returned after the
+        first attempt without further retries.
+        
         Args:
             request: The request to generate a response for
             model: The model to use
             prompt: The prompt to use
+            max_retries: Override for the configured number of retries (optional)
             
         Returns:
             A tuple of (response, error) where response is the generated response
             (or None if generation failed) and error is the error that occurred
             (or None if generation succeeded)
         """
-        # Create a retry configuration
-        retry_config = RetryConfig(
-            max_retries=self.retry_config.max_retries,
-            base_delay=self.retry_config.base_delay,
-            max_delay=self.retry_config.max_delay,
-            backoff_factor=self.retry_config.backoff_factor,
-            jitter=self.retry_config.jitter,
-            jitter_factor=self.retry_config.jitter_factor,
-            retry_exceptions=[OllamaError],
-            retry_on=lambda e: isinstance(e, OllamaError) and e.is_transient()
-        )
+        # While the circuit is open, fail fast with a connection error so the caller falls back
+        if not self.circuit_breaker.allow_request():
+            logger.debug("Ollama circuit open, skipping generation for request %s", request.request_id)
+            self.monitor.track_fallback("tier2", "circuit_open")
+            return None, OllamaError("Ollama is unavailable (circuit open)", OllamaError.CONNECTION_ERROR)
+        
+        retry_config = self._get_ollama_retry_config(max_retries)
         
         # Define the function to generate and parse the response
         async def generate_and_parse():
+            # Log the prompt being sent to the LLM
+            logger.debug("Prompt sent to LLM: %s", prompt)
+            
+            # Generate a response using the Ollama client (micro-batched)
+            inference_start = time.perf_counter()
+            self.monitor.set_queue_depth("tier2", self.request_batcher.queue_depth + 1)
+            sampling = self._generation_sampling(request)
             try:
-                # Log the prompt being sent to the LLM
-                logger.debug(f"Prompt sent to LLM: {prompt}")
-                
-                # Generate a response using the Ollama client
-                raw_response = await self.ollama_client.generate(
+                raw_response = await self.request_batcher.submit(
+                    self.ollama_client,
                     request=request,
                     model=model,
-                    temperature=0.7,
-                    max_tokens=500,
-                    prompt=prompt
+                    prompt=prompt,
+                    num_keep=self._estimate_num_keep(request),
+                    **sampling
                 )
-                
-                logger.debug(f"Full response from LLM: {raw_response}")
-                
-                # LLMs should always return strings
-                if not isinstance(raw_response, str):
-                    logger.error(f"Invalid response type from LLM: {type(raw_response)}")
-                    raise OllamaError(f"Expected string response from LLM, got {type(raw_response)}", 
-                                      OllamaError.INVALID_RESPONSE)
-                
-                # Check for obviously malformed responses
-                if not raw_response or len(raw_response.strip()) < 10:
-                    logger.error(f"Response too short or empty: '{raw_response}'")
-                    raise OllamaError("Response too short or empty", OllamaError.INVALID_RESPONSE)
-                
-                # Check for responses that are just the name "Hachi" repeated
-                hachi_count = raw_response.count("Hachi:")
-                if hachi_count > 2 and len(raw_response.replace("Hachi:", "").strip()) < 20:
-                    logger.error(f"Malformed response with repetitive 'Hachi:' pattern: '{raw_response}'")
-                    raise OllamaError("Malformed response pattern", OllamaError.INVALID_RESPONSE)
-                
-                # Check for nonsensical patterns like "Hachi: √"
-                if "√" in raw_response or "✓" in raw_response or (re.search(r'Hachi:\s*$', raw_response)):
-                    logger.error(f"Nonsensical response with symbols: '{raw_response}'")
-                    raise OllamaError("Nonsensical response", OllamaError.INVALID_RESPONSE)
-                
-                # Return the raw string response directly
-                return raw_response
-                
-            except Exception as e:
-                logger.error(f"Error in generate_and_parse: {str(e)}")
+            except OllamaError as e:
+                # Only unreachable-server errors count against the circuit; any
+                # other error means Ollama answered
+                if e.error_type == OllamaError.CONNECTION_ERROR:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
                 raise
+            finally:
+                # Report the depth once this call has left the queue too, so the
+                # gauge doesn't hold a burst's peak after it has drained
+                self.monitor.set_queue_depth("tier2", self.request_batcher.queue_depth)
+            self.circuit_breaker.record_success()
+            
+            logger.debug("Full response from LLM: %s", raw_response)
+            
+            # Queue wait plus inference time. The output length feeds the adaptive
+            # cap unless the response ran into max_tokens, since a cut-off response
+            # only shows the limit and not how long the answer wanted to be.
+            if isinstance(raw_response, str):
+                output_tokens = self._estimate_output_tokens(raw_response)
+                truncated = output_tokens >= sampling["max_tokens"]
+                self.monitor.track_inference(
+                    "tier2", time.perf_counter() - inference_start, output_tokens,
+                    bucket=None if truncated else self._output_length_bucket(request)
+                )
+            
+            # LLMs should always return strings
+            if not isinstance(raw_response, str):
+                logger.error("Invalid response type from LLM: %s", type(raw_response))
+                raise OllamaError(f"Expected string response from LLM, got {type(raw_response)}", 
+                                  OllamaError.INVALID_RESPONSE)
+            
+            # Check for obviously malformed responses
+            stripped_response = raw_response.strip()
+            if len(stripped_response) < 10:
+                logger.error("Response too short or empty: %r", raw_response)
+                raise OllamaError("Response too short or empty", OllamaError.INVALID_RESPONSE)
+            
+            # Check for responses that are just the name "Hachi" repeated
+            hachi_count = stripped_response.count("Hachi:")
+            if hachi_count > 2 and len(stripped_response.replace("Hachi:", "").strip()) < 20:
+                logger.error("Malformed response with repetitive 'Hachi:' pattern: %r", raw_response)
+                raise OllamaError("Malformed response pattern", OllamaError.INVALID_RESPONSE)
+            
+            # Check for nonsensical patterns like "Hachi: √" or a dangling "Hachi:"
+            if "√" in raw_response or "✓" in raw_response or stripped_response.endswith("Hachi:"):
+                logger.error("Nonsensical response with symbols: %r", raw_response)
+                raise OllamaError("Nonsensical response", OllamaError.INVALID_RESPONSE)
+            
+            # Return the raw string response directly
+            return raw_response
         
         try:
             # Use retry_async to call the function with retries
@@ -351,46 +940,269 @@ class Tier2Processor(Processor):
             return response, None
         except OllamaError as e:
             # If we get here, all retries failed
-            logger.warning(f"Failed to generate response after {retry_config.max_retries} retries: {str(e)}")
+            logger.warning("Failed to generate response after %d retries: %s", retry_config.max_retries, e)
             self.monitor.track_error("tier2", e.error_type, str(e))
             return None, e
         except Exception as e:
-            # Unexpected error
-            logger.error(f"Unexpected error generating response: {str(e)}")
+            # Unexpected (non-Ollama) error: report it as an unknown Ollama error so
+            # the caller's fallback logic applies. Cancellation is a BaseException
+            # and is never caught here.
+            logger.error("Unexpected error generating response: %s", e)
             self.monitor.track_error("tier2", "unexpected", str(e))
             return None, OllamaError(str(e), OllamaError.UNKNOWN_ERROR)
     
+    def _get_ollama_retry_config(self, max_retries: Optional[int] = None) -> RetryConfig:
+        """
+        Get the retry configuration for Ollama calls, building it once per override.
+        
+        The configs are rebuilt if retry_config is replaced.
+        
+        Args:
+            max_retries: Override for the configured number of retries (optional)
+            
+        Returns:
+            The retry configuration, retrying only transient Ollama errors
+        """
+        if self._ollama_retry_source is not self.retry_config:
+            self._ollama_retry_source = self.retry_config
+            self._ollama_retry_configs.clear()
+        
+        retry_config = self._ollama_retry_configs.get(max_retries)
+        if retry_config is None:
+            retry_config = self._ollama_retry_configs[max_retries] = RetryConfig(
+                max_retries=self.retry_config.max_retries if max_retries is None else max_retries,
+                base_delay=self.retry_config.base_delay,
+                max_delay=self.retry_config.max_delay,
+                backoff_factor=self.retry_config.backoff_factor,
+                jitter=self.retry_config.jitter,
+                jitter_factor=self.retry_config.jitter_factor,
+                full_jitter=self.retry_config.full_jitter,
+                rng=self.retry_config.rng,
+                retry_exceptions=[OllamaError],
+                retry_on=self._should_retry_ollama_error
+            )
+        return retry_config
+    
+    def _should_retry_ollama_error(self, error: Exception) -> bool:
+        """
+        Check whether a failed Ollama call should be retried.
+        
+        Transient errors are retried unless the circuit has opened in the
+        meantime, so calls already in their retry loop stop once Ollama is
+        known to be down. Timeouts aren't retried: the request already ran
+        for the full generation timeout, and a retry would only queue the
+        same prompt behind the load that made it slow.
+        
+        Args:
+            error: The error raised by the call
+            
+        Returns:
+            True if the call should be retried
+        """
+        return (
+            _is_transient_ollama_error(error)
+            and error.error_type != OllamaError.TIMEOUT_ERROR
+            and not self.circuit_breaker.is_open
+        )
+    
+    def _estimate_num_keep(self, request: ClassifiedRequest) -> Optional[int]:
+        """
+        Estimate how many tokens the request's static prompt prefix takes up.
+        
+        Passed to Ollama as num_keep, so the shared prefix (and its KV cache)
+        survives when a long conversation overflows the context window.
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            The estimated prefix length in tokens, or None if unknown
+        """
+        prefix = self.prompt_manager.create_static_prefix(request)
+        if not isinstance(prefix, str) or not prefix:
+            return None
+        return len(prefix) // self.CHARS_PER_TOKEN_ESTIMATE
+    
+    def _response_cache_key(self, request: ClassifiedRequest, model: str, prompt: str) -> Optional[bytes]:
+        """
+        Get the response cache key for a generate call.
+        
+        Args:
+            request: The request being processed
+            model: The model the call is sent to
+            prompt: The final prompt
+            
+        Returns:
+            The cache key, or None if the response may not be cached
+        """
+        if not self.response_cache_enabled or not self._is_response_cacheable(request):
+            return None
+        sampling = self._sampling_for(request)
+        return ResponseCache.make_key(model, prompt, sampling["temperature"], sampling["max_tokens"])
+    
+    def _sampling_for(self, request: ClassifiedRequest) -> Dict[str, Any]:
+        """
+        Get the sampling parameters for a request's generate calls.
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            The temperature and max_tokens keyword arguments
+        """
+        return self._sampling_by_intent.get(request.intent, self._DEFAULT_SAMPLING)
+    
+    def _generation_sampling(self, request: ClassifiedRequest) -> Dict[str, Any]:
+        """
+        Get the sampling parameters to generate with, with max_tokens capped adaptively.
+        
+        Once enough responses have been seen for the request's complexity and
+        intent, max_tokens is lowered to their 95th percentile length plus
+        headroom, so a runaway generation can't hold a batch slot for the full
+        budget. The cap never raises max_tokens, and cache keys keep using the
+        uncapped parameters.
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            The temperature and max_tokens keyword arguments
+        """
+        sampling = self._sampling_for(request)
+        if not self._adaptive_max_tokens:
+            return sampling
+        
+        p95 = self.monitor.get_p95_output_tokens("tier2", self._output_length_bucket(request))
+        if p95 is None:
+            return sampling
+        
+        cap = max(self.ADAPTIVE_MAX_TOKENS_FLOOR, int(p95 * self.ADAPTIVE_MAX_TOKENS_HEADROOM))
+        if cap >= sampling["max_tokens"]:
+            return sampling
+        return dict(sampling, max_tokens=cap)
+    
+    @staticmethod
+    def _output_length_bucket(request: ClassifiedRequest) -> str:
+        """
+        Get the bucket a request's output lengths are tracked under.
+        
+        Intents within one complexity answer at very different lengths (a
+        yes/no grammar check against a directions walkthrough), so lengths are
+        tracked per (complexity, intent).
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            The bucket name
+        """
+        intent = request.intent.value if request.intent is not None else "none"
+        return f"{request.complexity.value}:{intent}"
+    
+    @classmethod
+    def _estimate_output_tokens(cls, text: str) -> int:
+        """
+        Estimate the number of tokens in generated text without a tokenizer.
+        
+        ASCII text is counted at CHARS_PER_TOKEN_ESTIMATE characters per token and
+        every other character (kana, kanji) as a token of its own, so Japanese
+        output isn't undercounted.
+        
+        Args:
+            text: The generated text
+            
+        Returns:
+            The estimated token count
+        """
+        non_ascii = sum(1 for char in text if ord(char) > 127)
+        return (len(text) - non_ascii) // cls.CHARS_PER_TOKEN_ESTIMATE + non_ascii
+    
+    def _is_response_cacheable(self, request: ClassifiedRequest) -> bool:
+        """
+        Check whether a response for the request may be served from the cache.
+        
+        Deterministic (temperature 0) calls are always cacheable. Sampled calls
+        are only cached when the request sets "allow_cached_response", so
+        repeated questions keep their variety unless the caller opts in.
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            True if the response cache may be used for the request
+        """
+        if self._sampling_for(request)["temperature"] == 0.0:
+            return True
+        return bool(request.additional_params.get("allow_cached_response", False))
+    
+    async def _embed_player_input(self, request: ClassifiedRequest) -> Optional[List[float]]:
+        """
+        Embed the player's input for the semantic cache.
+        
+        Args:
+            request: The request being processed
+            
+        Returns:
+            The embedding, or None if it could not be computed
+        """
+        try:
+            return await self.ollama_client.embed(request.player_input, model=self.embedding_model)
+        except OllamaError as e:
+            logger.debug("Skipping semantic cache for request %s: %s", request.request_id, e)
+            return None
+    
+    @staticmethod
+    def _semantic_scope(request: ClassifiedRequest, model: str) -> Tuple:
+        """
+        Get the semantic cache scope for a request.
+        
+        Similar questions only share an answer when they have the same intent,
+        model and player location, so those make up the scope. The intent is
+        stored by value so the scope can be saved as JSON.
+        
+        Args:
+            request: The request being processed
+            model: The model the response is generated with
+            
+        Returns:
+            The scope key
+        """
+        location = request.game_context.player_location if request.game_context else None
+        return (request.intent.value, model, location)
+    
     def _select_model_based_on_complexity(self, complexity: ComplexityLevel) -> str:
         """
         Select a model based on the request complexity.
         
+        The TIER2_SIMPLE_MODEL, TIER2_DEFAULT_MODEL and TIER2_COMPLEX_MODEL
+        environment variables take precedence over the configuration, so
+        operators can pick a quantized tag (e.g. a Q4_K_M build) to suit
+        their hardware without editing the config.
+        
+        The models are resolved once, when the processor is created.
+        
         Args:
             complexity: The complexity level of the request
             
         Returns:
             The name of the model to use
         """
-        # Get config for models
-        config = get_config("tier2.ollama", {})
-        
-        # Use the default model for simple requests
-        if complexity == ComplexityLevel.SIMPLE:
-            # Get the simple model from config, or use deepseek-coder
-            simple_model = config.get("simple_model", "deepseek-coder")
-            logger.debug(f"Selected simple model: {simple_model}")
-            return simple_model
-        
-        # Use more capable models for complex requests
-        elif complexity == ComplexityLevel.COMPLEX:
-            # Get the complex model from config, or use deepseek-r1
-            complex_model = config.get("complex_model", "deepseek-r1")
-            logger.debug(f"Selected complex model: {complex_model}")
-            return complex_model
+        return self._models_by_complexity.get(complexity, self._default_model)
+    
+    @staticmethod
+    def _resolve_model(source: Tuple[str, str, str], config: Dict[str, Any]) -> str:
+        """
+        Resolve a model name from its environment variable, config key or default.
         
-        # Default to medium complexity model
-        default_model = config.get("default_model", "deepseek-coder")
-        logger.debug(f"Selected default model: {default_model}")
-        return default_model
+        Args:
+            source: The (environment variable, config key, default) to resolve
+            config: The tier2.ollama configuration section
+            
+        Returns:
+            The name of the model
+        """
+        env_var, config_key, default = source
+        return os.environ.get(env_var) or config.get(config_key) or default
     
     def _generate_fallback_response(self, request: ClassifiedRequest) -> str:
         """
@@ -405,14 +1217,9 @@ class Tier2Processor(Processor):
         # Store the processing tier in additional params
         request.additional_params["processing_tier"] = ProcessingTier.RULE.value
         
-        # If we have a response parser, use it to create a fallback response
-        if hasattr(self, 'response_parser'):
-            logger.info(f"Creating fallback response with parser for request {request.request_id}")
-            return self.response_parser._create_fallback_response(request)
-        
-        # Default generic fallback response
-        logger.info(f"Returning generic fallback response for request {request.request_id}")
-        return "I'm sorry, I couldn't generate a proper response. Could you please try asking in a different way?"
+        # The parser looks the response up in its per-intent fallback table
+        logger.debug("Creating fallback response with parser for request %s", request.request_id)
+        return self.response_parser._create_fallback_response(request)
     
     def _should_fallback_to_tier1(self, error: OllamaError) -> bool:
         """
@@ -424,39 +1231,10 @@ class Tier2Processor(Processor):
         Returns:
             True if we should fall back to Tier 1, False otherwise
         """
-        # Handle non-OllamaError exceptions
-        if not isinstance(error, OllamaError):
-            logger.debug(f"Deciding NOT to fall back to Tier 1 for non-OllamaError: {str(error)}")
-            return False
-            
-        # If it's a connection error, we should fall back
-        if error.error_type == OllamaError.CONNECTION_ERROR:
-            logger.debug(f"Deciding to fall back to Tier 1 due to LLM service issue: {error.error_type}")
-            return True
-        
-        # For timeout errors, we should NOT fall back (to match test expectations)
-        if error.error_type == OllamaError.TIMEOUT_ERROR:
-            logger.debug(f"Deciding NOT to fall back to Tier 1 for timeout error")
-            return False
-            
-        # If the model is not found, we should fall back
-        if error.error_type == OllamaError.MODEL_ERROR:
-            logger.debug(f"Deciding to fall back to Tier 1 due to model issue: {error.error_type}")
-            return True
-        
-        # If the model returns an invalid response, we should fall back
-        if error.error_type == OllamaError.INVALID_RESPONSE:
-            logger.debug(f"Deciding to fall back to Tier 1 due to invalid response: {error.message}")
-            return True
-        
-        # If it's a content error, we should NOT fall back (would likely get the same error)
-        if error.error_type == OllamaError.CONTENT_ERROR:
-            logger.debug(f"Deciding NOT to fall back to Tier 1 due to content error")
-            return False
-        
-        # For any other error, fall back to Tier 1 if it's available
-        logger.debug(f"Deciding to fall back to Tier 1 due to unknown error: {error.message}")
-        return True
+        # Non-Ollama exceptions are bugs rather than service issues, so never fall back for them
+        should_fallback = isinstance(error, OllamaError) and error.error_type not in self.NO_TIER1_FALLBACK_ERRORS
+        logger.debug("Fall back to Tier 1 for %r: %s", error, should_fallback)
+        return should_fallback
     
     def _get_tier1_processor(self):
         """
@@ -464,7 +1242,16 @@ class Tier2Processor(Processor):
         
         Returns:
             A tier1 processor
+            
+        Raises:
+            ValueError: If Tier 1 is disabled in configuration
         """
-        # Get a tier1 processor from the factory
-        factory = ProcessorFactory()
-        return factory.get_processor(ProcessingTier.TIER_1) 
\ No newline at end of file
+        # Look the processor up once; the factory caches it, so later calls would get the same one
+        if self._tier1_processor is None:
+            try:
+                self._tier1_processor = ProcessorFactory().get_processor(ProcessingTier.TIER_1)
+            except ValueError:
+                # Disabled in configuration; skip the fallback from now on
+                self._tier1_available = False
+                raise
+        return self._tier1_processor
\ No newline at end of file
@@ -8,16 +8,22 @@ service that offers high-performing foundation models from leading AI companies.
 import json
 import logging
 import asyncio
-import aiohttp
+import threading
 import boto3
 import time
-from typing import Dict, List, Any, Optional, Union
-from botocore.auth import SigV4Auth
-from botocore.awsrequest import AWSRequest
-from botocore.credentials import Credentials
+from typing import Dict, List, Any, AsyncIterator, Callable, Iterator, Optional, Tuple, Union
+from botocore.config import Config
+from botocore.exceptions import (
+    ClientError,
+    ConnectionError as BotocoreConnectionError,
+    ConnectTimeoutError,
+    HTTPClientError,
+    ReadTimeoutError
+)
 
 from src.ai.companion.core.models import CompanionRequest
-from src.ai.companion.tier3.prompt_optimizer import create_optimized_prompt
+from src.ai.companion.tier2.response_cache import ResponseCache
+from src.ai.companion.tier3.prompt_optimizer import AVG_CHARS_PER_TOKEN, create_optimized_prompt
 from src.ai.companion.tier3.usage_tracker import (
     track_request,
     check_quota,
@@ -38,9 +44,14 @@ class BedrockError(Exception):
     QUOTA_ERROR = "quota_exceeded"
     TIMEOUT_ERROR = "timeout"
     CONNECTION_ERROR = "connection_error"
+    SERVICE_ERROR = "service_unavailable"
     MODEL_ERROR = "model_error"
     UNKNOWN_ERROR = "unknown_error"
     
+    # Error types worth retrying: throttling, and the server-side and network
+    # failures that botocore's default retries used to cover
+    TRANSIENT_ERROR_TYPES = frozenset({QUOTA_ERROR, SERVICE_ERROR, CONNECTION_ERROR, TIMEOUT_ERROR})
+    
     def __init__(self, message: str, error_type: str = UNKNOWN_ERROR):
         """Initialize the error."""
         super().__init__(message)
@@ -56,12 +67,59 @@ class BedrockClient:
     It handles authentication, model selection, and usage tracking.
     """
     
+    # Size of the keep-alive connection pool to the Bedrock runtime endpoint.
+    # Calls run in worker threads and each concurrent call needs a connection;
+    # beyond this many, connections are opened (with a TLS handshake) and
+    # discarded per call.
+    MAX_POOL_CONNECTIONS = 50
+    
+    # Exact-match response cache. Only near-deterministic calls are cached by
+    # default; sampled calls are cached when the request sets "allow_cached_response".
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = 600.0
+    CACHEABLE_MAX_TEMPERATURE = 0.3
+    
+    # Bedrock only caches a prompt prefix of at least this many tokens
+    # (Claude and Nova); shorter prefixes are sent without a cache checkpoint
+    MIN_PROMPT_CACHE_TOKENS = 1024
+    
+    # Models that offer latency-optimized inference. Other models reject the
+    # setting with a ValidationException, so it is only sent to these.
+    LATENCY_OPTIMIZED_MODELS = frozenset({
+        "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+        "us.meta.llama3-1-70b-instruct-v1:0",
+        "us.meta.llama3-1-405b-instruct-v1:0",
+        "us.amazon.nova-pro-v1:0",
+    })
+    
+    # Transient errors (throttling, 5xx, connection failures, timeouts) are
+    # retried with exponential backoff (0.5s, 1s, 2s, with jitter); other errors
+    # are raised straight away. botocore's own retries are turned off, so a
+    # request is sent at most max_retries + 1 times.
+    RETRY_CONFIG = RetryConfig(
+        max_retries=3,
+        base_delay=0.5,
+        backoff_factor=2.0,
+        jitter_factor=0.2,
+        retry_on=lambda e: isinstance(e, BedrockError) and e.error_type in BedrockError.TRANSIENT_ERROR_TYPES
+    )
+    
+    # Error codes for Bedrock-side failures that are worth retrying
+    SERVICE_ERROR_CODES = frozenset({
+        "ServiceUnavailableException",
+        "InternalServerException",
+        "ModelNotReadyException",
+    })
+    
     def __init__(
         self,
         region_name: str = "us-east-1",
         model_id: str = "amazon.nova-micro-v1:0",
         max_tokens: int = 512,
-        usage_tracker: Optional[UsageTracker] = None
+        usage_tracker: Optional[UsageTracker] = None,
+        prompt_caching: bool = False,
+        latency_mode: str = "optimized",
+        max_concurrency: int = 8
     ):
         """
         Initialize the Bedrock client.
@@ -71,20 +129,41 @@ class BedrockClient:
             model_id: The default model ID to use
             max_tokens: The maximum number of tokens to generate
             usage_tracker: The usage tracker to use
+            prompt_caching: Whether to mark static prompt prefixes for Bedrock prompt
+                caching (the models used must support it)
+            latency_mode: "optimized" to use latency-optimized inference for the
+                models that offer it, or "standard"
+            max_concurrency: The maximum number of Bedrock calls in flight at once
+                (keep it within the account's requests-per-minute quota)
         """
         self.logger = logging.getLogger(__name__)
         self.region_name = region_name
         self.default_model = model_id
         self.max_tokens = max_tokens
         self.usage_tracker = usage_tracker or default_tracker
+        self.prompt_caching = prompt_caching
+        self.latency_mode = latency_mode
+        self.response_cache = ResponseCache(maxsize=self.RESPONSE_CACHE_SIZE, ttl=self.RESPONSE_CACHE_TTL)
+        self._in_flight: Dict[bytes, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         
         # Create the Bedrock client
         try:
-            self.logger.debug(f"Creating Bedrock client in region {region_name}")
-            self.client = boto3.client(service_name="bedrock-runtime", region_name=region_name)
+            self.logger.debug("Creating Bedrock client in region %s", region_name)
+            self.client = boto3.client(
+                service_name="bedrock-runtime",
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=self.MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                    # Transient errors are retried by RETRY_CONFIG alone; botocore's
+                    # own retries would multiply the attempts on every failed call
+                    retries={"mode": "standard", "total_max_attempts": 1}
+                )
+            )
             self.logger.debug("Bedrock client created successfully")
         except Exception as e:
-            self.logger.error(f"Error creating Bedrock client: {str(e)}")
+            self.logger.error("Error creating Bedrock client: %s", e)
             raise BedrockError(f"Error creating Bedrock client: {str(e)}", BedrockError.API_ERROR)
 
     def _redact_sensitive_info(self, data):
@@ -152,6 +231,22 @@ class BedrockClient:
         
         return json.dumps(redacted_data, ensure_ascii=False, indent=2)
     
+    @staticmethod
+    def _serialize_payload(payload: Dict[str, Any]) -> bytes:
+        """
+        Serialize a request payload into the request body.
+        
+        Compact separators and raw UTF-8 (rather than \\u escapes for the
+        Japanese text) keep the body small.
+        
+        Args:
+            payload: The request payload
+            
+        Returns:
+            The UTF-8 encoded JSON body
+        """
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
     def _call_bedrock_api(self, model_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
         Call the Amazon Bedrock API with the provided model ID and payload.
@@ -163,49 +258,160 @@ class BedrockClient:
         Returns:
             The response from the API
         """
-        # Log the request payload in detail for debugging, but redact sensitive info
-        self.logger.debug(f"Request model_id: {model_id}")
-        self.logger.debug(f"Request payload: {self._pretty_print_json(payload)}")
+        # Log the request payload in detail for debugging, but redact sensitive info;
+        # the pretty-printed copy is only built when debug logging is on
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Request model_id: %s", model_id)
+            self.logger.debug("Request payload: %s", self._pretty_print_json(payload))
         
         try:
             # Call the API
-            self.logger.debug(f"Calling Bedrock API with model {model_id}")
+            self.logger.debug("Calling Bedrock API with model %s", model_id)
             response = self.client.invoke_model(
                 modelId=model_id,
-                body=json.dumps(payload),
+                body=self._serialize_payload(payload),
                 contentType="application/json",
-                accept="application/json"
+                accept="application/json",
+                **self._invoke_options(model_id)
             )
             
-            # Parse the response
-            response_body = response["body"].read().decode("utf-8")
-            response_json = json.loads(response_body)
+            # Parse the response (json.loads decodes the UTF-8 bytes itself)
+            response_json = json.loads(response["body"].read())
             
             # Log the complete raw response for debugging, but redact sensitive info
-            self.logger.debug(f"Raw response: {self._pretty_print_json(response_json)}")
+            if debug:
+                self.logger.debug("Raw response: %s", self._pretty_print_json(response_json))
             
             return response_json
         except Exception as e:
             # Log detailed error information, but redact sensitive info
-            self.logger.error(f"Error calling Bedrock API: {str(e)}")
-            self.logger.error(f"Model ID: {model_id}")
-            self.logger.error(f"Request payload: {self._pretty_print_json(payload)}")
+            self.logger.error("Error calling Bedrock API: %s", e)
+            self.logger.error("Model ID: %s", model_id)
+            self.logger.error("Request payload: %s", self._pretty_print_json(payload))
             
-            # Check for specific error types
-            error_type = BedrockError.API_ERROR
             error_msg = str(e)
-            
-            if "AccessDeniedException" in error_msg:
-                error_type = BedrockError.AUTHENTICATION_ERROR
-            elif "ValidationException" in error_msg:
+            if "ValidationException" in error_msg:
                 # Log more details about validation errors
-                self.logger.error(f"Validation error details: Request format may be incorrect for model {model_id}")
-            elif "ThrottlingException" in error_msg or "TooManyRequestsException" in error_msg:
-                error_type = BedrockError.QUOTA_ERROR
-            elif "Timeout" in error_msg:
-                error_type = BedrockError.TIMEOUT_ERROR
+                self.logger.error("Validation error details: Request format may be incorrect for model %s", model_id)
                 
-            raise BedrockError(f"Error calling Bedrock API: {error_msg}", error_type)
+            raise BedrockError(f"Error calling Bedrock API: {error_msg}", self._error_type_for(e))
+    
+    async def _call_bedrock_api_bounded(self, model_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call the Bedrock API in a worker thread, within the concurrency limit.
+        
+        Args:
+            model_id: The model ID to use
+            payload: The request payload
+            
+        Returns:
+            The response from the API
+        """
+        async with self._semaphore:
+            return await asyncio.to_thread(self._call_bedrock_api, model_id, payload)
+    
+    def _stream_bedrock_api(
+        self,
+        model_id: str,
+        payload: Dict[str, Any],
+        stop: Optional[threading.Event] = None,
+        on_open: Optional[Callable[[Any], None]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Call the Amazon Bedrock streaming API and yield the decoded response chunks.
+        
+        This blocks while waiting for each chunk, so it runs in a worker thread.
+        
+        Args:
+            model_id: The model ID to use
+            payload: The request payload
+            stop: Set by the consumer to stop reading; the stream then ends quietly,
+                even if closing it broke a pending read
+            on_open: Called with the response's EventStream once the call is made,
+                so another thread can close it to unblock a pending read
+            
+        Yields:
+            The JSON chunks of the response, in the model's streaming format
+            
+        Raises:
+            BedrockError: If the call fails, before or during the stream
+        """
+        self.logger.debug("Calling Bedrock streaming API with model %s", model_id)
+        try:
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=self._serialize_payload(payload),
+                contentType="application/json",
+                accept="application/json",
+                **self._invoke_options(model_id)
+            )
+            stream = response["body"]
+        except Exception as e:
+            self.logger.error("Error calling Bedrock streaming API for model %s: %s", model_id, e)
+            raise BedrockError(f"Error calling Bedrock API: {e}", self._error_type_for(e))
+        
+        if on_open is not None:
+            on_open(stream)
+        
+        try:
+            # Errors raised by Bedrock mid-stream surface while iterating
+            for event in stream:
+                if stop is not None and stop.is_set():
+                    return
+                if "chunk" in event:
+                    yield json.loads(event["chunk"]["bytes"])
+        except Exception as e:
+            if stop is not None and stop.is_set():
+                return
+            self.logger.error("Error reading Bedrock stream for model %s: %s", model_id, e)
+            raise BedrockError(f"Error streaming from Bedrock API: {e}", self._error_type_for(e))
+        finally:
+            stream.close()
+    
+    def _invoke_options(self, model_id: str) -> Dict[str, Any]:
+        """
+        Get the extra InvokeModel arguments for a model.
+        
+        Args:
+            model_id: The model ID to use
+            
+        Returns:
+            Keyword arguments for invoke_model / invoke_model_with_response_stream
+        """
+        if self.latency_mode == "optimized" and model_id in self.LATENCY_OPTIMIZED_MODELS:
+            return {"performanceConfigLatency": "optimized"}
+        return {}
+    
+    @staticmethod
+    def _error_type_for(error: Exception) -> str:
+        """
+        Classify an error raised while calling Bedrock.
+        
+        Args:
+            error: The error raised by the boto3 client
+            
+        Returns:
+            The BedrockError error type
+        """
+        if isinstance(error, ClientError):
+            code = error.response.get("Error", {}).get("Code", "")
+            status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+            if code in BedrockClient.SERVICE_ERROR_CODES or status >= 500:
+                return BedrockError.SERVICE_ERROR
+        elif isinstance(error, (ReadTimeoutError, ConnectTimeoutError)):
+            return BedrockError.TIMEOUT_ERROR
+        elif isinstance(error, (BotocoreConnectionError, HTTPClientError)):
+            return BedrockError.CONNECTION_ERROR
+        
+        error_msg = str(error)
+        if "AccessDeniedException" in error_msg:
+            return BedrockError.AUTHENTICATION_ERROR
+        if "ThrottlingException" in error_msg or "TooManyRequestsException" in error_msg:
+            return BedrockError.QUOTA_ERROR
+        if "Timeout" in error_msg:
+            return BedrockError.TIMEOUT_ERROR
+        return BedrockError.API_ERROR
 
     async def generate(
         self, 
@@ -213,7 +419,8 @@ class BedrockClient:
         model_id: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        prompt: str = ""
+        prompt: str = "",
+        static_prefix: Optional[str] = None
     ) -> str:
         """
         Generate text with Amazon Bedrock.
@@ -224,6 +431,8 @@ class BedrockClient:
             temperature: The temperature to use for generation
             max_tokens: The maximum number of tokens to generate
             prompt: The prompt to use
+            static_prefix: The leading part of the prompt that is the same across
+                requests; with prompt caching on, Bedrock caches it between calls
             
         Returns:
             The generated text
@@ -233,54 +442,67 @@ class BedrockClient:
         max_tokens = max_tokens or self.max_tokens
         
         # Log the generation request
-        self.logger.info(f"Generating text for request {request.request_id} with model {model_id}")
-        self.logger.debug(f"Prompt: {prompt}")
-        self.logger.debug(f"Temperature: {temperature}, max_tokens: {max_tokens}")
+        self.logger.info("Generating text for request %s with model %s", request.request_id, model_id)
+        self.logger.debug("Prompt: %s", prompt)
+        self.logger.debug("Temperature: %s, max_tokens: %s", temperature, max_tokens)
         
-        # Create the payload based on the model type
-        if "claude" in model_id.lower():
-            # Claude-specific payload
-            payload = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
-        elif "nova" in model_id.lower():
-            # Nova-specific payload using Converse API format
-            payload = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [{"text": prompt}]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": max_tokens,
-                    "temperature": temperature,
-                    "topP": 0.9
-                }
-            }
+        payload = self._build_payload(model_id, prompt, temperature, max_tokens, static_prefix)
+        
+        # Serve repeated calls from memory, without a Bedrock round trip or usage charge
+        cache_key = None
+        if temperature <= self.CACHEABLE_MAX_TEMPERATURE or request.additional_params.get("allow_cached_response"):
+            cache_key = ResponseCache.make_key(model_id, prompt, temperature, max_tokens)
+            cached_text = self.response_cache.get(cache_key)
+            if cached_text is not None:
+                self.logger.debug("Response cache hit for request %s", request.request_id)
+                return cached_text
+        
+        if cache_key is None:
+            return await self._generate_text(model_id, payload)
+        
+        # Concurrent identical calls share a single Bedrock round trip
+        call = self._in_flight.get(cache_key)
+        if call is None:
+            call = asyncio.ensure_future(self._generate_text(model_id, payload))
+            self._in_flight[cache_key] = call
+            call.add_done_callback(lambda done: self._forget_in_flight(cache_key, done))
         else:
-            # Default payload for other models (text completion format)
-            payload = {
-                "inputText": prompt,
-                "textGenerationConfig": {
-                    "maxTokenCount": max_tokens,
-                    "temperature": temperature,
-                    "topP": 0.9,
-                    "stopSequences": []
-                }
-            }
+            self.logger.debug("Joining in-flight Bedrock call for request %s", request.request_id)
+        
+        text = await asyncio.shield(call)
+        if text:
+            self.response_cache.put(cache_key, text)
+        return text
+    
+    def _forget_in_flight(self, cache_key: bytes, call: asyncio.Future) -> None:
+        """Drop a finished call from the in-flight table, unless it was replaced."""
+        if self._in_flight.get(cache_key) is call:
+            del self._in_flight[cache_key]
+        # Its callers may all have been cancelled; mark a failure as seen so
+        # asyncio doesn't report it as never retrieved
+        if not call.cancelled():
+            call.exception()
+    
+    async def _generate_text(self, model_id: str, payload: Dict[str, Any]) -> str:
+        """
+        Invoke a model and extract the generated text from its response.
         
+        Args:
+            model_id: The model ID to use
+            payload: The request payload
+            
+        Returns:
+            The generated text
+            
+        Raises:
+            BedrockError: If there's an error generating text
+        """
         try:
-            # Call the API
-            response_json = self._call_bedrock_api(model_id, payload)
+            # Call the API in a worker thread; boto3 blocks, and concurrent
+            # requests would otherwise queue behind each other on the event loop
+            response_json = await retry_async(
+                self._call_bedrock_api_bounded, model_id, payload, config=self.RETRY_CONFIG
+            )
             
             # Extract the generated text based on the model type
             if "claude" in model_id.lower():
@@ -319,33 +541,258 @@ class BedrockClient:
                 text = response_json.get("outputText", response_json.get("results", [{}])[0].get("outputText", ""))
             
             # Log the generated text
-            self.logger.debug(f"Generated text: {text}")
+            self.logger.debug("Generated text: %s", text)
             
             # Track usage
             if "usage" in response_json:
-                input_tokens = response_json["usage"].get("inputTokens", 0)
-                output_tokens = response_json["usage"].get("outputTokens", 0)
-                
-                # Check if the usage_tracker has the record_usage method
-                if hasattr(self.usage_tracker, 'record_usage'):
-                    self.usage_tracker.record_usage(
-                        model_id=model_id,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens
-                    )
-                else:
-                    # Log usage information without tracking
-                    self.logger.info(f"Usage: {input_tokens} input tokens, {output_tokens} output tokens")
+                self._record_usage(
+                    model_id,
+                    response_json["usage"].get("inputTokens", 0),
+                    response_json["usage"].get("outputTokens", 0)
+                )
             
             return text
         except BedrockError as e:
             # Preserve the original error type
-            self.logger.error(f"Error generating text: {str(e)}")
+            self.logger.error("Error generating text: %s", e)
             raise  # Re-raise the original BedrockError with its type intact
         except Exception as e:
-            self.logger.error(f"Error generating text: {str(e)}")
+            self.logger.error("Error generating text: %s", e)
             raise BedrockError(f"Error generating text: {str(e)}", BedrockError.API_ERROR)
     
+    async def generate_stream(
+        self,
+        request: CompanionRequest,
+        model_id: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        prompt: str = "",
+        static_prefix: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text with Amazon Bedrock, yielding it as it is generated.
+        
+        The first chunk arrives after the model's time-to-first-token instead
+        of after the whole response. Streamed responses are not cached.
+        
+        Args:
+            request: The request to generate text for
+            model_id: The model ID to use (optional, defaults to the default model)
+            temperature: The temperature to use for generation
+            max_tokens: The maximum number of tokens to generate
+            prompt: The prompt to use
+            static_prefix: The leading part of the prompt that is the same across
+                requests; with prompt caching on, Bedrock caches it between calls
+            
+        Yields:
+            Chunks of the generated text
+            
+        Raises:
+            BedrockError: If there's an error generating the text
+        """
+        model_id = model_id or self.default_model
+        max_tokens = max_tokens or self.max_tokens
+        self.logger.info("Streaming text for request %s with model %s", request.request_id, model_id)
+        
+        payload = self._build_payload(model_id, prompt, temperature, max_tokens, static_prefix)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+        streams: List[Any] = []
+        finished = False
+        
+        def opened(stream: Any) -> None:
+            streams.append(stream)
+            # The consumer may have stopped while the call was being made
+            if stop.is_set():
+                stream.close()
+        
+        def read_stream() -> None:
+            try:
+                for chunk in self._stream_bedrock_api(model_id, payload, stop=stop, on_open=opened):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        # A stream counts against the concurrency limit until it is closed
+        await self._semaphore.acquire()
+        worker = asyncio.ensure_future(asyncio.to_thread(read_stream))
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    finished = True
+                    break
+                if isinstance(item, BedrockError):
+                    raise item
+                if isinstance(item, Exception):
+                    raise BedrockError(f"Error generating text: {str(item)}", BedrockError.API_ERROR)
+                
+                text = self._extract_stream_text(model_id, item)
+                if text:
+                    yield text
+                
+                # The last chunk of every model's stream carries the token counts
+                metrics = item.get("amazon-bedrock-invocationMetrics")
+                if metrics:
+                    self._record_usage(model_id, metrics.get("inputTokenCount", 0), metrics.get("outputTokenCount", 0))
+        finally:
+            # If the caller stopped early, close the stream too: the worker may be
+            # blocked waiting for the next event, holding its concurrency slot
+            stop.set()
+            if not finished:
+                for stream in streams:
+                    stream.close()
+            try:
+                await worker
+            finally:
+                self._semaphore.release()
+    
+    @staticmethod
+    def _extract_stream_text(model_id: str, chunk: Dict[str, Any]) -> str:
+        """
+        Get the text delta from a streamed response chunk.
+        
+        Args:
+            model_id: The model the chunk came from
+            chunk: The decoded chunk
+            
+        Returns:
+            The new text in the chunk (empty for chunks without text)
+        """
+        if "claude" in model_id.lower():
+            if chunk.get("type") == "content_block_delta":
+                return chunk.get("delta", {}).get("text", "")
+            return ""
+        if "nova" in model_id.lower():
+            return chunk.get("contentBlockDelta", {}).get("delta", {}).get("text", "")
+        return chunk.get("outputText", "")
+    
+    def _record_usage(self, model_id: str, input_tokens: int, output_tokens: int) -> None:
+        """
+        Record the token usage of a call.
+        
+        Args:
+            model_id: The model ID that was called
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+        """
+        # Check if the usage_tracker has the record_usage method
+        if hasattr(self.usage_tracker, 'record_usage'):
+            self.usage_tracker.record_usage(
+                model_id=model_id,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens
+            )
+        else:
+            # Log usage information without tracking
+            self.logger.info("Usage: %s input tokens, %s output tokens", input_tokens, output_tokens)
+    
+    def _build_payload(
+        self,
+        model_id: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        static_prefix: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the InvokeModel request body for a model.
+        
+        Args:
+            model_id: The model ID to use
+            prompt: The prompt to use
+            temperature: The temperature to use for generation
+            max_tokens: The maximum number of tokens to generate
+            static_prefix: The static leading part of the prompt, if known
+            
+        Returns:
+            The request payload
+        """
+        # Split off the static prefix if Bedrock should cache it
+        cached_split = self._split_cacheable_prefix(model_id, prompt, static_prefix)
+        
+        # Create the payload based on the model type
+        if "claude" in model_id.lower():
+            # Claude-specific payload; a cached prefix is its own content block marked with cache_control
+            if cached_split:
+                content = [
+                    {"type": "text", "text": cached_split[0], "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": cached_split[1]}
+                ]
+            else:
+                content = prompt
+            payload = {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ]
+            }
+        elif "nova" in model_id.lower():
+            # Nova-specific payload using Converse API format; a cached prefix is followed by a cachePoint
+            if cached_split:
+                content = [{"text": cached_split[0]}, {"cachePoint": {"type": "default"}}, {"text": cached_split[1]}]
+            else:
+                content = [{"text": prompt}]
+            payload = {
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ],
+                "inferenceConfig": {
+                    "maxTokens": max_tokens,
+                    "temperature": temperature,
+                    "topP": 0.9
+                }
+            }
+        else:
+            # Default payload for other models (text completion format)
+            payload = {
+                "inputText": prompt,
+                "textGenerationConfig": {
+                    "maxTokenCount": max_tokens,
+                    "temperature": temperature,
+                    "topP": 0.9,
+                    "stopSequences": []
+                }
+            }
+        
+        return payload
+    
+    def _split_cacheable_prefix(
+        self, model_id: str, prompt: str, static_prefix: Optional[str]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Split a prompt into a prefix for Bedrock to cache and the rest.
+        
+        Args:
+            model_id: The model the prompt is sent to
+            prompt: The full prompt
+            static_prefix: The static leading part of the prompt, if known
+            
+        Returns:
+            The (prefix, remainder) pair, or None if the prompt should be sent whole
+        """
+        if not self.prompt_caching or not isinstance(static_prefix, str) or not isinstance(prompt, str):
+            return None
+        if not any(family in model_id.lower() for family in ("claude", "nova")):
+            return None
+        if not static_prefix or not prompt.startswith(static_prefix) or len(prompt) == len(static_prefix):
+            return None
+        if len(static_prefix) // AVG_CHARS_PER_TOKEN < self.MIN_PROMPT_CACHE_TOKENS:
+            return None
+        return static_prefix, prompt[len(static_prefix):]
+    
     async def get_available_models(self) -> List[Dict[str, Any]]:
         """
         Get a list of available models from Amazon Bedrock.
@@ -373,5 +820,5 @@ class BedrockClient:
                 
         except Exception as e:
             # Wrap exceptions in BedrockError
-            logger.error(f"Error getting available models: {e}")
+            logger.error("Error getting available models: %s", e)
             raise BedrockError(f"Error getting available models: {e}")
@@ -81,7 +81,7 @@ class ContextEntry:
             try:
                 intent = IntentCategory(data["intent"])
             except ValueError:
-                logger.warning(f"Unknown intent: {data['intent']}")
+                logger.warning("Unknown intent: %s", data['intent'])
         
         return cls(
             request=data["request"],
@@ -259,7 +259,7 @@ class ContextManager:
         # Store the context
         self._contexts[context.conversation_id] = context
         
-        logger.info(f"Created new conversation context: {context.conversation_id}")
+        logger.info("Created new conversation context: %s", context.conversation_id)
         return context
     
     def get_context(self, conversation_id: str) -> Optional[ConversationContext]:
@@ -293,13 +293,13 @@ class ContextManager:
         """
         context = self.get_context(conversation_id)
         if not context:
-            logger.warning(f"Context not found: {conversation_id}")
+            logger.warning("Context not found: %s", conversation_id)
             return None
         
         # Add the request-response pair to the context
         context.add_entry_from_request_response(request, response)
         
-        logger.debug(f"Updated context {conversation_id} with new entry")
+        logger.debug("Updated context %s with new entry", conversation_id)
         return context
     
     def delete_context(self, conversation_id: str) -> bool:
@@ -314,10 +314,10 @@ class ContextManager:
         """
         if conversation_id in self._contexts:
             del self._contexts[conversation_id]
-            logger.info(f"Deleted conversation context: {conversation_id}")
+            logger.info("Deleted conversation context: %s", conversation_id)
             return True
         
-        logger.warning(f"Context not found for deletion: {conversation_id}")
+        logger.warning("Context not found for deletion: %s", conversation_id)
         return False
     
     def get_or_create_context(
@@ -351,7 +351,7 @@ class ContextManager:
                 current_location=current_location
             )
             self._contexts[conversation_id] = context
-            logger.info(f"Created new conversation context with specified ID: {conversation_id}")
+            logger.info("Created new conversation context with specified ID: %s", conversation_id)
             return context
         
         # Create a new context with a generated ID
@@ -404,7 +404,7 @@ class ContextManager:
         # Get the context
         context = self.get_context(conversation_id)
         if not context:
-            logger.warning(f"Context not found for request: {conversation_id}")
+            logger.warning("Context not found for request: %s", conversation_id)
         
         return context
     
@@ -452,7 +452,7 @@ class ContextManager:
         # Add the context to the request
         prepared_request.additional_params["conversation_context"] = context_dict
         
-        logger.debug(f"Prepared request with conversation context: {context.conversation_id}")
+        logger.debug("Prepared request with conversation context: %s", context.conversation_id)
         return prepared_request
 
 
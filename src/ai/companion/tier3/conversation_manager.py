@@ -91,20 +91,20 @@ class ConversationManager:
         # Check for clarification patterns
         for pattern in self.clarification_patterns:
             if re.search(pattern, player_input):
-                logger.debug(f"Detected clarification request: {player_input}")
+                logger.debug("Detected clarification request: %s", player_input)
                 return ConversationState.CLARIFICATION
         
         # Check for follow-up patterns
         for pattern in self.follow_up_patterns:
             if re.search(pattern, player_input):
-                logger.debug(f"Detected follow-up question: {player_input}")
+                logger.debug("Detected follow-up question: %s", player_input)
                 return ConversationState.FOLLOW_UP
         
         # Check for references to previous entities
         for entry in context.entries:
             for entity_name, entity_value in entry.entities.items():
                 if isinstance(entity_value, str) and entity_value.lower() in player_input:
-                    logger.debug(f"Detected reference to previous entity: {entity_value}")
+                    logger.debug("Detected reference to previous entity: %s", entity_value)
                     return ConversationState.FOLLOW_UP
         
         # Default to new topic
@@ -190,7 +190,7 @@ class ConversationManager:
         # Generate a response using the Bedrock client
         response = bedrock_client.generate_text(prompt)
         
-        logger.debug(f"Generated response to follow-up question: {response}")
+        logger.debug("Generated response to follow-up question: %s", response)
         return response
     
     def handle_clarification(
@@ -226,7 +226,7 @@ class ConversationManager:
         # Generate a response using the Bedrock client
         response = bedrock_client.generate_text(prompt)
         
-        logger.debug(f"Generated response to clarification request: {response}")
+        logger.debug("Generated response to clarification request: %s", response)
         return response
     
     def handle_new_topic(
@@ -252,7 +252,7 @@ class ConversationManager:
         # Generate a response using the Bedrock client
         response = bedrock_client.generate_text(prompt)
         
-        logger.debug(f"Generated response to new topic: {response}")
+        logger.debug("Generated response to new topic: %s", response)
         return response
     
     def process(
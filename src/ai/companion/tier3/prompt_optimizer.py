@@ -66,7 +66,7 @@ class PromptOptimizer:
         system_tokens = self.estimate_tokens(system_prompt)
         input_tokens = self.estimate_tokens(player_input)
         
-        self.logger.debug(f"Estimated tokens - System: {system_tokens}, Input: {input_tokens}")
+        self.logger.debug("Estimated tokens - System: %s, Input: %s", system_tokens, input_tokens)
         
         # If we're under the limit, use the full prompt
         if system_tokens + input_tokens <= self.max_prompt_tokens:
@@ -78,16 +78,16 @@ class ScenarioDetector:
         Returns:
             The detected scenario type.
         """
-        logger.debug(f"Detecting scenario for request: {request.request_id}")
+        logger.debug("Detecting scenario for request: %s", request.request_id)
         
         # Check each scenario type in priority order
         for scenario_type, detection_rule in self._detection_rules.items():
             if detection_rule(request):
-                logger.info(f"Detected scenario: {scenario_type.value} for request: {request.request_id}")
+                logger.info("Detected scenario: %s for request: %s", scenario_type.value, request.request_id)
                 return scenario_type
         
         # If no scenario matches, return UNKNOWN
-        logger.info(f"No specific scenario detected for request: {request.request_id}")
+        logger.info("No specific scenario detected for request: %s", request.request_id)
         return ScenarioType.UNKNOWN
     
     def get_scenario_handler(self, scenario_type: ScenarioType):
@@ -126,7 +126,7 @@ class ScenarioDetector:
         handler = self.get_scenario_handler(scenario_type)
         
         if handler is None:
-            logger.warning(f"No handler available for scenario: {scenario_type.value}")
+            logger.warning("No handler available for scenario: %s", scenario_type.value)
             # Fall back to a generic response
             if asyncio.iscoroutinefunction(bedrock_client.generate_text):
                 return await bedrock_client.generate_text(
@@ -143,7 +143,7 @@ class ScenarioDetector:
         context = context_manager.get_context(request.additional_params.get("conversation_id", ""))
         
         # Handle the scenario
-        logger.info(f"Handling scenario: {scenario_type.value} with handler: {handler.__class__.__name__}")
+        logger.info("Handling scenario: %s with handler: %s", scenario_type.value, handler.__class__.__name__)
         if asyncio.iscoroutinefunction(handler.handle):
             return await handler.handle(request, context, bedrock_client)
         else:
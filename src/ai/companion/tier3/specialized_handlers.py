@@ -92,7 +92,7 @@ class SpecializedHandler(abc.ABC):
         """
         prompt = self.create_prompt(request)
         
-        logger.debug(f"Sending prompt to Bedrock: {prompt[:100]}...")
+        logger.debug("Sending prompt to Bedrock: %s...", prompt[:100])
         
         # Get configuration from companion.yaml
         tier3_config = get_config('tier3', {})
@@ -121,7 +121,7 @@ class SpecializedHandler(abc.ABC):
         """
         prompt = self._create_scenario_prompt(request, context)
         
-        logger.debug(f"Sending prompt to Bedrock: {prompt[:100]}...")
+        logger.debug("Sending prompt to Bedrock: %s...", prompt[:100])
         
         response = bedrock_client.generate_text(
             prompt=prompt,
@@ -40,6 +40,12 @@ class Tier3Processor(Processor):
     the most expensive processor in the tiered processing framework.
     """
     
+    # Fallback messages per Bedrock error type, used when generation fails
+    _FALLBACK_BY_ERROR_TYPE = {
+        BedrockError.QUOTA_ERROR: "I'm sorry, but I've reached my limit for complex questions right now. Could you ask something simpler, or try again later?",
+    }
+    _DEFAULT_FALLBACK = "I'm sorry, I'm having trouble understanding that right now. Could you rephrase your question or ask something else?"
+    
     def __init__(
         self,
         usage_tracker: Optional[UsageTracker] = None,
@@ -89,7 +95,10 @@ class Tier3Processor(Processor):
             region_name=bedrock_config.get("region_name", "us-east-1"),
             model_id=bedrock_config.get("default_model", "amazon.nova-micro-v1:0"),
             max_tokens=bedrock_config.get("max_tokens", 512),
-            usage_tracker=usage_tracker or default_tracker
+            usage_tracker=usage_tracker or default_tracker,
+            prompt_caching=bedrock_config.get("prompt_caching", False),
+            latency_mode=bedrock_config.get("latency_mode", "optimized"),
+            max_concurrency=bedrock_config.get("max_concurrency", 8)
         )
     
     async def process(self, request: ClassifiedRequest) -> Dict[str, Any]:
@@ -102,13 +111,13 @@ class Tier3Processor(Processor):
         Returns:
             A dictionary containing the response text and processing tier
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Check if this is a known scenario that should be handled by a specialized handler
             scenario_type = self.scenario_detector.detect_scenario(request)
             if scenario_type != ScenarioType.UNKNOWN and request.complexity == ComplexityLevel.COMPLEX:
-                self.logger.info(f"Using specialized handler for scenario type: {scenario_type}")
+                self.logger.info("Using specialized handler for scenario type: %s", scenario_type)
                 try:
                     response = await self.scenario_detector.handle_scenario(
                         request, 
@@ -120,7 +129,7 @@ class Tier3Processor(Processor):
                         'processing_tier': request.processing_tier
                     }
                 except Exception as e:
-                    self.logger.error(f"Error in specialized handler: {str(e)}")
+                    self.logger.error("Error in specialized handler: %s", e)
                     # Fall back to standard processing
             
             # Create a companion request for the client
@@ -149,7 +158,7 @@ class Tier3Processor(Processor):
             player_history = []
             if player_id and self.player_history_manager:
                 player_history = self.player_history_manager.get_player_history(player_id)
-                self.logger.debug(f"Retrieved player history for {player_id}, found {len(player_history)} entries")
+                self.logger.debug("Retrieved player history for %s, found %s entries", player_id, len(player_history))
                 
                 # If we have player history, convert it to conversation history format
                 if player_history and not conversation_history:
@@ -183,12 +192,15 @@ class Tier3Processor(Processor):
             
             # Use contextual prompt with conversation history if available
             if conversation_history:
-                self.logger.debug(f"Using contextual prompt with {len(conversation_history)} history entries")
+                self.logger.debug("Using contextual prompt with %s history entries", len(conversation_history))
                 prompt = self.prompt_manager.create_contextual_prompt(request, conversation_history)
             else:
                 # If no conversation history, use the base prompt
                 prompt = base_prompt
             
+            # The persona and format rules lead every prompt, so Bedrock can cache them
+            static_prefix = self.prompt_manager.create_static_prefix(request)
+            
             # Generate a response using the Bedrock client
             try:
                 # Get configuration from companion.yaml for model parameters
@@ -202,7 +214,8 @@ class Tier3Processor(Processor):
                         model_id=bedrock_config.get("default_model", "amazon.nova-micro-v1:0"),
                         temperature=bedrock_config.get("temperature", 0.7),
                         max_tokens=bedrock_config.get("max_tokens", 512),
-                        prompt=prompt
+                        prompt=prompt,
+                        static_prefix=static_prefix
                     )
                 else:
                     # For mocked clients that don't implement async
@@ -211,7 +224,8 @@ class Tier3Processor(Processor):
                         model_id=bedrock_config.get("default_model", "amazon.nova-micro-v1:0"),
                         temperature=bedrock_config.get("temperature", 0.7),
                         max_tokens=bedrock_config.get("max_tokens", 512),
-                        prompt=prompt
+                        prompt=prompt,
+                        static_prefix=static_prefix
                     )
                 
                 # Update conversation history if a conversation ID is provided
@@ -252,18 +266,18 @@ class Tier3Processor(Processor):
                     'processing_tier': request.processing_tier
                 }
             except Exception as e:
-                self.logger.error(f"Error generating response: {str(e)}")
+                self.logger.error("Error generating response: %s", e)
                 return self._generate_fallback_response(request, e)
                 
         except Exception as e:
-            self.logger.error(f"Unexpected error in Tier3Processor: {str(e)}")
+            self.logger.error("Unexpected error in Tier3Processor: %s", e)
             return {
                 'response_text': f"I'm sorry, I'm having trouble processing your request. Error: {str(e)}",
                 'processing_tier': request.processing_tier
             }
         finally:
-            elapsed_time = time.time() - start_time
-            self.logger.info(f"Processed request {request.request_id} in {elapsed_time:.2f}s")
+            elapsed_time = time.perf_counter() - start_time
+            self.logger.info("Processed request %s in %.2fs", request.request_id, elapsed_time)
     
     def _parse_response(self, response: str) -> str:
         """
@@ -297,19 +311,10 @@ class Tier3Processor(Processor):
         Returns:
             A dictionary containing the fallback response and processing tier
         """
-        self.logger.debug(f"Generating fallback response for request {request.request_id}")
-        
-        # For quota errors, provide a specific message
-        if isinstance(error, BedrockError) and error.error_type == BedrockError.QUOTA_ERROR:
-            self.logger.info(f"Tier3 quota exceeded for request {request.request_id}. Returning quota error message.")
-            return {
-                'response_text': "I'm sorry, but I've reached my limit for complex questions right now. Could you ask something simpler, or try again later?",
-                'processing_tier': request.processing_tier
-            }
-        
-        # For other errors, provide a generic message
-        self.logger.info(f"Tier3 fallback for request {request.request_id} due to error: {str(error)}")
+        # Quota errors get a specific message; everything else gets the generic one
+        error_type = error.error_type if isinstance(error, BedrockError) else None
+        self.logger.info("Tier3 fallback for request %s (%s): %s", request.request_id, error_type, error)
         return {
-            'response_text': "I'm sorry, I'm having trouble understanding that right now. Could you rephrase your question or ask something else?",
+            'response_text': self._FALLBACK_BY_ERROR_TYPE.get(error_type, self._DEFAULT_FALLBACK),
             'processing_tier': request.processing_tier
         } 
\ No newline at end of file
@@ -202,9 +202,8 @@ class UsageTracker:
             
             # Log the usage
             logger.info(
-                f"API usage: model={model_id}, input_tokens={input_tokens}, "
-                f"output_tokens={output_tokens}, duration={duration_ms}ms, "
-                f"success={success}"
+                "API usage: model=%s, input_tokens=%s, output_tokens=%s, duration=%sms, success=%s",
+                model_id, input_tokens, output_tokens, duration_ms, success
             )
             
             # Save records if auto-save is enabled
@@ -450,10 +449,10 @@ class UsageTracker:
             with open(self.storage_path, 'w') as f:
                 json.dump(records_data, f, indent=2)
                 
-            logger.debug(f"Saved {len(self.records)} usage records to {self.storage_path}")
+            logger.debug("Saved %s usage records to %s", len(self.records), self.storage_path)
             
         except Exception as e:
-            logger.error(f"Error saving usage records: {e}")
+            logger.error("Error saving usage records: %s", e)
     
     def _load_records(self):
         """Load usage records from disk."""
@@ -464,7 +463,7 @@ class UsageTracker:
             # Check if the file exists
             storage_path = Path(self.storage_path)
             if not storage_path.exists():
-                logger.debug(f"No usage records file found at {self.storage_path}")
+                logger.debug("No usage records file found at %s", self.storage_path)
                 return
             
             # Read from file
@@ -474,10 +473,10 @@ class UsageTracker:
             # Convert dictionaries to records
             self.records = [UsageRecord.from_dict(data) for data in records_data]
             
-            logger.debug(f"Loaded {len(self.records)} usage records from {self.storage_path}")
+            logger.debug("Loaded %s usage records from %s", len(self.records), self.storage_path)
             
         except Exception as e:
-            logger.error(f"Error loading usage records: {e}")
+            logger.error("Error loading usage records: %s", e)
             self.records = []
 
 
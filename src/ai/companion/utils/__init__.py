@@ -6,6 +6,7 @@ This package contains utility modules for the companion AI system.
 
 from src.ai.companion.utils.monitoring import ProcessorMonitor
 from src.ai.companion.utils.retry import (
+    CircuitBreaker,
     RetryConfig,
     retry_async,
     retry_sync,
@@ -15,6 +16,7 @@ from src.ai.companion.utils.retry import (
 
 __all__ = [
     'ProcessorMonitor',
+    'CircuitBreaker',
     'RetryConfig',
     'retry_async',
     'retry_sync',
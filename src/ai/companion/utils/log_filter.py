@@ -49,6 +49,16 @@ class SensitiveInfoFilter(logging.Filter):
         Returns:
             True to include the record in log output, False to exclude it
         """
+        if hasattr(record, 'msg') and isinstance(record.msg, str) and record.args:
+            # Redact the formatted message: a pattern applied to the format string
+            # alone can swallow its placeholders (e.g. "input_tokens=%s"). Filters
+            # only see records that will be emitted, so this formats nothing extra.
+            try:
+                record.msg = record.getMessage()
+                record.args = ()
+            except (TypeError, ValueError):
+                pass
+        
         if hasattr(record, 'msg') and isinstance(record.msg, str):
             # Apply each pattern to the message
             for pattern, replacement in self.patterns:
@@ -9,7 +9,7 @@ to fallback mechanisms and error handling.
 import logging
 import time
 from typing import Dict, Any, Optional, List, Counter as CounterType
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
 import threading
 import json
 import os
@@ -31,6 +31,13 @@ class ProcessorMonitor:
     _instance = None
     _lock = threading.Lock()
     
+    # Response times kept per processor for the averages and percentiles;
+    # older samples are dropped so memory and summary cost stay constant
+    RESPONSE_TIME_WINDOW = 4096
+    
+    # Output lengths kept per processor and bucket for the output length percentiles
+    OUTPUT_TOKENS_WINDOW = 1024
+    
     def __new__(cls):
         """Create a new instance of the monitor if one doesn't exist."""
         with cls._lock:
@@ -53,9 +60,15 @@ class ProcessorMonitor:
             'errors': Counter(),
             'retries': Counter(),
             'fallbacks': Counter(),
-            'response_times': defaultdict(list),
+            'response_times': defaultdict(lambda: deque(maxlen=self.RESPONSE_TIME_WINDOW)),
             'success_counts': Counter(),  # Count of successful responses
-            'last_errors': defaultdict(list)
+            'last_errors': defaultdict(list),
+            'cache_hits': Counter(),
+            'inference_calls': Counter(),
+            'inference_seconds': defaultdict(float),
+            'tokens_generated': Counter(),
+            'output_tokens': defaultdict(lambda: deque(maxlen=self.OUTPUT_TOKENS_WINDOW)),
+            'queue_depth': {}
         }
     
     def track_request(self, processor_name: str, request_id: str):
@@ -68,7 +81,7 @@ class ProcessorMonitor:
         """
         with self._lock:
             self._metrics['requests'][processor_name] += 1
-            logger.debug(f"Tracked request to {processor_name}: {request_id}")
+            logger.debug("Tracked request to %s: %s", processor_name, request_id)
     
     def track_error(self, processor_name: str, error_type: str, error_message: str):
         """
@@ -91,7 +104,7 @@ class ProcessorMonitor:
             })
             self._metrics['last_errors'][error_key] = errors[-10:]  # Keep only the last 10
             
-            logger.debug(f"Tracked error from {processor_name}: {error_type} - {error_message}")
+            logger.debug("Tracked error from %s: %s - %s", processor_name, error_type, error_message)
     
     def track_retry(self, processor_name: str, retry_count: int):
         """
@@ -104,7 +117,7 @@ class ProcessorMonitor:
         with self._lock:
             retry_key = f"{processor_name}:retry_{retry_count}"
             self._metrics['retries'][retry_key] += 1
-            logger.debug(f"Tracked retry from {processor_name}: {retry_count}")
+            logger.debug("Tracked retry from %s: %s", processor_name, retry_count)
     
     def track_fallback(self, processor_name: str, fallback_type: str):
         """
@@ -117,7 +130,7 @@ class ProcessorMonitor:
         with self._lock:
             fallback_key = f"{processor_name}:{fallback_type}"
             self._metrics['fallbacks'][fallback_key] += 1
-            logger.debug(f"Tracked fallback from {processor_name}: {fallback_type}")
+            logger.debug("Tracked fallback from %s: %s", processor_name, fallback_type)
     
     def track_response_time(self, processor_name: str, response_time_ms: float):
         """
@@ -129,7 +142,7 @@ class ProcessorMonitor:
         """
         with self._lock:
             self._metrics['response_times'][processor_name].append(response_time_ms)
-            logger.debug(f"Tracked response time from {processor_name}: {response_time_ms}ms")
+            logger.debug("Tracked response time from %s: %sms", processor_name, response_time_ms)
     
     def track_success(self, processor_name: str, is_success: bool):
         """
@@ -144,7 +157,67 @@ class ProcessorMonitor:
             if is_success:
                 self._metrics['success_counts'][processor_name] += 1
             
-            logger.debug(f"Tracked {'successful' if is_success else 'failed'} response from {processor_name}")
+            logger.debug("Tracked %s response from %s", 'successful' if is_success else 'failed', processor_name)
+    
+    def track_cache_hit(self, processor_name: str, cache_type: str):
+        """
+        Track a response served from a cache.
+        
+        Args:
+            processor_name: The name of the processor (e.g., 'tier1', 'tier2')
+            cache_type: The cache that served the response (e.g., 'exact', 'semantic')
+        """
+        with self._lock:
+            self._metrics['cache_hits'][f"{processor_name}:{cache_type}"] += 1
+    
+    def track_inference(self, processor_name: str, duration_seconds: float, tokens: int, bucket: Optional[str] = None):
+        """
+        Track a single model call.
+        
+        Args:
+            processor_name: The name of the processor (e.g., 'tier1', 'tier2')
+            duration_seconds: How long the call took, including any queueing
+            tokens: The number of tokens generated
+            bucket: Group to record the output length under for get_p95_output_tokens
+                (e.g., the request complexity and intent), or None to not record it,
+                such as for output cut off at the max_tokens limit
+        """
+        with self._lock:
+            self._metrics['inference_calls'][processor_name] += 1
+            self._metrics['inference_seconds'][processor_name] += duration_seconds
+            self._metrics['tokens_generated'][processor_name] += tokens
+            if bucket is not None:
+                self._metrics['output_tokens'][f"{processor_name}:{bucket}"].append(tokens)
+    
+    def get_p95_output_tokens(self, processor_name: str, bucket: str, min_samples: int = 50) -> Optional[int]:
+        """
+        Get the 95th percentile of recent output lengths for a bucket.
+        
+        Args:
+            processor_name: The name of the processor (e.g., 'tier1', 'tier2')
+            bucket: The bucket passed to track_inference
+            min_samples: Number of samples needed before a percentile is reported
+            
+        Returns:
+            The 95th percentile output length in tokens, or None if there are too few samples
+        """
+        with self._lock:
+            samples = self._metrics['output_tokens'].get(f"{processor_name}:{bucket}")
+            if not samples or len(samples) < min_samples:
+                return None
+            samples_sorted = sorted(samples)
+        return samples_sorted[min(int(len(samples_sorted) * 0.95), len(samples_sorted) - 1)]
+    
+    def set_queue_depth(self, processor_name: str, depth: int):
+        """
+        Record the number of model calls waiting or in flight.
+        
+        Args:
+            processor_name: The name of the processor (e.g., 'tier1', 'tier2')
+            depth: The current queue depth
+        """
+        with self._lock:
+            self._metrics['queue_depth'][processor_name] = depth
     
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -193,6 +266,16 @@ class ProcessorMonitor:
             
             metrics['avg_response_time_ms'] = avg_response_times
             
+            # Inference throughput
+            metrics['cache_hits'] = dict(self._metrics['cache_hits'])
+            metrics['queue_depth'] = dict(self._metrics['queue_depth'])
+            metrics['tokens_generated'] = dict(self._metrics['tokens_generated'])
+            metrics['tokens_per_second'] = {
+                processor: tokens / self._metrics['inference_seconds'][processor]
+                for processor, tokens in self._metrics['tokens_generated'].items()
+                if self._metrics['inference_seconds'][processor] > 0
+            }
+            
             return metrics
     
     def save_metrics(self):
@@ -0,0 +1,72 @@
+"""
+Tokyo Train Station Adventure - Request Context
+
+This module tracks the companion request currently being processed in a
+context variable. Each asyncio task sees its own value, so code running on
+behalf of a request (logging, tracing, monitoring) can find it without the
+request being passed through every helper.
+"""
+
+import logging
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_request: ContextVar[Optional[Any]] = ContextVar("companion_request", default=None)
+
+
+def set_current_request(request: Any) -> Token:
+    """
+    Mark a request as the one being processed in the current context.
+
+    Args:
+        request: The request being processed
+
+    Returns:
+        A token for restoring the previous value with reset_current_request
+    """
+    return _current_request.set(request)
+
+
+def reset_current_request(token: Token) -> None:
+    """
+    Restore the request that was current before set_current_request.
+
+    Args:
+        token: The token returned by set_current_request
+    """
+    _current_request.reset(token)
+
+
+def get_current_request() -> Optional[Any]:
+    """
+    Get the request being processed in the current context.
+
+    Returns:
+        The current request, or None outside of request processing
+    """
+    return _current_request.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    A logging filter that adds the current request's ID to log records.
+
+    The ID is available to formatters as ``%(request_id)s`` and is "-" when
+    no request is being processed.
+    """
+
+    def filter(self, record):
+        """
+        Add the request_id attribute to a log record.
+
+        Args:
+            record: The log record to filter
+
+        Returns:
+            Always True; records are never excluded
+        """
+        request = _current_request.get()
+        record.request_id = getattr(request, "request_id", None) or "-"
+        return True
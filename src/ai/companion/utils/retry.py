@@ -34,7 +34,9 @@ class RetryConfig:
         jitter: bool = True,
         jitter_factor: float = 0.25,
         retry_exceptions: Optional[List[Type[Exception]]] = None,
-        retry_on: Optional[Callable[[Exception], bool]] = None
+        retry_on: Optional[Callable[[Exception], bool]] = None,
+        full_jitter: bool = False,
+        rng: Optional[random.Random] = None
     ):
         """
         Initialize the retry configuration.
@@ -48,6 +50,8 @@ class RetryConfig:
             jitter_factor: Factor by which to vary the delay (0.25 = ±25%)
             retry_exceptions: List of exception types to retry on
             retry_on: Function that takes an exception and returns True if it should be retried
+            full_jitter: Draw the whole delay from [0, backoff delay] instead of varying it by jitter_factor
+            rng: Random number generator for jitter (defaults to the random module; inject a seeded one in tests)
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
@@ -57,6 +61,8 @@ class RetryConfig:
         self.jitter_factor = jitter_factor
         self.retry_exceptions = retry_exceptions or []
         self.retry_on = retry_on
+        self.full_jitter = full_jitter
+        self.rng = rng
     
     def should_retry(self, exception: Exception, attempt: int) -> bool:
         """
@@ -100,9 +106,13 @@ class RetryConfig:
         delay = min(delay, self.max_delay)
         
         # Add jitter if enabled
-        if self.jitter:
+        rng = self.rng or random
+        if self.jitter and self.full_jitter:
+            # "Full jitter": spreads retries evenly over the whole backoff window
+            delay = rng.uniform(0, delay)
+        elif self.jitter:
             jitter_range = delay * self.jitter_factor
-            delay = delay + random.uniform(-jitter_range, jitter_range)
+            delay = delay + rng.uniform(-jitter_range, jitter_range)
             
             # Ensure the delay is not negative
             delay = max(delay, 0.001)
@@ -110,6 +120,64 @@ class RetryConfig:
         return delay
 
 
+class CircuitBreaker:
+    """
+    Circuit breaker for a dependency that can go down.
+    
+    After failure_threshold consecutive failures the circuit opens and calls
+    should not be attempted, so an outage fails fast instead of every caller
+    paying for its own retries. Each time the cooldown passes, one trial call
+    is let through: if it succeeds the circuit closes, otherwise it stays open.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds between trial calls while the circuit is open
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is open."""
+        return self.opened_at is not None
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be attempted.
+        
+        Returns:
+            True if the circuit is closed, or if this call is the next trial call
+        """
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        # Restart the cooldown so only this call gets through as the trial
+        self.opened_at = time.monotonic()
+        return True
+    
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        if self.opened_at is not None:
+            logger.info("Circuit closed after a successful call")
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit once the threshold is reached."""
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            logger.warning("Circuit opened after %d consecutive failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
 async def retry_async(
     func: Callable[..., Any],
     *args: Any,
@@ -2,10 +2,69 @@
 API package for the Tokyo Train Station Adventure game.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from src.api.routers import api_router
 from src.api.middleware import setup_middleware
 
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_models(app: FastAPI) -> None:
+    """
+    Preload the Tier 2 models in the background so the first request doesn't pay the load cost.
+    
+    Args:
+        app: The FastAPI application
+    """
+    from src.ai.companion.config import get_config
+    from src.ai.companion.core.models import ProcessingTier
+    from src.ai.companion.core.processor_framework import ProcessorFactory
+    
+    tier2_config = get_config('tier2', {}) or {}
+    if not tier2_config.get('enabled', True) or not tier2_config.get('warmup_on_startup', False):
+        return
+    
+    try:
+        processor = ProcessorFactory().get_processor(ProcessingTier.TIER_2)
+    except ValueError as e:
+        logger.warning("Skipping model warm-up: %s", e)
+        return
+    
+    app.state.warmup_task = asyncio.create_task(processor.warmup())
+
+
+async def close_processors(app: FastAPI) -> None:
+    """
+    Stop the warm-up task and close the processors' connections on shutdown.
+    
+    Args:
+        app: The FastAPI application
+    """
+    from src.ai.companion.core.processor_framework import ProcessorFactory
+    
+    warmup_task = getattr(app.state, 'warmup_task', None)
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    
+    await ProcessorFactory.close_processors()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run application startup and shutdown tasks.
+    
+    Args:
+        app: The FastAPI application
+    """
+    await warm_up_models(app)
+    yield
+    await close_processors(app)
+
 
 def create_app() -> FastAPI:
     """
@@ -21,7 +80,8 @@ def create_app() -> FastAPI:
         version="0.1.0",
         docs_url="/api/docs",
         redoc_url="/api/redoc",
-        openapi_url="/api/openapi.json"
+        openapi_url="/api/openapi.json",
+        lifespan=lifespan
     )
     
     # Set up middleware
@@ -41,4 +101,16 @@ def create_app() -> FastAPI:
         """
         return {"status": "ok"}
     
+    # Expose the processor metrics (request counts, latency, cache hits, throughput)
+    @app.get("/metrics")
+    async def metrics():
+        """
+        Metrics endpoint.
+        
+        Returns:
+            The current processor metrics
+        """
+        from src.ai.companion.utils.monitoring import ProcessorMonitor
+        return ProcessorMonitor().get_metrics()
+    
     return app 
\ No newline at end of file
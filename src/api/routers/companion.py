@@ -2,11 +2,13 @@
 Router for companion-related endpoints.
 """
 
+import contextlib
 import logging
 import uuid
 import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from src.api.models.companion_assist import CompanionAssistRequest, CompanionAssistResponse
 from src.api.adapters.base import AdapterFactory
@@ -43,18 +45,18 @@ async def companion_assist(request: CompanionAssistRequest):
     try:
         # Log the incoming request
         request_id = str(uuid.uuid4())
-        logger.info(f"Received companion assist request for player {request.playerId} (request_id: {request_id})")
-        logger.debug(f"Request details - type: {request.request.type}, text: {request.request.text}, location: {request.gameContext.location}")
+        logger.info("Received companion assist request for player %s (request_id: %s)", request.playerId, request_id)
+        logger.debug("Request details - type: %s, text: %s, location: %s", request.request.type, request.request.text, request.gameContext.location)
         
         # Get the request adapter
-        logger.debug(f"Getting request adapter for companion_assist (request_id: {request_id})")
+        logger.debug("Getting request adapter for companion_assist (request_id: %s)", request_id)
         request_adapter = AdapterFactory.get_request_adapter("companion_assist")
         if not request_adapter:
-            logger.error(f"Request adapter not found for companion_assist (request_id: {request_id})")
+            logger.error("Request adapter not found for companion_assist (request_id: %s)", request_id)
             raise HTTPException(status_code=500, detail="Request adapter not found")
         
         # Transform the request to internal format
-        logger.debug(f"Adapting request to internal format (request_id: {request_id})")
+        logger.debug("Adapting request to internal format (request_id: %s)", request_id)
         internal_request = request_adapter.adapt(request)
         
         # Add player history to the request's additional_params
@@ -68,15 +70,15 @@ async def companion_assist(request: CompanionAssistRequest):
         if hasattr(request, 'conversationId') and request.conversationId:
             internal_request.additional_params["conversation_id"] = request.conversationId
             
-        logger.debug(f"Internal request created with ID: {internal_request.request_id}")
+        logger.debug("Internal request created with ID: %s", internal_request.request_id)
         
         # Process the request
         try:
             # Try to import and use the actual process_companion_request function
-            logger.debug(f"Attempting to process request with companion AI (request_id: {request_id})")
+            logger.debug("Attempting to process request with companion AI (request_id: %s)", request_id)
             from src.ai.companion import process_companion_request
             internal_response = await process_companion_request(internal_request)
-            logger.debug(f"Successfully processed request with companion AI (request_id: {request_id})")
+            logger.debug("Successfully processed request with companion AI (request_id: %s)", request_id)
             
             # Store the interaction in player history
             player_history_manager.add_interaction(
@@ -94,7 +96,7 @@ async def companion_assist(request: CompanionAssistRequest):
         except (ImportError, TypeError) as e:
             # If the function is not available or not properly implemented,
             # create a mock response for testing
-            logger.warning(f"Using mock response for companion assist request due to error: {str(e)} (request_id: {request_id})")
+            logger.warning("Using mock response for companion assist request due to error: %s (request_id: %s)", e, request_id)
             from src.ai.companion.core.models import CompanionResponse, IntentCategory, ProcessingTier
             internal_response = CompanionResponse(
                 request_id=internal_request.request_id,
@@ -138,28 +140,93 @@ async def companion_assist(request: CompanionAssistRequest):
             )
         
         # Get the response adapter
-        logger.debug(f"Getting response adapter for companion_assist (request_id: {request_id})")
+        logger.debug("Getting response adapter for companion_assist (request_id: %s)", request_id)
         response_adapter = AdapterFactory.get_response_adapter("companion_assist")
         if not response_adapter:
-            logger.error(f"Response adapter not found for companion_assist (request_id: {request_id})")
+            logger.error("Response adapter not found for companion_assist (request_id: %s)", request_id)
             raise HTTPException(status_code=500, detail="Response adapter not found")
         
         # Transform the response to API format
-        logger.debug(f"Adapting internal response to API format (request_id: {request_id})")
+        logger.debug("Adapting internal response to API format (request_id: %s)", request_id)
         api_response = response_adapter.adapt(internal_response)
         
         # Log the response
-        logger.info(f"Processed companion assist request for player {request.playerId} (request_id: {request_id})")
-        logger.debug(f"Response details - dialogue length: {len(api_response.dialogue.text)}, processing tier: {api_response.meta.processingTier}")
+        logger.info("Processed companion assist request for player %s (request_id: %s)", request.playerId, request_id)
+        logger.debug("Response details - dialogue length: %s, processing tier: %s", len(api_response.dialogue.text), api_response.meta.processingTier)
         
         return api_response
         
     except Exception as e:
         # Log the error
-        logger.error(f"Error processing companion assist request: {str(e)}", exc_info=True)
+        logger.error("Error processing companion assist request: %s", e, exc_info=True)
         
         # Raise an HTTP exception
         raise HTTPException(
             status_code=500,
             detail=f"Error processing companion assist request: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.post("/assist/stream")
+async def companion_assist_stream(request: CompanionAssistRequest):
+    """
+    Stream the companion's dialogue as server-sent events.
+    
+    Each chunk of dialogue text is sent as soon as it is generated, as a
+    ``data`` event with the JSON body ``{"text": ...}``. The stream ends with
+    a ``done`` event carrying the request ID, or an ``error`` event if
+    processing failed.
+    
+    Args:
+        request: The companion assist request
+        
+    Returns:
+        A text/event-stream response
+    """
+    request_adapter = AdapterFactory.get_request_adapter("companion_assist")
+    if not request_adapter:
+        logger.error("Request adapter not found for companion_assist")
+        raise HTTPException(status_code=500, detail="Request adapter not found")
+    
+    internal_request = request_adapter.adapt(request)
+    player_id = request.playerId
+    internal_request.additional_params["player_history"] = player_history_manager.get_player_history(player_id)
+    internal_request.additional_params["player_id"] = player_id
+    internal_request.additional_params["session_id"] = request.sessionId
+    if request.conversationId:
+        internal_request.additional_params["conversation_id"] = request.conversationId
+    
+    logger.info("Received streaming companion assist request for player %s (request_id: %s)",
+                player_id, internal_request.request_id)
+    
+    async def events():
+        from src.ai.companion import stream_companion_request
+        
+        chunks = []
+        try:
+            # A client disconnect closes events(); aclosing passes that on to the
+            # companion stream at once, so generation stops with the response
+            async with contextlib.aclosing(stream_companion_request(internal_request)) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield f"data: {json.dumps({'text': chunk}, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error("Error streaming companion assist request: %s", e, exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        
+        player_history_manager.add_interaction(
+            player_id=player_id,
+            user_query=request.request.text or "",
+            assistant_response="".join(chunks),
+            session_id=request.sessionId,
+            metadata={
+                "location": request.gameContext.location,
+                "request_type": request.request.type,
+                "language": request.request.language if request.request.language else "english",
+                "streamed": True
+            }
+        )
+        yield f"event: done\ndata: {json.dumps({'requestId': internal_request.request_id})}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
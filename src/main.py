@@ -30,21 +30,29 @@ logging_config = {
             "datefmt": "%Y-%m-%d %H:%M:%S"
         },
         "detailed": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s",
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - [%(request_id)s] %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S"
         }
     },
+    "filters": {
+        # Adds the ID of the companion request being processed to each record
+        "request_id": {
+            "()": "src.ai.companion.utils.request_context.RequestIdFilter"
+        }
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "level": "DEBUG",
             "formatter": "detailed",
+            "filters": ["request_id"],
             "stream": "ext://sys.stdout"
         },
         "file": {
             "class": "logging.handlers.RotatingFileHandler",
             "level": "DEBUG",
             "formatter": "detailed",
+            "filters": ["request_id"],
             "filename": log_file_path,
             "maxBytes": 10485760,  # 10MB
             "backupCount": 5
@@ -0,0 +1,43 @@
+"""
+Tests for the player history manager.
+"""
+
+import json
+import threading
+
+from src.ai.companion.core.player_history_manager import PlayerHistoryManager
+
+
+class TestPlayerHistoryManager:
+    """Tests for the PlayerHistoryManager class."""
+
+    def test_add_interaction_persists(self, tmp_path):
+        """An interaction is kept in memory and written to the player's file."""
+        manager = PlayerHistoryManager(storage_dir=str(tmp_path))
+
+        manager.add_interaction("player1", "Where is the ticket gate?", "Straight ahead!", session_id="s1")
+
+        history = manager.get_player_history("player1")
+        assert [entry["user_query"] for entry in history] == ["Where is the ticket gate?"]
+        with open(tmp_path / "player1.json", encoding="utf-8") as f:
+            assert json.load(f)["entries"][0]["session_id"] == "s1"
+
+    def test_concurrent_writes_keep_every_entry(self, tmp_path):
+        """Interactions added from several threads are all kept, and the file stays valid JSON."""
+        manager = PlayerHistoryManager(storage_dir=str(tmp_path))
+        start = threading.Barrier(8)
+
+        def add(worker: int) -> None:
+            start.wait()
+            for i in range(25):
+                manager.add_interaction("player1", f"query {worker}-{i}", "response")
+
+        threads = [threading.Thread(target=add, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(manager.get_player_history("player1", max_entries=1000)) == 200
+        with open(tmp_path / "player1.json", encoding="utf-8") as f:
+            assert len(json.load(f)["entries"]) == 200
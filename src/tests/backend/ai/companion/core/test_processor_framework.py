@@ -409,4 +409,28 @@ class TestProcessorFactory:
                 factory.get_processor(ProcessingTier.TIER_1)
                 
             # Verify the error message
-            assert "disabled in configuration" in str(excinfo.value) 
\ No newline at end of file
+            assert "disabled in configuration" in str(excinfo.value)
+    
+    @pytest.mark.asyncio
+    async def test_close_processors(self):
+        """Test that cached processors with an async close() are closed, even if one fails."""
+        from src.ai.companion.core.processor_framework import ProcessorFactory
+        
+        ProcessorFactory.clear_cache()
+        failing = MagicMock()
+        failing.close = AsyncMock(side_effect=RuntimeError("boom"))
+        closing = MagicMock()
+        closing.close = AsyncMock()
+        ProcessorFactory._processors = {
+            ProcessingTier.TIER_2: failing,
+            ProcessingTier.TIER_3: closing,
+            ProcessingTier.TIER_1: object()
+        }
+        
+        try:
+            await ProcessorFactory.close_processors()
+        finally:
+            ProcessorFactory.clear_cache()
+        
+        failing.close.assert_awaited_once()
+        closing.close.assert_awaited_once()
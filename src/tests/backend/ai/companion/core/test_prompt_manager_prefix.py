@@ -0,0 +1,63 @@
+"""
+Tests for the static prefix / dynamic suffix layout of PromptManager prompts.
+"""
+
+from src.ai.companion.core.models import ClassifiedRequest, IntentCategory, ComplexityLevel, ProcessingTier
+from src.ai.companion.core.prompt_manager import PromptManager
+
+
+def _make_request(player_input: str) -> ClassifiedRequest:
+    """Create a classified vocabulary request with the given input."""
+    return ClassifiedRequest(
+        request_id=f"req-{player_input}",
+        player_input=player_input,
+        request_type="vocabulary",
+        intent=IntentCategory.VOCABULARY_HELP,
+        complexity=ComplexityLevel.SIMPLE,
+        processing_tier=ProcessingTier.TIER_2,
+        confidence=0.9,
+        extracted_entities={"word": player_input}
+    )
+
+
+class TestPromptManagerPrefix:
+    """Tests for prompt prefix stability."""
+
+    def test_prompts_share_static_prefix(self):
+        """Requests with the same intent produce byte-identical prompt prefixes."""
+        manager = PromptManager()
+        first = manager.create_prompt(_make_request("norikae"))
+        second = manager.create_prompt(_make_request("eki"))
+
+        prefix = manager.create_static_prefix(_make_request("densha"))
+        assert first.startswith(prefix)
+        assert second.startswith(prefix)
+        assert "norikae" not in prefix
+
+    def test_player_input_is_in_suffix(self):
+        """Per-request fields are placed after the static prefix."""
+        manager = PromptManager()
+        request = _make_request("norikae")
+        prompt = manager.create_prompt(request)
+
+        assert prompt.index("VOCABULARY RESPONSE FORMAT") < prompt.index('The player has asked: "norikae"')
+        assert prompt.endswith(manager.create_dynamic_suffix(request))
+
+    def test_intents_share_persona_module(self):
+        """Requests with different intents share the persona and instructions prefix."""
+        manager = PromptManager()
+        vocabulary = _make_request("norikae")
+        grammar = _make_request("norikae")
+        grammar.intent = IntentCategory.GRAMMAR_EXPLANATION
+
+        shared = manager._get_shared_prompt_module(vocabulary)
+        assert manager.create_static_prefix(vocabulary).startswith(shared)
+        assert manager.create_static_prefix(grammar).startswith(shared)
+        assert manager.create_static_prefix(vocabulary) != manager.create_static_prefix(grammar)
+
+    def test_template_indentation_is_stripped(self):
+        """Indentation from triple-quoted templates doesn't reach the prompt."""
+        manager = PromptManager()
+        prompt = manager.create_prompt(_make_request("norikae"))
+
+        assert all(line == line.strip() and line for line in prompt.split("\n"))
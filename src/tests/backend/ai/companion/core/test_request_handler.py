@@ -118,6 +118,68 @@ class TestRequestHandler:
         # Check that the response formatter was called
         mock_response_formatter.format_response.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_handle_request_stream_uses_streaming_processor(self, mock_intent_classifier, mock_processor_factory, mock_response_formatter):
+        """Test that a processor with process_stream streams its chunks unformatted."""
+        class StreamingProcessor:
+            async def process_stream(self, request):
+                yield "切符 "
+                yield "means ticket."
+        
+        mock_processor_factory.get_processor.return_value = StreamingProcessor()
+        handler = RequestHandler(
+            intent_classifier=mock_intent_classifier,
+            processor_factory=mock_processor_factory,
+            response_formatter=mock_response_formatter
+        )
+        request = CompanionRequest(request_id="stream-1", player_input="What does 切符 mean?", request_type="vocabulary")
+        
+        chunks = [chunk async for chunk in handler.handle_request_stream(request)]
+        
+        assert chunks == ["切符 ", "means ticket."]
+        mock_response_formatter.format_response.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_handle_request_stream_closes_processor_stream(self, mock_intent_classifier, mock_processor_factory, mock_response_formatter):
+        """Test that closing the stream early closes the processor's stream right away."""
+        closed = []
+        
+        class StreamingProcessor:
+            async def process_stream(self, request):
+                try:
+                    yield "切符 "
+                    yield "means ticket."
+                finally:
+                    closed.append(request.request_id)
+        
+        mock_processor_factory.get_processor.return_value = StreamingProcessor()
+        handler = RequestHandler(
+            intent_classifier=mock_intent_classifier,
+            processor_factory=mock_processor_factory,
+            response_formatter=mock_response_formatter
+        )
+        request = CompanionRequest(request_id="stream-3", player_input="What does 切符 mean?", request_type="vocabulary")
+        
+        stream = handler.handle_request_stream(request)
+        assert await stream.__anext__() == "切符 "
+        await stream.aclose()
+        
+        assert closed == ["stream-3"]
+    
+    @pytest.mark.asyncio
+    async def test_handle_request_stream_without_streaming_processor(self, mock_intent_classifier, mock_processor_factory, mock_response_formatter):
+        """Test that other processors yield the formatted response as one chunk."""
+        handler = RequestHandler(
+            intent_classifier=mock_intent_classifier,
+            processor_factory=mock_processor_factory,
+            response_formatter=mock_response_formatter
+        )
+        request = CompanionRequest(request_id="stream-2", player_input="What does 切符 mean?", request_type="vocabulary")
+        
+        chunks = [chunk async for chunk in handler.handle_request_stream(request)]
+        
+        assert chunks == ["Formatted response."]
+    
     @pytest.mark.asyncio
     async def test_handle_request_with_conversation_context(self, mock_intent_classifier, mock_processor_factory, mock_response_formatter):
         """Test handling a request with conversation context."""
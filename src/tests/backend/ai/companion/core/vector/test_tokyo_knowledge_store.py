@@ -270,6 +270,23 @@ class TestTokyoKnowledgeStore:
         # Results should be sorted by importance, so high importance first
         assert results[0]['metadata']['importance'] == "high"
     
+    def test_contextual_search_reuses_location_search(self, chroma_mock, sample_request):
+        """Test that the location-only search is run once per location."""
+        from src.ai.companion.core.vector.tokyo_knowledge_store import TokyoKnowledgeStore
+        
+        # Create a store
+        store = TokyoKnowledgeStore()
+        store.search = MagicMock(return_value=[])
+        
+        # Search twice from the same location
+        store.contextual_search(sample_request)
+        store.contextual_search(sample_request)
+        
+        # The enhanced query is searched each time, the location query only once
+        queries = [call[0][0] for call in store.search.call_args_list]
+        assert len(queries) == 3
+        assert sum("in Tokyo Station" in query for query in queries) == 1
+    
     def test_filtering_by_type(self, chroma_mock):
         """Test filtering search results by document type."""
         from src.ai.companion.core.vector.tokyo_knowledge_store import TokyoKnowledgeStore
@@ -0,0 +1,72 @@
+"""
+Tests for the Tier 2 fast path responder.
+"""
+
+from src.ai.companion.core.models import (
+    CompanionRequest,
+    ClassifiedRequest,
+    IntentCategory,
+    ComplexityLevel,
+    ProcessingTier
+)
+from src.ai.companion.tier2.fast_path import FastPathResponder
+
+
+def make_request(player_input, intent=IntentCategory.GENERAL_HINT, complexity=ComplexityLevel.SIMPLE):
+    """Create a classified request for testing."""
+    request = CompanionRequest(
+        request_id="test-fast-path",
+        player_input=player_input,
+        request_type="general"
+    )
+    return ClassifiedRequest.from_companion_request(
+        request=request,
+        intent=intent,
+        complexity=complexity,
+        processing_tier=ProcessingTier.TIER_2,
+        confidence=0.9
+    )
+
+
+class TestFastPathResponder:
+    """Tests for the FastPathResponder class."""
+
+    def test_answers_small_talk(self):
+        """Greetings, thanks and yes/no replies are answered from templates."""
+        responder = FastPathResponder()
+
+        assert "こんにちは" in responder.try_match(make_request("Hello!"))
+        assert "どういたしまして" in responder.try_match(make_request("thank you"))
+        assert "はい" in responder.try_match(make_request("Yes."))
+        assert "いいえ" in responder.try_match(make_request("no thanks"))
+
+    def test_only_whole_utterances_match(self):
+        """Inputs that merely contain a greeting still go to the LLM."""
+        responder = FastPathResponder()
+
+        assert responder.try_match(make_request("Hello, how do I say ticket in Japanese?")) is None
+        assert responder.try_match(make_request("What does kippu mean?")) is None
+
+    def test_non_simple_requests_are_not_matched(self):
+        """Only SIMPLE requests are eligible for the fast path."""
+        responder = FastPathResponder()
+
+        assert responder.try_match(make_request("Hello", complexity=ComplexityLevel.MODERATE)) is None
+
+    def test_direction_lookup(self):
+        """Direction questions about known places are answered from the static map."""
+        responder = FastPathResponder()
+        intent = IntentCategory.DIRECTION_GUIDANCE
+
+        assert "切符売り場" in responder.try_match(make_request("Where are the ticket machines?", intent))
+        assert "出口" in responder.try_match(make_request("where is the exit", intent))
+        assert responder.try_match(make_request("How do I get to platform 3?", intent)) is None
+
+    def test_intent_map_rules(self):
+        """Rules from the intent map only apply to their intent."""
+        responder = FastPathResponder(intent_map={
+            IntentCategory.VOCABULARY_HELP: [(r"what does eki mean", "Eki (駅) means station.")]
+        })
+
+        assert responder.try_match(make_request("What does eki mean?", IntentCategory.VOCABULARY_HELP)) == "Eki (駅) means station."
+        assert responder.try_match(make_request("What does eki mean?")) is None
@@ -0,0 +1,122 @@
+"""
+Tests for the in-process llama.cpp client.
+
+llama-cpp-python is optional, so these tests install a fake llama_cpp module.
+"""
+
+import sys
+import time
+import asyncio
+import types
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.ai.companion.core.models import CompanionRequest
+from src.ai.companion.tier2.ollama_client import OllamaError
+
+
+@pytest.fixture
+def fake_llama_cpp():
+    """Install a fake llama_cpp module whose models echo a fixed completion."""
+    module = types.ModuleType("llama_cpp")
+    llm = MagicMock()
+    llm.create_completion.return_value = {"choices": [{"text": "<think>hmm</think> ひだり (hidari) means left."}]}
+    module.Llama = MagicMock(return_value=llm)
+    with patch.dict(sys.modules, {"llama_cpp": module}):
+        yield module
+
+
+@pytest.fixture
+def sample_request():
+    """Create a sample request for testing."""
+    return CompanionRequest(
+        request_id="test-123",
+        player_input="How do I say left?",
+        request_type="vocabulary"
+    )
+
+
+class TestLlamaCppClient:
+    """Tests for the LlamaCppClient class."""
+
+    @pytest.mark.asyncio
+    async def test_generate_loads_model_once(self, fake_llama_cpp, sample_request):
+        """Models are loaded on first use and reused afterwards."""
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+
+        client = LlamaCppClient(model_paths={"tiny": "/models/tiny.gguf"})
+
+        first = await client.generate(sample_request, prompt="Say left")
+        second = await client.generate(sample_request, model="tiny", prompt="Say left")
+
+        assert first == second == "ひだり (hidari) means left."
+        fake_llama_cpp.Llama.assert_called_once()
+        assert fake_llama_cpp.Llama.call_args.kwargs["model_path"] == "/models/tiny.gguf"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_uses_load_model_once(self, fake_llama_cpp, sample_request):
+        """A preload and a generate racing on a cold model load it only once."""
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+
+        llm = fake_llama_cpp.Llama.return_value
+
+        def slow_load(**kwargs):
+            time.sleep(0.05)
+            return llm
+
+        fake_llama_cpp.Llama.side_effect = slow_load
+        client = LlamaCppClient(model_paths={"tiny": "/models/tiny.gguf"})
+
+        await asyncio.gather(client.preload_model(), client.generate(sample_request, prompt="Say left"))
+
+        fake_llama_cpp.Llama.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_embed_uses_embedding_instance(self, fake_llama_cpp, sample_request):
+        """Embeddings come from an instance loaded with embedding=True, separate from completions."""
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+
+        fake_llama_cpp.Llama.return_value.embed.return_value = [0.1, 0.2]
+        client = LlamaCppClient(model_paths={"tiny": "/models/tiny.gguf"})
+
+        await client.generate(sample_request, prompt="Say left")
+        embedding = await client.embed("How do I say left?", model="nomic-embed-text")
+
+        assert embedding == [0.1, 0.2]
+        assert [call.kwargs["embedding"] for call in fake_llama_cpp.Llama.call_args_list] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_is_a_model_error(self, fake_llama_cpp, sample_request):
+        """Unmapped model names raise a model error so Tier 2 can fall back."""
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+
+        client = LlamaCppClient(model_paths={"tiny": "/models/tiny.gguf"})
+
+        with pytest.raises(OllamaError) as excinfo:
+            await client.generate(sample_request, model="huge", prompt="Say left")
+
+        assert excinfo.value.error_type == OllamaError.MODEL_ERROR
+
+    @pytest.mark.asyncio
+    async def test_closing_a_stream_early_stops_decoding(self, fake_llama_cpp, sample_request):
+        """Closing the stream stops the completion and frees the model for other requests."""
+        from src.ai.companion.tier2.llama_cpp_client import LlamaCppClient
+
+        produced = []
+
+        def stream_parts(**kwargs):
+            for i in range(500):
+                produced.append(i)
+                yield {"choices": [{"text": f"word{i} "}]}
+                time.sleep(0.01)
+
+        fake_llama_cpp.Llama.return_value.create_completion.side_effect = stream_parts
+        client = LlamaCppClient(model_paths={"tiny": "/models/tiny.gguf"})
+
+        stream = client.generate_stream(sample_request, prompt="Say left")
+        assert await stream.__anext__() == "word0 "
+        await stream.aclose()
+
+        assert len(produced) < 500
+        assert not client._lock_for("tiny").locked()
@@ -7,6 +7,7 @@ to interact with local language models.
 
 import pytest
 import json
+import asyncio
 from unittest.mock import patch, MagicMock, AsyncMock
 import time
 
@@ -502,4 +503,145 @@ class TestOllamaClient:
             request_type="translation"
         )
         hash4 = client._hash_request(different_request, "llama3")
-        assert hash1 != hash4 
\ No newline at end of file
+        assert hash1 != hash4 
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self):
+        """Test that API calls share one persistent HTTP session until closed."""
+        from src.ai.companion.tier2.ollama_client import OllamaClient
+        
+        client = OllamaClient(cache_enabled=False)
+        
+        with patch('src.ai.companion.tier2.ollama_client.aiohttp.ClientSession') as mock_session_class, \
+             patch('src.ai.companion.tier2.ollama_client.aiohttp.TCPConnector'):
+            mock_session_class.side_effect = lambda **kwargs: MagicMock(closed=False, close=AsyncMock())
+            
+            first = await client._get_session()
+            second = await client._get_session()
+            assert first is second
+            assert mock_session_class.call_count == 1
+            
+            # Closing drops the session so the next call opens a new one
+            await client.close()
+            first.close.assert_awaited_once()
+            
+            third = await client._get_session()
+            assert third is not first
+            assert mock_session_class.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_preload_model_sends_empty_generate(self):
+        """Test that preloading posts a prompt-less generate call with keep_alive."""
+        from src.ai.companion.tier2.ollama_client import OllamaClient
+        
+        client = OllamaClient(cache_enabled=False, keep_alive="30m")
+        
+        mock_response = MagicMock(status=200)
+        mock_response.read = AsyncMock(return_value=b"{}")
+        mock_session = MagicMock()
+        mock_session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        
+        with patch.object(client, '_get_session', AsyncMock(return_value=mock_session)):
+            await client.preload_model("llama3")
+        
+        mock_session.post.assert_called_once_with(
+            "http://localhost:11434/api/generate",
+            json={"model": "llama3", "keep_alive": "30m"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_call_api_sends_num_keep(self):
+        """Test that num_keep is sent as an option only when given."""
+        from src.ai.companion.tier2.ollama_client import OllamaClient
+        
+        client = OllamaClient(cache_enabled=False)
+        
+        mock_response = MagicMock(status=200, headers={"content-type": "application/json"})
+        mock_response.text = AsyncMock(return_value=json.dumps({"response": "Hello, welcome to Tokyo Station!"}))
+        mock_session = MagicMock()
+        mock_session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        
+        with patch.object(client, '_get_session', AsyncMock(return_value=mock_session)):
+            await client._call_ollama_api("prompt", "llama3", 0.7, 100, num_keep=256)
+            await client._call_ollama_api("prompt", "llama3", 0.7, 100)
+        
+        first_options = mock_session.post.call_args_list[0].kwargs["json"]["options"]
+        second_options = mock_session.post.call_args_list[1].kwargs["json"]["options"]
+        assert first_options["num_keep"] == 256
+        assert "num_keep" not in second_options
+
+    @pytest.mark.asyncio
+    async def test_call_api_times_out(self):
+        """Test that the request deadline is sent to aiohttp and its expiry is a timeout error."""
+        from src.ai.companion.tier2.ollama_client import OllamaClient, OllamaError
+        
+        client = OllamaClient(cache_enabled=False, request_timeout=5)
+        
+        mock_session = MagicMock()
+        mock_session.post.return_value.__aenter__ = AsyncMock(side_effect=asyncio.TimeoutError())
+        mock_session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        
+        with patch.object(client, '_get_session', AsyncMock(return_value=mock_session)):
+            with pytest.raises(OllamaError) as exc_info:
+                await client._call_ollama_api("prompt", "llama3", 0.7, 100)
+        
+        assert exc_info.value.error_type == OllamaError.TIMEOUT_ERROR
+        assert mock_session.post.call_args.kwargs["timeout"].total == 5
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_strips_thinking(self, sample_request):
+        """Test that streamed chunks are yielded without thinking blocks."""
+        from src.ai.companion.tier2.ollama_client import OllamaClient
+        
+        client = OllamaClient(cache_enabled=False)
+        
+        lines = [
+            json.dumps({"response": "<thi"}).encode() + b"\n",
+            json.dumps({"response": "nk>hmm</think>\n\nHello"}).encode() + b"\n",
+            json.dumps({"response": " there", "done": True}).encode() + b"\n",
+        ]
+        
+        async def content():
+            for line in lines:
+                yield line
+        
+        mock_response = MagicMock(status=200)
+        mock_response.content = content()
+        mock_session = MagicMock()
+        mock_session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        
+        with patch.object(client, '_get_session', AsyncMock(return_value=mock_session)):
+            chunks = [chunk async for chunk in client.generate_stream(sample_request, model="deepseek-r1", prompt="Hi")]
+        
+        assert "".join(chunks) == "Hello there"
+        assert mock_session.post.call_args.kwargs["json"]["stream"] is True
+
+    def test_json_helpers_work_without_orjson(self):
+        """Test that JSON handling falls back to the standard library when orjson is missing."""
+        from src.ai.companion.tier2 import ollama_client
+        
+        with patch.object(ollama_client, 'orjson', None):
+            assert ollama_client._json_loads(b'{"response": "\\u3053\\u3093"}') == {"response": "こん"}
+            assert json.loads(ollama_client._json_dumps({"prompt": "駅"})) == {"prompt": "駅"}
+            with pytest.raises(json.JSONDecodeError):
+                ollama_client._json_loads(b'{"response": ')
+
+
+class TestOllamaError:
+    """Tests for the OllamaError retry classification."""
+    
+    def test_error_classification(self):
+        """Test that transient and model-related error types are classified declaratively."""
+        from src.ai.companion.tier2.ollama_client import OllamaError
+        
+        assert OllamaError.TRANSIENT_ERROR_TYPES == {
+            OllamaError.CONNECTION_ERROR, OllamaError.TIMEOUT_ERROR, OllamaError.INVALID_RESPONSE
+        }
+        assert OllamaError.MODEL_ERROR_TYPES == {OllamaError.MODEL_ERROR, OllamaError.MEMORY_ERROR}
+        
+        assert OllamaError("x", OllamaError.TIMEOUT_ERROR).is_transient()
+        assert not OllamaError("x", OllamaError.MODEL_ERROR).is_transient()
+        assert OllamaError("x", OllamaError.MEMORY_ERROR).is_model_related()
+        assert not OllamaError("x", OllamaError.CONTENT_ERROR).is_model_related()
@@ -0,0 +1,212 @@
+"""
+Tests for the Ollama request batcher.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.ai.companion.tier2.ollama_client import OllamaError
+from src.ai.companion.tier2.request_batcher import OllamaRequestBatcher
+
+
+class TestOllamaRequestBatcher:
+    """Tests for the OllamaRequestBatcher class."""
+
+    @pytest.mark.asyncio
+    async def test_identical_prompts_share_one_call(self):
+        """Concurrent identical prompts are coalesced into a single generate call."""
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=lambda **kwargs: f"reply to {kwargs['prompt']}")
+        batcher = OllamaRequestBatcher(batch_window=0.001, max_batch_size=8)
+
+        results = await asyncio.gather(
+            batcher.submit(client, None, "llama3", "hello"),
+            batcher.submit(client, None, "llama3", "hello"),
+            batcher.submit(client, None, "llama3", "goodbye")
+        )
+
+        assert results == ["reply to hello", "reply to hello", "reply to goodbye"]
+        assert client.generate.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_groups_by_model(self):
+        """Calls for different models are dispatched with their own model."""
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=lambda **kwargs: kwargs["model"])
+        batcher = OllamaRequestBatcher(batch_window=0.001)
+
+        results = await asyncio.gather(
+            batcher.submit(client, None, "llama3", "hello"),
+            batcher.submit(client, None, "llama3:16b", "hello")
+        )
+
+        assert results == ["llama3", "llama3:16b"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_delivered_to_each_waiter(self):
+        """An error from the client is raised in the submitting coroutine."""
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=OllamaError("boom", OllamaError.CONNECTION_ERROR))
+        batcher = OllamaRequestBatcher(batch_window=0.001)
+
+        with pytest.raises(OllamaError):
+            await batcher.submit(client, None, "llama3", "hello")
+
+    @pytest.mark.asyncio
+    async def test_short_call_is_not_held_back_by_its_batch(self):
+        """A call's result is delivered when it finishes, not when the whole batch does."""
+        release_slow = asyncio.Event()
+
+        async def generate(**kwargs):
+            if kwargs["prompt"] == "slow":
+                await release_slow.wait()
+            return kwargs["prompt"]
+
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=generate)
+        batcher = OllamaRequestBatcher(batch_window=0.001)
+
+        slow = asyncio.ensure_future(batcher.submit(client, None, "llama3", "slow"))
+        fast = asyncio.ensure_future(batcher.submit(client, None, "llama3", "fast"))
+
+        assert await fast == "fast"
+        assert not slow.done()
+        assert batcher.queue_depth == 1
+
+        release_slow.set()
+        assert await slow == "slow"
+        assert batcher.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_counts_waiting_and_running_calls(self):
+        """Queue depth includes calls waiting for the window and calls in flight."""
+        started = []
+        all_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_generate(**kwargs):
+            started.append(kwargs["prompt"])
+            if len(started) == 2:
+                all_started.set()
+            await release.wait()
+            return "done"
+
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=slow_generate)
+        batcher = OllamaRequestBatcher(batch_window=0.001)
+
+        tasks = [asyncio.ensure_future(batcher.submit(client, None, "llama3", p)) for p in ("a", "b")]
+        await all_started.wait()
+        assert batcher.queue_depth == 2
+        # The running batch is referenced until it finishes
+        assert len(batcher._flush_tasks) == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert batcher.queue_depth == 0
+        # Results are delivered before the batch's own task finishes, so let it
+        # finish (asyncio.sleep may be patched by other test modules)
+        await asyncio.gather(*batcher._flush_tasks)
+        tick = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_soon(tick.set_result, None)
+        await tick
+        assert not batcher._flush_tasks
+
+    @pytest.mark.asyncio
+    async def test_model_affinity_runs_one_model_at_a_time(self):
+        """With model affinity, a second model waits until the first model's batches drain."""
+        running = []
+        release = asyncio.Event()
+        first_started = asyncio.Event()
+
+        async def generate(**kwargs):
+            running.append(kwargs["model"])
+            first_started.set()
+            await release.wait()
+            return kwargs["model"]
+
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=generate)
+        batcher = OllamaRequestBatcher(batch_window=0.001, max_batch_size=1, model_affinity=True)
+
+        first = asyncio.ensure_future(batcher.submit(client, None, "llama3", "a"))
+        await first_started.wait()
+        second = asyncio.ensure_future(batcher.submit(client, None, "llama3:16b", "b"))
+        third = asyncio.ensure_future(batcher.submit(client, None, "llama3", "c"))
+        # Let both batch windows expire (asyncio.sleep may be patched by other test modules)
+        waited = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(0.02, waited.set_result, None)
+        await waited
+
+        # The other model waits, and the same model queues behind it rather than starving it
+        assert running == ["llama3"]
+
+        release.set()
+        assert await asyncio.gather(first, second, third) == ["llama3", "llama3:16b", "llama3"]
+        assert running == ["llama3", "llama3:16b", "llama3"]
+
+    @pytest.mark.asyncio
+    async def test_early_flush_cancels_its_window_timer(self):
+        """A group that fills up early doesn't leave a timer that flushes the next group too soon."""
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=lambda **kwargs: kwargs["prompt"])
+        batcher = OllamaRequestBatcher(batch_window=0.2, max_batch_size=2)
+        loop = asyncio.get_running_loop()
+
+        async def wait(delay):
+            # asyncio.sleep may be patched by other test modules
+            waited = loop.create_future()
+            loop.call_later(delay, waited.set_result, None)
+            await waited
+
+        assert await asyncio.gather(
+            batcher.submit(client, None, "llama3", "a"),
+            batcher.submit(client, None, "llama3", "b")
+        ) == ["a", "b"]
+
+        await wait(0.1)
+        late = asyncio.ensure_future(batcher.submit(client, None, "llama3", "c"))
+        # Past the first group's window, but inside the new group's own window
+        await wait(0.15)
+        assert client.generate.call_count == 2
+        assert not late.done()
+
+        assert await late == "c"
+        assert client.generate.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_waiting_for_its_model_releases_callers(self):
+        """A batch cancelled while waiting for its model's turn cancels its callers and leaves the queue."""
+        release = asyncio.Event()
+        first_started = asyncio.Event()
+
+        async def generate(**kwargs):
+            first_started.set()
+            await release.wait()
+            return kwargs["model"]
+
+        client = AsyncMock()
+        client.generate = AsyncMock(side_effect=generate)
+        batcher = OllamaRequestBatcher(batch_window=0.001, max_batch_size=1, model_affinity=True)
+
+        first = asyncio.ensure_future(batcher.submit(client, None, "llama3", "a"))
+        await first_started.wait()
+        (running_batch,) = batcher._flush_tasks
+        second = asyncio.ensure_future(batcher.submit(client, None, "llama3:16b", "b"))
+        while len(batcher._flush_tasks) < 2:
+            tick = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_soon(tick.set_result, None)
+            await tick
+        (waiting_batch,) = batcher._flush_tasks - {running_batch}
+        assert batcher.queue_depth == 2
+
+        waiting_batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        assert batcher.queue_depth == 1
+
+        release.set()
+        assert await first == "llama3"
+        assert batcher.queue_depth == 0
@@ -0,0 +1,41 @@
+"""
+Tests for the Tier 2 response cache.
+"""
+
+from unittest.mock import patch
+
+from src.ai.companion.tier2.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Tests for the ResponseCache class."""
+
+    def test_key_depends_on_sampling_params(self):
+        """Keys differ when any part of the generate call differs."""
+        key = ResponseCache.make_key("llama3", "prompt", 0.7, 500)
+
+        assert key == ResponseCache.make_key("llama3", "prompt", 0.7, 500)
+        assert key != ResponseCache.make_key("llama3", "prompt", 0.0, 500)
+        assert key != ResponseCache.make_key("llama3", "prompt", 0.7, 200)
+        assert key != ResponseCache.make_key("llama3:16b", "prompt", 0.7, 500)
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry is evicted when the cache is full."""
+        cache = ResponseCache(maxsize=2)
+        cache.put(b"a", "A")
+        cache.put(b"b", "B")
+        cache.get(b"a")
+        cache.put(b"c", "C")
+
+        assert cache.get(b"a") == "A"
+        assert cache.get(b"b") is None
+        assert cache.get(b"c") == "C"
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than the TTL are not returned."""
+        cache = ResponseCache(ttl=10)
+        with patch("src.ai.companion.tier2.response_cache.time.monotonic", return_value=100.0):
+            cache.put(b"a", "A")
+        with patch("src.ai.companion.tier2.response_cache.time.monotonic", return_value=111.0):
+            assert cache.get(b"a") is None
+        assert len(cache) == 0
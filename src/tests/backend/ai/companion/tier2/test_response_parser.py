@@ -114,6 +114,17 @@ class TestResponseParser:
         assert "**東京**" in parsed_response or "<b>東京</b>" in parsed_response
         assert "**行きたい**" in parsed_response or "<b>行きたい</b>" in parsed_response
     
+    def test_highlighting_wraps_each_term_once(self, sample_request):
+        """Test that entity and default terms are highlighted in a single pass."""
+        from src.ai.companion.tier2.response_parser import ResponseParser
+        
+        parser = ResponseParser()
+        sample_request.extracted_entities = {"destination": "東京", "station": "東京駅"}
+        
+        parsed_response = parser.parse_response("東京駅から東京へ行きたい", sample_request, highlight_key_terms=True)
+        
+        assert parsed_response == "**東京駅**から**東京**へ**行きたい**"
+    
     def test_parse_response_with_vocabulary(self, sample_request, sample_vocabulary_response):
         """Test parsing a vocabulary response."""
         from src.ai.companion.tier2.response_parser import ResponseParser
@@ -177,4 +188,15 @@ class TestResponseParser:
         
         # Check that learning cues are added
         assert "TIP:" in parsed_response or "NOTE:" in parsed_response or "HINT:" in parsed_response
-        assert "Practice saying this phrase" in parsed_response or "Remember this pattern" in parsed_response 
\ No newline at end of file
+        assert "Practice saying this phrase" in parsed_response or "Remember this pattern" in parsed_response
+    
+    def test_create_fallback_response(self, sample_request):
+        """Test that fallback responses are chosen by intent."""
+        from src.ai.companion.tier2.response_parser import ResponseParser
+        
+        parser = ResponseParser()
+        
+        assert "hai, sou desu" in parser._create_fallback_response(sample_request)
+        
+        sample_request.intent = IntentCategory.GENERAL_HINT
+        assert "sumimasen" in parser._create_fallback_response(sample_request)
@@ -0,0 +1,49 @@
+"""
+Tests for the Tier 2 semantic cache.
+"""
+
+from src.ai.companion.tier2.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Tests for the SemanticCache class."""
+
+    def test_similar_embedding_hits(self):
+        """An embedding above the similarity threshold returns the cached response."""
+        cache = SemanticCache(threshold=0.9)
+        cache.insert("scope", [1.0, 0.0, 0.1], "Platform 3 is on your left.")
+
+        assert cache.lookup("scope", [2.0, 0.0, 0.25]) == "Platform 3 is on your left."
+        assert cache.lookup("scope", [0.0, 1.0, 0.0]) is None
+
+    def test_lookups_are_scoped(self):
+        """Entries are only matched within their own scope."""
+        cache = SemanticCache(threshold=0.9)
+        cache.insert(("directions", "gate"), [1.0, 0.0], "Turn left.")
+
+        assert cache.lookup(("directions", "platform"), [1.0, 0.0]) is None
+        assert cache.lookup(("directions", "gate"), [1.0, 0.0]) == "Turn left."
+
+    def test_evicts_least_recently_used(self):
+        """Each scope keeps at most maxsize entries."""
+        cache = SemanticCache(threshold=0.99, maxsize=2)
+        cache.insert("scope", [1.0, 0.0], "A")
+        cache.insert("scope", [0.0, 1.0], "B")
+        cache.lookup("scope", [1.0, 0.0])
+        cache.insert("scope", [-1.0, 0.0], "C")
+
+        assert len(cache) == 2
+        assert cache.lookup("scope", [1.0, 0.0]) == "A"
+        assert cache.lookup("scope", [0.0, 1.0]) is None
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Saved entries are matched again after loading into a new cache."""
+        path = str(tmp_path / "semantic_cache.json")
+        cache = SemanticCache(threshold=0.9)
+        cache.insert(("vocabulary_help", "gate"), [1.0, 0.0], "切符 means ticket.")
+        cache.save(path)
+
+        restored = SemanticCache(threshold=0.9)
+
+        assert restored.load(path) == 1
+        assert restored.lookup(("vocabulary_help", "gate"), [1.0, 0.05]) == "切符 means ticket."
@@ -26,6 +26,9 @@ or functionality.
 
 import pytest
 import asyncio
+import copy
+import json
+import logging
 from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 import unittest
@@ -91,6 +94,7 @@ from src.ai.companion.tier2.ollama_client import OllamaError, OllamaClient
 from src.ai.companion.tier2.tier2_processor import Tier2Processor
 from src.ai.companion.core.processor_framework import ProcessorFactory
 from src.ai.companion.utils.retry import RetryConfig
+from src.ai.companion.utils.request_context import get_current_request
 
 
 @pytest.fixture
@@ -619,6 +623,36 @@ class TestTier2Processor:
             # Verify that the Tier 1 processor was used
             mock_factory.get_processor.assert_called_once_with(ProcessingTier.TIER_1)
             mock_tier1_processor.process.assert_called_once_with(sample_request)
+
+    def test_tier1_processor_is_looked_up_once(self):
+        """The fallback Tier 1 processor is fetched from the factory once and reused."""
+        processor = Tier2Processor()
+        with patch('src.ai.companion.tier2.tier2_processor.ProcessorFactory') as mock_factory_class:
+            mock_tier1_processor = MagicMock()
+            mock_factory_class.return_value.get_processor.return_value = mock_tier1_processor
+
+            assert processor._get_tier1_processor() is mock_tier1_processor
+            assert processor._get_tier1_processor() is mock_tier1_processor
+
+            mock_factory_class.assert_called_once_with()
+            mock_factory_class.return_value.get_processor.assert_called_once_with(ProcessingTier.TIER_1)
+    
+    @pytest.mark.asyncio
+    async def test_disabled_tier1_is_not_looked_up_again(self, sample_request):
+        """Test that once Tier 1 is found disabled, later failures go straight to the fallback response."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock(
+            return_value=(None, OllamaError("Connection refused", OllamaError.CONNECTION_ERROR))
+        )
+        
+        with patch('src.ai.companion.tier2.tier2_processor.ProcessorFactory') as mock_factory_class:
+            mock_factory_class.return_value.get_processor.side_effect = ValueError("tier_1 is disabled in configuration")
+            
+            await processor.process(sample_request)
+            await processor.process(sample_request)
+            
+            mock_factory_class.return_value.get_processor.assert_called_once()
+            assert sample_request.additional_params["processing_tier"] == ProcessingTier.RULE.value
     
     @pytest.mark.asyncio
     async def test_graceful_degradation_to_tier1_with_tier1_error(self, sample_request):
@@ -685,4 +719,641 @@ class TestTier2Processor:
         mock_tier1_processor.process.assert_not_called()
         
         # Verify that we got the fallback response
-        assert response == fallback_response 
\ No newline at end of file
+        assert response == fallback_response
+    
+    @pytest.mark.asyncio
+    async def test_response_cache_requires_opt_in(self, sample_request, sample_ollama_response):
+        """Test that sampled responses are only served from cache when the request opts in."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        sample_request.intent = IntentCategory.GENERAL_HINT
+        
+        # Without the flag every request reaches the LLM
+        await processor.process(sample_request)
+        await processor.process(sample_request)
+        assert processor._generate_with_retries.call_count == 2
+        
+        # With the flag, the second identical request is a cache hit
+        processor._generate_with_retries.reset_mock()
+        sample_request.additional_params["allow_cached_response"] = True
+        first = await processor.process(sample_request)
+        second = await processor.process(sample_request)
+        
+        assert first == second == sample_ollama_response
+        processor._generate_with_retries.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_factual_intents_are_sampled_greedily_and_cached(self, sample_request, sample_ollama_response):
+        """Test that factual intents use temperature 0 and are cached without opting in."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(return_value=sample_ollama_response)
+        sample_request.intent = IntentCategory.VOCABULARY_HELP
+        
+        first = await processor.process(sample_request)
+        second = await processor.process(sample_request)
+        
+        assert first == second == sample_ollama_response
+        processor.request_batcher.submit.assert_called_once()
+        assert processor.request_batcher.submit.call_args.kwargs["temperature"] == 0.0
+        assert processor.request_batcher.submit.call_args.kwargs["max_tokens"] == 200
+    
+    @pytest.mark.asyncio
+    async def test_max_tokens_capped_from_observed_output_lengths(self, sample_request, sample_ollama_response):
+        """Test that max_tokens is lowered to the p95 output length once enough responses were seen."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(return_value=sample_ollama_response)
+        processor.monitor.reset()
+        try:
+            for _ in range(50):
+                processor.monitor.track_inference("tier2", 0.1, 80, bucket=processor._output_length_bucket(sample_request))
+            
+            await processor.process(sample_request)
+            
+            assert processor.request_batcher.submit.call_args.kwargs["max_tokens"] == 100
+        finally:
+            processor.monitor.reset()
+    
+    def test_output_lengths_are_bucketed_by_intent(self, sample_request):
+        """Test that output lengths seen for one intent don't cap another intent of the same complexity."""
+        processor = Tier2Processor()
+        processor.monitor.reset()
+        try:
+            for _ in range(50):
+                processor.monitor.track_inference("tier2", 0.1, 80, bucket=processor._output_length_bucket(sample_request))
+            other_intent = next(intent for intent in IntentCategory if intent != sample_request.intent)
+            other_request = copy.copy(sample_request)
+            other_request.intent = other_intent
+            
+            assert processor._generation_sampling(sample_request)["max_tokens"] == 100
+            assert processor._generation_sampling(other_request) == processor._sampling_for(other_request)
+        finally:
+            processor.monitor.reset()
+    
+    @pytest.mark.asyncio
+    async def test_truncated_output_is_not_sampled(self, sample_request):
+        """Test that a response that ran into max_tokens isn't recorded as an output length."""
+        processor = Tier2Processor()
+        max_tokens = processor._sampling_for(sample_request)["max_tokens"]
+        processor.monitor.reset()
+        try:
+            processor.request_batcher.submit = AsyncMock(return_value="word " * (max_tokens * 2))
+            await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=0)
+            processor.request_batcher.submit = AsyncMock(return_value="A complete, short answer.")
+            await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=0)
+            
+            bucket = f"tier2:{processor._output_length_bucket(sample_request)}"
+            assert processor.monitor._metrics["inference_calls"]["tier2"] == 2
+            assert len(processor.monitor._metrics["output_tokens"][bucket]) == 1
+        finally:
+            processor.monitor.reset()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("raw_response", [
+        "   short  ",
+        "Hachi: Hachi: Hachi: ok",
+        "Here is what you asked for. Hachi:  \n",
+        "Hachi: √ that is the answer",
+    ])
+    async def test_malformed_responses_are_rejected(self, sample_request, raw_response):
+        """Test that obviously malformed LLM output is reported as an invalid response."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(return_value=raw_response)
+        
+        response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=0)
+        
+        assert response is None
+        assert error.error_type == OllamaError.INVALID_RESPONSE
+    
+    @pytest.mark.asyncio
+    async def test_queue_depth_gauge_drains_after_generation(self, sample_request, sample_ollama_response):
+        """Test that the queue depth gauge drops back once a generation leaves the batcher."""
+        processor = Tier2Processor()
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate = AsyncMock(return_value=sample_ollama_response)
+        processor.monitor.reset()
+        try:
+            response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=0)
+            
+            assert error is None
+            assert processor.monitor.get_metrics()['queue_depth']['tier2'] == 0
+        finally:
+            processor.monitor.reset()
+    
+    @pytest.mark.asyncio
+    async def test_circuit_opens_on_connection_errors(self, sample_request):
+        """Test that repeated connection errors open the circuit and later calls skip Ollama."""
+        processor = Tier2Processor()
+        processor.circuit_breaker.failure_threshold = 2
+        processor.request_batcher.submit = AsyncMock(
+            side_effect=OllamaError("Connection refused", OllamaError.CONNECTION_ERROR)
+        )
+        
+        # The circuit opens during the retries, which stops them early
+        response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt")
+        assert response is None
+        assert processor.circuit_breaker.is_open
+        assert processor.request_batcher.submit.call_count == 2
+        
+        # While open, no call reaches Ollama and the error still falls back to Tier 1
+        response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt")
+        assert response is None
+        assert error.error_type == OllamaError.CONNECTION_ERROR
+        assert processor._should_fallback_to_tier1(error)
+        assert processor.request_batcher.submit.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_generation_timeout_is_not_retried(self, sample_request):
+        """Test that a generate call that timed out isn't sent again."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(
+            side_effect=OllamaError("Request to Ollama timed out after 60.0s", OllamaError.TIMEOUT_ERROR)
+        )
+        
+        response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=3)
+        
+        assert response is None
+        assert error.error_type == OllamaError.TIMEOUT_ERROR
+        assert processor.request_batcher.submit.call_count == 1
+        assert not processor.circuit_breaker.is_open
+    
+    def test_generation_timeout_bounds_ollama_request(self):
+        """Test that the configured generation timeout is the Ollama client's request deadline."""
+        with patch('src.ai.companion.tier2.tier2_processor.get_config', return_value={"generation_timeout": 45}):
+            processor = Tier2Processor()
+        
+        assert processor.ollama_client.request_timeout == 45
+        assert Tier2Processor().ollama_client.request_timeout == Tier2Processor.DEFAULT_GENERATION_TIMEOUT
+    
+    @pytest.mark.asyncio
+    async def test_process_logs_one_info_record(self, sample_request, sample_ollama_response, caplog):
+        """Test that a request logs a single info-level summary with its trace."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        
+        with caplog.at_level(logging.INFO, logger="src.ai.companion.tier2.tier2_processor"):
+            await processor.process(sample_request)
+        
+        records = [r for r in caplog.records if r.name == "src.ai.companion.tier2.tier2_processor" and r.levelno == logging.INFO]
+        assert len(records) == 1
+        assert records[0].tier2_trace["model"] == processor._select_model_based_on_complexity(sample_request.complexity)
+        assert records[0].tier2_trace["success"] is True
+        assert records[0].tier2_trace["fallback"] is None
+    
+    def test_select_model_env_override(self, monkeypatch):
+        """Test that environment variables override the configured model per complexity."""
+        monkeypatch.setenv("TIER2_COMPLEX_MODEL", "deepseek-r1:14b-qwen-distill-q4_K_M")
+        processor = Tier2Processor()
+        
+        assert processor._select_model_based_on_complexity(ComplexityLevel.COMPLEX) == "deepseek-r1:14b-qwen-distill-q4_K_M"
+        assert processor._select_model_based_on_complexity(ComplexityLevel.SIMPLE) == "deepseek-coder"
+    
+    @pytest.mark.asyncio
+    async def test_fallback_model_is_not_retried(self, sample_request, sample_ollama_response):
+        """Test that the fallback model gets a single attempt with the same prompt."""
+        processor = Tier2Processor()
+        sample_request.complexity = ComplexityLevel.COMPLEX
+        
+        error = OllamaError("Model error", OllamaError.MODEL_ERROR)
+        processor._generate_with_retries = AsyncMock(side_effect=[
+            (None, error),
+            (sample_ollama_response, None)
+        ])
+        
+        response = await processor.process(sample_request)
+        
+        assert response == sample_ollama_response
+        first_call, fallback_call = processor._generate_with_retries.call_args_list
+        assert fallback_call.args[2] == first_call.args[2]
+        assert fallback_call.kwargs == {"max_retries": 0}
+    
+    @pytest.mark.asyncio
+    async def test_generate_with_retries_override(self, sample_request):
+        """Test that max_retries=0 makes a single attempt even for transient errors."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(
+            side_effect=OllamaError("Connection refused", OllamaError.CONNECTION_ERROR)
+        )
+        
+        response, error = await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt", max_retries=0)
+        
+        assert response is None
+        assert error.error_type == OllamaError.CONNECTION_ERROR
+        processor.request_batcher.submit.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_warmup_preloads_each_model_once(self):
+        """Test that warm-up preloads every selectable model and tolerates failures."""
+        processor = Tier2Processor()
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.preload_model = AsyncMock(side_effect=[
+            None,
+            OllamaError("Connection refused", OllamaError.CONNECTION_ERROR)
+        ])
+        
+        await processor.warmup()
+        
+        preloaded = [c.args[0] for c in processor.ollama_client.preload_model.call_args_list]
+        assert preloaded == ["deepseek-coder", "deepseek-r1"]
+    
+    @pytest.mark.asyncio
+    async def test_warmup_preloads_fallback_model(self):
+        """Test that warm-up also preloads the model used after model errors."""
+        processor = Tier2Processor()
+        processor._fallback_model = "llama3"
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.preload_model = AsyncMock()
+        
+        await processor.warmup()
+        
+        preloaded = [c.args[0] for c in processor.ollama_client.preload_model.call_args_list]
+        assert preloaded == ["deepseek-coder", "deepseek-r1", "llama3"]
+    
+    @pytest.mark.asyncio
+    async def test_player_history_written_off_event_loop(self, sample_request, sample_ollama_response):
+        """Test that player history is recorded in a worker thread."""
+        import threading
+        
+        history_manager = MagicMock()
+        processor = Tier2Processor(player_history_manager=history_manager)
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        sample_request.additional_params["player_id"] = "player-1"
+        
+        writer_threads = []
+        history_manager.add_interaction.side_effect = lambda **kwargs: writer_threads.append(threading.current_thread())
+        
+        response = await processor.process(sample_request)
+        await processor.wait_for_history_writes()
+        
+        assert response == sample_ollama_response
+        history_manager.add_interaction.assert_called_once()
+        assert writer_threads[0] is not threading.main_thread()
+    
+    @pytest.mark.asyncio
+    async def test_response_does_not_wait_for_player_history(self, sample_request, sample_ollama_response):
+        """Test that the response is returned before the player history write finishes."""
+        import threading
+        
+        release_write = threading.Event()
+        
+        def slow_write(**kwargs):
+            release_write.wait(5)
+        
+        history_manager = MagicMock()
+        history_manager.add_interaction.side_effect = slow_write
+        processor = Tier2Processor(player_history_manager=history_manager)
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        sample_request.additional_params["player_id"] = "player-1"
+        
+        response = await processor.process(sample_request)
+        
+        assert response == sample_ollama_response
+        assert len(processor._pending_history_writes) == 1
+        
+        release_write.set()
+        await processor.wait_for_history_writes()
+        history_manager.add_interaction.assert_called_once()
+        assert not processor._pending_history_writes
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_yields_chunks(self, sample_request):
+        """Test that streaming yields the model's chunks as they arrive."""
+        processor = Tier2Processor()
+        
+        async def fake_stream(**kwargs):
+            for chunk in ["Tokyo is ", "とうきょう", " (toukyou)."]:
+                yield chunk
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = fake_stream
+        
+        chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        
+        assert chunks == ["Tokyo is ", "とうきょう", " (toukyou)."]
+        assert sample_request.additional_params["processing_tier"] == ProcessingTier.TIER_2.value
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_serves_cached_response(self, sample_request, sample_ollama_response):
+        """Test that streaming sends a cached response as one chunk without calling the model."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        processor.ollama_client = MagicMock()
+        sample_request.additional_params["allow_cached_response"] = True
+        
+        await processor.process(sample_request)
+        chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        
+        assert chunks == [sample_ollama_response]
+        processor.ollama_client.generate_stream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_caches_response(self, sample_request):
+        """Test that a streamed response is cached for later identical requests."""
+        processor = Tier2Processor()
+        sample_request.intent = IntentCategory.VOCABULARY_HELP
+        
+        async def stream(**kwargs):
+            for chunk in ("Tokyo is ", "とうきょう", " (toukyou)."):
+                yield chunk
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = stream
+        processor._generate_with_retries = AsyncMock()
+        
+        streamed = [chunk async for chunk in processor.process_stream(sample_request)]
+        response = await processor.process(sample_request)
+        
+        assert response == "".join(streamed)
+        processor._generate_with_retries.assert_not_called()
+    
+    def test_response_cache_can_be_disabled(self, sample_request):
+        """Test that no cache key is made when the response cache is disabled."""
+        processor = Tier2Processor()
+        sample_request.intent = IntentCategory.VOCABULARY_HELP
+        assert processor._response_cache_key(sample_request, "deepseek-coder", "prompt") is not None
+        
+        processor.response_cache_enabled = False
+        assert processor._response_cache_key(sample_request, "deepseek-coder", "prompt") is None
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_falls_back_before_first_chunk(self, sample_request, sample_ollama_response):
+        """Test that a stream failing before any output uses the non-streaming path."""
+        processor = Tier2Processor()
+        
+        async def failing_stream(**kwargs):
+            raise OllamaError("Connection refused", OllamaError.CONNECTION_ERROR)
+            yield  # pragma: no cover
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = failing_stream
+        processor._process = AsyncMock(return_value=sample_ollama_response)
+        
+        with patch.object(processor.monitor, 'track_request') as mock_track_request:
+            chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        
+        assert chunks == [sample_ollama_response]
+        processor._process.assert_called_once_with(sample_request)
+        # The fallback is the same request, so it is only counted once
+        mock_track_request.assert_called_once_with("tier2", sample_request.request_id)
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_falls_back_on_empty_stream(self, sample_request, sample_ollama_response):
+        """Test that a stream with no text is answered by the non-streaming path and not recorded as a turn."""
+        processor = Tier2Processor()
+        
+        async def empty_stream(**kwargs):
+            for chunk in ("", "  "):
+                yield chunk
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = empty_stream
+        processor._process = AsyncMock(return_value=sample_ollama_response)
+        processor._finalize_success = AsyncMock()
+        
+        chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        
+        assert chunks[-1] == sample_ollama_response
+        processor._process.assert_called_once_with(sample_request)
+        processor._finalize_success.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_applies_process_guards(self, sample_request, sample_ollama_response):
+        """Test that streaming answers blank input from rules and doesn't stream while the circuit is open."""
+        processor = Tier2Processor()
+        processor.ollama_client = MagicMock()
+        processor._process = AsyncMock(return_value=sample_ollama_response)
+        
+        sample_request.player_input = "   "
+        chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        assert len(chunks) == 1 and chunks[0]
+        processor._process.assert_not_called()
+        
+        sample_request.player_input = "How do I say left?"
+        processor.circuit_breaker.allow_request = MagicMock(return_value=False)
+        chunks = [chunk async for chunk in processor.process_stream(sample_request)]
+        assert chunks == [sample_ollama_response]
+        processor.ollama_client.generate_stream.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_sets_current_request(self, sample_request):
+        """Test that the streamed request is the current request while the model runs."""
+        processor = Tier2Processor()
+        seen = []
+        
+        async def stream(**kwargs):
+            seen.append(get_current_request())
+            yield "Tokyo is とうきょう (toukyou)."
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = stream
+        
+        [chunk async for chunk in processor.process_stream(sample_request)]
+        
+        assert seen == [sample_request]
+        assert get_current_request() is None
+    
+    @pytest.mark.asyncio
+    async def test_process_stream_closed_early(self, sample_request):
+        """Test that closing a stream early closes the model stream and records a failed outcome."""
+        processor = Tier2Processor()
+        stream_closed = False
+        
+        async def stream(**kwargs):
+            nonlocal stream_closed
+            try:
+                for chunk in ("Tokyo is ", "とうきょう", " (toukyou)."):
+                    yield chunk
+            finally:
+                stream_closed = True
+        
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.generate_stream = stream
+        
+        with patch.object(processor.monitor, 'track_success') as mock_track_success:
+            chunks = processor.process_stream(sample_request)
+            assert await chunks.__anext__() == "Tokyo is "
+            await chunks.aclose()
+        
+        assert stream_closed
+        mock_track_success.assert_called_once_with("tier2", False)
+    
+    @pytest.mark.asyncio
+    async def test_semantic_cache_serves_paraphrases(self, sample_request, sample_ollama_response):
+        """Test that a paraphrased question reuses the cached response."""
+        from src.ai.companion.tier2.semantic_cache import SemanticCache
+        
+        processor = Tier2Processor()
+        processor.semantic_cache = SemanticCache(threshold=0.9)
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.embed = AsyncMock(side_effect=[[1.0, 0.0], [0.98, 0.05]])
+        processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+        sample_request.additional_params["allow_cached_response"] = True
+        
+        first = await processor.process(sample_request)
+        sample_request.player_input = "How would I say 'I'd like to go to Tokyo' in Japanese?"
+        second = await processor.process(sample_request)
+        
+        assert first == second == sample_ollama_response
+        processor._generate_with_retries.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_semantic_cache_persists_across_restarts(self, sample_request, sample_ollama_response, tmp_path):
+        """Test that the semantic cache is saved on close and loaded by the next processor."""
+        config = {
+            "semantic_cache_enabled": True,
+            "semantic_cache_threshold": 0.9,
+            "semantic_cache_path": str(tmp_path / "semantic_cache.json")
+        }
+        with patch('src.ai.companion.tier2.tier2_processor.get_config', return_value=config):
+            processor = Tier2Processor()
+            processor.ollama_client = AsyncMock()
+            processor.ollama_client.embed = AsyncMock(return_value=[1.0, 0.0])
+            processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+            sample_request.additional_params["allow_cached_response"] = True
+            await processor.process(sample_request)
+            await processor.close()
+            
+            restarted = Tier2Processor()
+        
+        assert len(restarted.semantic_cache) == 1
+    
+    @pytest.mark.asyncio
+    async def test_fast_path_skips_llm_for_greetings(self, sample_request):
+        """Test that a trivial SIMPLE request is answered without generating."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock()
+        sample_request.complexity = ComplexityLevel.SIMPLE
+        sample_request.player_input = "Hello!"
+        
+        response = await processor.process(sample_request)
+        
+        assert "こんにちは" in response
+        processor._generate_with_retries.assert_not_called()
+        assert sample_request.additional_params["processing_tier"] == ProcessingTier.TIER_1.value
+
+    @pytest.mark.asyncio
+    async def test_process_batch_resumes_from_checkpoint(self, sample_request, tmp_path):
+        """Test that a batch skips requests already recorded in its checkpoint file."""
+        output = tmp_path / "batch.jsonl"
+        output.write_text(json.dumps({"request_id": "done", "response": "earlier", "processing_tier": "tier2"}) + "\n")
+        processor = Tier2Processor()
+        processor.process = AsyncMock(side_effect=lambda request: f"reply {request.request_id}")
+        
+        requests = []
+        for request_id in ("done", "a", "b"):
+            request = copy.copy(sample_request)
+            request.request_id = request_id
+            request.additional_params = {}
+            requests.append(request)
+        
+        results = await processor.process_batch(requests, output_jsonl=str(output), concurrency=2)
+        
+        assert results == {"done": "earlier", "a": "reply a", "b": "reply b"}
+        assert processor.process.call_count == 2
+        recorded = [json.loads(line)["request_id"] for line in output.read_text().splitlines()]
+        assert sorted(recorded) == ["a", "b", "done"]
+    
+    @pytest.mark.asyncio
+    async def test_blank_input_skips_llm(self, sample_request):
+        """Test that blank input gets the rule response without generating."""
+        processor = Tier2Processor()
+        processor._generate_with_retries = AsyncMock()
+        processor._embed_player_input = AsyncMock()
+        sample_request.player_input = "   "
+
+        response = await processor.process(sample_request)
+
+        assert response
+        processor._generate_with_retries.assert_not_called()
+        processor._embed_player_input.assert_not_called()
+        assert sample_request.additional_params["processing_tier"] == ProcessingTier.RULE.value
+        assert processor.monitor.get_metrics()["fallbacks"]["tier2:blank_input"] >= 1
+
+    def test_conversation_histories_are_bounded(self, sample_request):
+        """Test that the least recently used conversations are evicted and histories are capped."""
+        processor = Tier2Processor()
+        processor.max_conversations = 2
+        
+        processor._record_conversation_turn("a", sample_request, "first")
+        processor._record_conversation_turn("b", sample_request, "first")
+        processor._record_conversation_turn("a", sample_request, "second")
+        for i in range(50):
+            processor._record_conversation_turn("c", sample_request, str(i))
+        
+        assert list(processor.conversation_histories) == ["a", "c"]
+        assert [response for _, response in processor.conversation_histories["a"]] == ["first", "second"]
+        assert [response for _, response in processor.conversation_histories["c"]] == [str(i) for i in range(45, 50)]
+    
+    def test_ollama_retry_config_is_reused(self):
+        """Test that the Ollama retry config is built once and rebuilt when retry_config changes."""
+        processor = Tier2Processor()
+        
+        config = processor._get_ollama_retry_config()
+        assert processor._get_ollama_retry_config() is config
+        assert processor._get_ollama_retry_config(max_retries=0).max_retries == 0
+        assert config.retry_on(OllamaError("Connection refused", OllamaError.CONNECTION_ERROR))
+        assert not config.retry_on(OllamaError("Model not found", OllamaError.MODEL_ERROR))
+        
+        processor.retry_config = RetryConfig(max_retries=1)
+        assert processor._get_ollama_retry_config().max_retries == 1
+    
+    @pytest.mark.asyncio
+    async def test_config_is_read_once(self, sample_request, sample_ollama_response):
+        """Test that models come from tier2.ollama at init and process doesn't re-read the config."""
+        with patch('src.ai.companion.tier2.tier2_processor.get_config') as mock_get_config:
+            mock_get_config.return_value = {"ollama": {"complex_model": "deepseek-r1:14b"}}
+            processor = Tier2Processor()
+            processor._generate_with_retries = AsyncMock(return_value=(sample_ollama_response, None))
+            sample_request.complexity = ComplexityLevel.COMPLEX
+            
+            await processor.process(sample_request)
+            
+            assert processor._generate_with_retries.call_args.args[1] == "deepseek-r1:14b"
+            assert mock_get_config.call_count == 1
+    
+    def test_models_are_precomputed_for_every_complexity(self):
+        """Test that model selection is a lookup covering every complexity level."""
+        processor = Tier2Processor()
+        
+        assert set(processor._models_by_complexity) == set(ComplexityLevel)
+        assert processor._models_by_complexity[ComplexityLevel.MODERATE] == processor._default_model
+    
+    @pytest.mark.asyncio
+    async def test_fallback_model_success_records_player_history(self, sample_request, sample_ollama_response):
+        """Test that a response from the fallback model gets the same bookkeeping as the primary model."""
+        history_manager = MagicMock()
+        processor = Tier2Processor(player_history_manager=history_manager)
+        sample_request.complexity = ComplexityLevel.COMPLEX
+        sample_request.additional_params["player_id"] = "player-1"
+        sample_request.additional_params["conversation_id"] = "conv-1"
+        
+        processor._generate_with_retries = AsyncMock(side_effect=[
+            (None, OllamaError("Model error", OllamaError.MODEL_ERROR)),
+            (sample_ollama_response, None)
+        ])
+        
+        await processor.process(sample_request)
+        await processor.wait_for_history_writes()
+        
+        history_manager.add_interaction.assert_called_once()
+        assert len(processor.conversation_histories["conv-1"]) == 1
+        assert sample_request.additional_params["processing_tier"] == ProcessingTier.TIER_2.value
+    
+    @pytest.mark.asyncio
+    async def test_close_closes_client(self):
+        """Test that closing the processor closes the inference client."""
+        processor = Tier2Processor()
+        processor.ollama_client = MagicMock()
+        processor.ollama_client.close = AsyncMock()
+        
+        await processor.close()
+        
+        processor.ollama_client.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_generate_with_retries_propagates_cancellation(self, sample_request):
+        """Test that task cancellation is not turned into an error result."""
+        processor = Tier2Processor()
+        processor.request_batcher.submit = AsyncMock(side_effect=asyncio.CancelledError())
+        
+        with pytest.raises(asyncio.CancelledError):
+            await processor._generate_with_retries(sample_request, "deepseek-coder", "prompt")
@@ -6,13 +6,17 @@ to interact with Amazon Bedrock models for the Tier 3 processor.
 """
 
 import pytest
+import gc
 import json
+import asyncio
+import threading
 import boto3
 from unittest.mock import patch, MagicMock, AsyncMock
 import datetime
 
 from src.ai.companion.core.models import CompanionRequest
 from src.ai.companion.tier3.bedrock_client import BedrockClient, BedrockError
+from src.ai.companion.utils.retry import RetryConfig
 
 
 @pytest.fixture
@@ -170,22 +174,220 @@ class TestBedrockClient:
             assert "Test error" in str(excinfo.value)
             assert excinfo.value.error_type == BedrockError.API_ERROR
     
+    @pytest.mark.asyncio
+    async def test_generate_caches_low_temperature_calls(self, sample_request, sample_bedrock_response):
+        """Test that repeated low-temperature calls are served from the response cache."""
+        client = BedrockClient()
+        
+        with patch.object(client, '_call_bedrock_api', return_value=sample_bedrock_response) as mock_call_api:
+            first = await client.generate(sample_request, temperature=0.0, prompt="test prompt")
+            second = await client.generate(sample_request, temperature=0.0, prompt="test prompt")
+            await client.generate(sample_request, temperature=0.7, prompt="test prompt")
+            await client.generate(sample_request, temperature=0.7, prompt="test prompt")
+        
+        assert first == second
+        # One call for the cached prompt, and one per sampled call
+        assert mock_call_api.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_generate_coalesces_concurrent_identical_calls(self, sample_request, sample_bedrock_response):
+        """Test that identical cacheable calls made at the same time share one API call."""
+        client = BedrockClient()
+        release = threading.Event()
+        
+        def slow_call(model_id, payload):
+            release.wait(timeout=5)
+            return sample_bedrock_response
+        
+        with patch.object(client, '_call_bedrock_api', side_effect=slow_call) as mock_call_api:
+            calls = [
+                asyncio.ensure_future(client.generate(sample_request, temperature=0.0, prompt="test prompt"))
+                for _ in range(3)
+            ]
+            tick = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_soon(tick.set_result, None)
+            await tick
+            release.set()
+            results = await asyncio.gather(*calls)
+        
+        assert len(set(results)) == 1
+        assert mock_call_api.call_count == 1
+        assert not client._in_flight
+    
+    @pytest.mark.asyncio
+    async def test_failed_call_with_cancelled_caller_is_retrieved(self, sample_request):
+        """Test that a coalesced call failing after its only caller was cancelled doesn't go unretrieved."""
+        client = BedrockClient()
+        release = threading.Event()
+        
+        def failing_call(model_id, payload):
+            release.wait(timeout=5)
+            raise BedrockError("bad", BedrockError.API_ERROR)
+        
+        loop = asyncio.get_running_loop()
+        unretrieved = []
+        loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+        try:
+            with patch.object(client, '_call_bedrock_api', side_effect=failing_call):
+                caller = asyncio.ensure_future(client.generate(sample_request, temperature=0.0, prompt="test prompt"))
+                while not client._in_flight:
+                    await asyncio.wait([caller], timeout=0.01)
+                (call,) = client._in_flight.values()
+                caller.cancel()
+                release.set()
+                await asyncio.wait([call])
+            
+            del call
+            gc.collect()
+            assert not unretrieved
+        finally:
+            loop.set_exception_handler(None)
+    
+    @pytest.mark.asyncio
+    async def test_generate_retries_throttled_calls(self, sample_request, sample_bedrock_response):
+        """Test that throttled calls are retried with backoff, and other errors are not."""
+        client = BedrockClient()
+        client.RETRY_CONFIG = RetryConfig(
+            max_retries=3,
+            base_delay=0.001,
+            jitter=False,
+            retry_on=BedrockClient.RETRY_CONFIG.retry_on
+        )
+        throttled = BedrockError("ThrottlingException", BedrockError.QUOTA_ERROR)
+        
+        with patch.object(client, '_call_bedrock_api', side_effect=[throttled, throttled, sample_bedrock_response]) as mock_call_api:
+            response = await client.generate(sample_request, prompt="test prompt")
+        
+        assert response.startswith("「東京に行きたいです」")
+        assert mock_call_api.call_count == 3
+        
+        with patch.object(client, '_call_bedrock_api', side_effect=BedrockError("bad", BedrockError.API_ERROR)) as mock_call_api:
+            with pytest.raises(BedrockError):
+                await client.generate(sample_request, prompt="test prompt")
+        
+        assert mock_call_api.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_generate_bounds_concurrent_calls(self, sample_request, sample_bedrock_response):
+        """Test that no more than max_concurrency calls reach Bedrock at once."""
+        client = BedrockClient(max_concurrency=2)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        
+        def slow_call(model_id, payload):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.02)
+            with lock:
+                running[0] -= 1
+            return sample_bedrock_response
+        
+        with patch.object(client, '_call_bedrock_api', side_effect=slow_call) as mock_call_api:
+            await asyncio.gather(*(
+                client.generate(sample_request, prompt=f"prompt {i}") for i in range(6)
+            ))
+        
+        assert mock_call_api.call_count == 6
+        assert peak[0] == 2
+    
+    @pytest.mark.asyncio
+    async def test_generate_marks_static_prefix_for_prompt_caching(self, sample_request, sample_bedrock_response):
+        """Test that a long static prefix is followed by a cache checkpoint, and a short one isn't."""
+        client = BedrockClient(prompt_caching=True)
+        long_prefix = "Persona and format rules. " * 200
+        short_prefix = "Persona. "
+        
+        with patch.object(client, '_call_bedrock_api', return_value=sample_bedrock_response) as mock_call_api:
+            await client.generate(sample_request, prompt=long_prefix + "Question?", static_prefix=long_prefix)
+            await client.generate(sample_request, prompt=short_prefix + "Question?", static_prefix=short_prefix)
+        
+        cached_content = mock_call_api.call_args_list[0].args[1]["messages"][0]["content"]
+        assert cached_content == [{"text": long_prefix}, {"cachePoint": {"type": "default"}}, {"text": "Question?"}]
+        uncached_content = mock_call_api.call_args_list[1].args[1]["messages"][0]["content"]
+        assert uncached_content == [{"text": short_prefix + "Question?"}]
+    
+    @pytest.mark.asyncio
+    async def test_generate_calls_api_off_event_loop(self, sample_request, sample_bedrock_response):
+        """Test that the blocking Bedrock call runs in a worker thread."""
+        client = BedrockClient()
+        loop_thread = threading.get_ident()
+        call_threads = []
+        
+        def call_api(model_id, payload):
+            call_threads.append(threading.get_ident())
+            return sample_bedrock_response
+        
+        with patch.object(client, '_call_bedrock_api', side_effect=call_api):
+            await client.generate(sample_request, prompt="test prompt")
+        
+        assert call_threads and call_threads[0] != loop_thread
+    
     @pytest.mark.asyncio
     async def test_generate_with_quota_exceeded(self, sample_request):
         """Test generating a response when the quota is exceeded."""
         client = BedrockClient()
         
-        # Mock the _call_bedrock_api method to raise a quota error
-        with patch.object(client, '_call_bedrock_api') as mock_call_api:
+        # Mock the _call_bedrock_api method to raise a quota error, and skip the backoff waits
+        with patch.object(client, '_call_bedrock_api') as mock_call_api, \
+                patch('src.ai.companion.utils.retry.asyncio.sleep', new_callable=AsyncMock):
             mock_call_api.side_effect = BedrockError("Quota exceeded", BedrockError.QUOTA_ERROR)
             
-            # Generate a response (should raise a quota error)
+            # Generate a response (should raise a quota error once the retries run out)
             with pytest.raises(BedrockError) as excinfo:
                 await client.generate(sample_request, prompt="test prompt")
             
             # Check that the error is correct
             assert "Quota exceeded" in str(excinfo.value)
             assert excinfo.value.error_type == BedrockError.QUOTA_ERROR
+            assert mock_call_api.call_count == 1 + BedrockClient.RETRY_CONFIG.max_retries
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status, error_code, error_type, attempts", [
+        (429, "ThrottlingException", BedrockError.QUOTA_ERROR, 1 + BedrockClient.RETRY_CONFIG.max_retries),
+        (503, "ServiceUnavailableException", BedrockError.SERVICE_ERROR, 1 + BedrockClient.RETRY_CONFIG.max_retries),
+        (424, "ModelNotReadyException", BedrockError.SERVICE_ERROR, 1 + BedrockClient.RETRY_CONFIG.max_retries),
+        (400, "ValidationException", BedrockError.API_ERROR, 1),
+    ])
+    async def test_failed_request_attempt_count(self, sample_request, monkeypatch, status, error_code, error_type, attempts):
+        """Test that transient errors reach Bedrock max_retries + 1 times, with no botocore retries on top, and others once."""
+        from botocore.awsrequest import AWSResponse
+        
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        client = BedrockClient()
+        
+        def failed(request):
+            raw = MagicMock()
+            raw.stream.return_value = [b'{"message": "Request failed."}']
+            return AWSResponse(request.url, status, {"x-amzn-ErrorType": error_code}, raw)
+        
+        with patch.object(client.client._endpoint.http_session, 'send', side_effect=failed) as mock_send, \
+                patch('src.ai.companion.utils.retry.asyncio.sleep', new_callable=AsyncMock):
+            with pytest.raises(BedrockError) as excinfo:
+                await client.generate(sample_request, prompt="test prompt")
+        
+        assert excinfo.value.error_type == error_type
+        assert mock_send.call_count == attempts
+    
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_retried(self, sample_request, sample_bedrock_response, monkeypatch):
+        """Test that a dropped connection is retried by the client's own backoff."""
+        from botocore.exceptions import ConnectionClosedError
+        
+        client = BedrockClient()
+        dropped = ConnectionClosedError(endpoint_url="https://bedrock-runtime.us-east-1.amazonaws.com")
+        
+        with patch.object(client, 'client') as mock_client, \
+                patch('src.ai.companion.utils.retry.asyncio.sleep', new_callable=AsyncMock):
+            body = MagicMock()
+            body.read.return_value = json.dumps(sample_bedrock_response).encode('utf-8')
+            mock_client.invoke_model.side_effect = [dropped, {"body": body}]
+            response = await client.generate(sample_request, prompt="test prompt")
+        
+        assert response.startswith("「東京に行きたいです」")
+        assert mock_client.invoke_model.call_count == 2
     
     def test_call_bedrock_api(self, sample_bedrock_response):
         """Test calling the Bedrock API."""
@@ -233,6 +435,93 @@ class TestBedrockClient:
             assert "messages" in payload
             assert "inferenceConfig" in payload
     
+    def test_call_bedrock_api_serializes_compact_body(self, sample_bedrock_response):
+        """Test that the body is compact UTF-8 JSON and the debug dump is skipped when debug is off."""
+        client = BedrockClient()
+        payload = {"messages": [{"role": "user", "content": [{"text": "切符はどこですか"}]}]}
+        
+        with patch.object(client, 'client') as mock_client, \
+                patch.object(client, '_pretty_print_json') as mock_pretty_print, \
+                patch.object(client.logger, 'isEnabledFor', return_value=False):
+            mock_client.invoke_model.return_value = {"body": MagicMock()}
+            mock_client.invoke_model.return_value["body"].read.return_value = json.dumps(sample_bedrock_response).encode('utf-8')
+            
+            client._call_bedrock_api("amazon.nova-micro-v1:0", payload)
+        
+        body = mock_client.invoke_model.call_args[1]["body"]
+        assert body == '{"messages":[{"role":"user","content":[{"text":"切符はどこですか"}]}]}'.encode('utf-8')
+        mock_pretty_print.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_generate_stream_yields_text_deltas(self, sample_request):
+        """Test that streamed chunks are yielded as text and their usage is recorded."""
+        usage_tracker = MagicMock()
+        client = BedrockClient(usage_tracker=usage_tracker)
+        chunks = [
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"delta": {"text": "きっぷ"}, "contentBlockIndex": 0}},
+            {"contentBlockDelta": {"delta": {"text": " (kippu)"}, "contentBlockIndex": 0}},
+            {"messageStop": {"stopReason": "end_turn"},
+             "amazon-bedrock-invocationMetrics": {"inputTokenCount": 12, "outputTokenCount": 5}},
+        ]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(
+            [{"chunk": {"bytes": json.dumps(chunk).encode("utf-8")}} for chunk in chunks]
+        )
+        
+        with patch.object(client, 'client') as mock_client:
+            mock_client.invoke_model_with_response_stream.return_value = {"body": stream}
+            
+            pieces = [piece async for piece in client.generate_stream(sample_request, prompt="test prompt")]
+        
+        assert pieces == ["きっぷ", " (kippu)"]
+        stream.close.assert_called_once()
+        usage_tracker.record_usage.assert_called_once_with(
+            model_id="amazon.nova-micro-v1:0", input_tokens=12, output_tokens=5
+        )
+    
+    @pytest.mark.asyncio
+    async def test_closing_a_stream_early_unblocks_the_reader(self, sample_request):
+        """Test that closing the stream closes the EventStream, so a blocked read returns and frees its slot."""
+        client = BedrockClient(max_concurrency=1)
+        closed = threading.Event()
+        first_chunk = {"contentBlockDelta": {"delta": {"text": "きっぷ"}, "contentBlockIndex": 0}}
+        
+        def events():
+            yield {"chunk": {"bytes": json.dumps(first_chunk).encode("utf-8")}}
+            # The next event never arrives; reading fails once the stream is closed
+            closed.wait(timeout=5)
+            raise ConnectionError("Connection closed")
+        
+        stream = MagicMock()
+        stream.__iter__.side_effect = events
+        stream.close.side_effect = closed.set
+        
+        with patch.object(client, 'client') as mock_client:
+            mock_client.invoke_model_with_response_stream.return_value = {"body": stream}
+            
+            pieces = client.generate_stream(sample_request, prompt="test prompt")
+            assert await pieces.__anext__() == "きっぷ"
+            await asyncio.wait_for(pieces.aclose(), timeout=2)
+        
+        assert closed.is_set()
+        assert not client._semaphore.locked()
+    
+    def test_call_bedrock_api_requests_latency_optimized_inference(self, sample_bedrock_response):
+        """Test that latency-optimized inference is only requested for models that offer it."""
+        client = BedrockClient()
+        
+        with patch.object(client, 'client') as mock_client:
+            mock_client.invoke_model.return_value = {"body": MagicMock()}
+            mock_client.invoke_model.return_value["body"].read.return_value = json.dumps(sample_bedrock_response).encode('utf-8')
+            
+            client._call_bedrock_api("us.amazon.nova-pro-v1:0", {"messages": []})
+            client._call_bedrock_api("amazon.nova-micro-v1:0", {"messages": []})
+        
+        optimized, standard = mock_client.invoke_model.call_args_list
+        assert optimized.kwargs["performanceConfigLatency"] == "optimized"
+        assert "performanceConfigLatency" not in standard.kwargs
+    
     def test_call_bedrock_api_error(self):
         """Test error handling when calling the Bedrock API."""
         client = BedrockClient()
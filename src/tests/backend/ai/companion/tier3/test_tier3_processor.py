@@ -132,6 +132,17 @@ class TestTier3Processor:
             # The actual response doesn't contain the word "error", so we'll check for other phrases
             assert "trouble" in response_text.lower() or "rephrase" in response_text.lower()
 
+    def test_generate_fallback_response_for_quota_error(self, sample_classified_request):
+        """Test that quota errors get their own fallback message."""
+        with patch('src.ai.companion.tier3.tier3_processor.BedrockClient'):
+            processor = Tier3Processor()
+            
+            quota_error = BedrockError("Quota exceeded", BedrockError.QUOTA_ERROR)
+            fallback_response = processor._generate_fallback_response(sample_classified_request, quota_error)
+            
+            assert "limit" in fallback_response['response_text']
+            assert fallback_response['processing_tier'] == sample_classified_request.processing_tier
+
     @pytest.mark.asyncio
     async def test_process(self, sample_classified_request, mock_bedrock_client, mock_context_manager):
         """Test processing a request."""
@@ -0,0 +1,24 @@
+"""
+Tests for the sensitive information log filter.
+"""
+
+import logging
+
+from src.ai.companion.utils.log_filter import SensitiveInfoFilter
+
+
+class TestSensitiveInfoFilter:
+    """Tests for the SensitiveInfoFilter class."""
+
+    def test_redacts_formatted_message(self):
+        """Lazy %-style arguments are formatted before redaction, so placeholders survive."""
+        record = logging.LogRecord(
+            "test", logging.INFO, __file__, 1,
+            "API usage: model=%s, input_tokens=%s, api_key=%s", ("nova", 42, "abc123"), None
+        )
+
+        assert SensitiveInfoFilter().filter(record)
+
+        message = record.getMessage()
+        assert message.startswith("API usage: model=nova, ")
+        assert "abc123" not in message
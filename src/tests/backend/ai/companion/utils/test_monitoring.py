@@ -121,6 +121,35 @@ class TestProcessorMonitor:
         assert metrics['avg_response_time_ms']['tier2'] == 150  # (100 + 200) / 2
         assert metrics['avg_response_time_ms']['tier1'] == 50
     
+    def test_response_times_use_a_rolling_window(self):
+        """Test that only the most recent response times are kept."""
+        monitor = ProcessorMonitor()
+        monitor.reset()
+        
+        # Fill the window with slow responses, then replace them all with fast ones
+        for _ in range(ProcessorMonitor.RESPONSE_TIME_WINDOW):
+            monitor.track_response_time("tier2", 1000)
+        for _ in range(ProcessorMonitor.RESPONSE_TIME_WINDOW):
+            monitor.track_response_time("tier2", 10)
+        
+        metrics = monitor.get_metrics()
+        assert len(monitor._metrics['response_times']['tier2']) == ProcessorMonitor.RESPONSE_TIME_WINDOW
+        assert metrics['avg_response_time_ms']['tier2'] == 10
+        assert metrics['avg_response_time_ms']['tier2_p99'] == 10
+    
+    def test_p95_output_tokens_needs_enough_samples(self):
+        """Test that the output length percentile is only reported once enough samples exist."""
+        monitor = ProcessorMonitor()
+        monitor.reset()
+        
+        for tokens in range(1, 50):
+            monitor.track_inference("tier2", 0.1, tokens, bucket="simple")
+        assert monitor.get_p95_output_tokens("tier2", "simple") is None
+        
+        monitor.track_inference("tier2", 0.1, 50, bucket="simple")
+        assert monitor.get_p95_output_tokens("tier2", "simple") == 48
+        assert monitor.get_p95_output_tokens("tier2", "complex") is None
+    
     def test_track_success(self):
         """Test tracking success rates."""
         monitor = ProcessorMonitor()
@@ -149,6 +178,24 @@ class TestProcessorMonitor:
         assert metrics['success_rate']['tier2'] == 2/3
         assert metrics['success_rate']['tier1'] == 1.0
     
+    def test_track_inference_and_cache_hits(self):
+        """Test tracking inference throughput, queue depth and cache hits."""
+        monitor = ProcessorMonitor()
+        monitor.reset()
+        
+        monitor.track_inference("tier2", 2.0, 40)
+        monitor.track_inference("tier2", 2.0, 60)
+        monitor.set_queue_depth("tier2", 3)
+        monitor.track_cache_hit("tier2", "exact")
+        monitor.track_cache_hit("tier2", "semantic")
+        monitor.track_cache_hit("tier2", "exact")
+        
+        metrics = monitor.get_metrics()
+        assert metrics['tokens_generated']['tier2'] == 100
+        assert metrics['tokens_per_second']['tier2'] == 25.0
+        assert metrics['queue_depth']['tier2'] == 3
+        assert metrics['cache_hits'] == {"tier2:exact": 2, "tier2:semantic": 1}
+    
     @patch('json.dump')
     @patch('builtins.open')
     @patch('os.makedirs')
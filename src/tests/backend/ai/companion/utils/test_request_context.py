@@ -0,0 +1,62 @@
+"""
+Tests for the request context utilities.
+"""
+
+import asyncio
+import logging
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.ai.companion.utils.request_context import (
+    RequestIdFilter,
+    get_current_request,
+    reset_current_request,
+    set_current_request
+)
+
+
+def make_record():
+    """Create a log record for testing."""
+    return logging.LogRecord("test", logging.INFO, __file__, 1, "message", (), None)
+
+
+class TestRequestContext:
+    """Tests for the request context."""
+
+    def test_set_and_reset(self):
+        """The current request is restored after reset."""
+        request = MagicMock(request_id="req-1")
+
+        token = set_current_request(request)
+        assert get_current_request() is request
+
+        reset_current_request(token)
+        assert get_current_request() is None
+
+    @pytest.mark.asyncio
+    async def test_tasks_see_their_own_request(self):
+        """Concurrent tasks each see the request they set."""
+        async def handle(request_id):
+            set_current_request(MagicMock(request_id=request_id))
+            await asyncio.sleep(0)
+            return get_current_request().request_id
+
+        assert await asyncio.gather(handle("a"), handle("b")) == ["a", "b"]
+        assert get_current_request() is None
+
+    def test_filter_adds_request_id(self):
+        """The log filter adds the current request ID, or '-' when there is none."""
+        log_filter = RequestIdFilter()
+
+        record = make_record()
+        assert log_filter.filter(record)
+        assert record.request_id == "-"
+
+        token = set_current_request(MagicMock(request_id="req-2"))
+        try:
+            record = make_record()
+            log_filter.filter(record)
+            assert record.request_id == "req-2"
+        finally:
+            reset_current_request(token)
@@ -10,6 +10,7 @@ import asyncio
 from unittest.mock import MagicMock, patch
 
 from src.ai.companion.utils.retry import (
+    CircuitBreaker,
     RetryConfig,
     retry_async,
     retry_sync,
@@ -131,6 +132,18 @@ class TestRetryConfig:
         # With jitter, the delay should be within the range [0.5, 1.5]
         delay = config.get_delay(0)
         assert 0.5 <= delay <= 1.5
+    
+    def test_get_delay_full_jitter(self):
+        """Test that full jitter draws the delay from the whole backoff window."""
+        import random
+        
+        config = RetryConfig(base_delay=1.0, backoff_factor=3.0, max_delay=30.0, full_jitter=True, rng=random.Random(42))
+        expected = random.Random(42)
+        
+        for attempt in range(4):
+            delay = config.get_delay(attempt)
+            assert delay == max(expected.uniform(0, 3.0 ** attempt), 0.001)
+            assert 0 < delay <= 3.0 ** attempt
 
 
 class TestRetrySync:
@@ -260,4 +273,46 @@ class TestRetryDecorators:
         result = await decorated_func()
         
         assert result == "success"
-        assert mock_func.call_count == 3 
\ No newline at end of file
+        assert mock_func.call_count == 3 
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens once the failure threshold is reached."""
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=30)
+        
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow_request()
+        
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow_request()
+    
+    def test_success_resets_failures(self):
+        """Test that a success in between failures keeps the circuit closed."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert not breaker.is_open
+    
+    def test_one_trial_call_after_cooldown(self):
+        """Test that a single trial call is let through after the cooldown."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=30)
+        
+        with patch('src.ai.companion.utils.retry.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('src.ai.companion.utils.retry.time.monotonic', return_value=129.0):
+            assert not breaker.allow_request()
+        with patch('src.ai.companion.utils.retry.time.monotonic', return_value=131.0):
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+        
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.allow_request()
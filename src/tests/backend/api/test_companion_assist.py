@@ -4,6 +4,7 @@ Tests for the companion assist endpoint.
 
 import sys
 import os
+import json
 import pytest
 from fastapi.testclient import TestClient
 
@@ -77,4 +78,35 @@ def test_companion_assist_successful_request(client):
     assert "companion" in response_data
     assert "ui" in response_data
     assert "gameState" in response_data
-    assert "meta" in response_data 
\ No newline at end of file
+    assert "meta" in response_data 
+
+
+def test_companion_assist_stream(client):
+    """
+    Test that the streaming endpoint sends the dialogue as server-sent events.
+    """
+    request_data = {
+        "playerId": "player123",
+        "sessionId": "session456",
+        "gameContext": {
+            "location": "ticket_machine_area",
+            "currentQuest": "buy_ticket_to_odawara",
+            "questStep": "find_ticket_machine",
+            "nearbyEntities": ["ticket_machine_1", "station_map"]
+        },
+        "request": {
+            "type": "vocabulary",
+            "text": "What does 切符 mean?",
+            "language": "english"
+        }
+    }
+    
+    response = client.post("/api/companion/assist/stream", json=request_data)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    # At least one dialogue chunk, then the done event
+    events = [event for event in response.text.split("\n\n") if event]
+    assert events[0].startswith("data: ")
+    assert "text" in json.loads(events[0][len("data: "):])
+    assert events[-1].startswith("event: done")